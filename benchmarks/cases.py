@@ -0,0 +1,80 @@
+"""
+Generated templates and contexts for the benchmark runner.
+
+Every case renders one report template, which consists of ``rows`` repeated row
+blocks nested ``depth`` levels deep and ``embeds`` graphs inserted with the
+``plotly`` filter, each holding a figure with ``points`` data points.
+"""
+
+import random
+import typing
+
+from dash import dcc
+
+
+class Case(typing.NamedTuple):
+    name: str
+    rows: int
+    depth: int
+    embeds: int
+    points: int
+
+
+CASES = [
+    Case(name='small', rows=10, depth=2, embeds=0, points=0),
+    Case(name='medium', rows=100, depth=4, embeds=2, points=100),
+    Case(name='large', rows=1000, depth=4, embeds=2, points=100),
+    Case(name='deep', rows=100, depth=32, embeds=0, points=0),
+    Case(name='many-embeds', rows=100, depth=2, embeds=50, points=100),
+    Case(name='large-figures', rows=10, depth=2, embeds=4, points=100_000),
+]
+
+QUICK_CASES = [case for case in CASES if case.name in ('small', 'medium', 'deep')]
+
+
+def make_template(case: Case) -> str:
+    opening = ''.join(
+        f'<div class="level-{level}" style="margin-left: 2px; padding: 1px">'
+        for level in range(case.depth)
+    )
+    closing = '</div>' * case.depth
+    return f"""
+<div class="report">
+    <h1>{{{{ title }}}}</h1>
+    {{% for row in rows %}}
+    {opening}
+        <span class="label">{{{{ row.label }}}}</span>
+        <b title="value">{{{{ row.value }}}}</b>
+        <p>Static description of the row, which does not change between renders.</p>
+    {closing}
+    {{% endfor %}}
+    {{% for graph in graphs %}}
+    <section class="graph">{{{{ graph|plotly }}}}</section>
+    {{% endfor %}}
+</div>
+"""
+
+
+def make_context(case: Case, seed: int = 0) -> typing.Dict[str, typing.Any]:
+    generator = random.Random(seed)
+    return dict(
+        title=f'Report {case.name}',
+        rows=[
+            dict(label=f'row {i}', value=round(generator.random(), 4))
+            for i in range(case.rows)
+        ],
+        graphs=[
+            dcc.Graph(
+                id=f'graph-{i}',
+                figure={
+                    'data': [
+                        {
+                            'x': list(range(case.points)),
+                            'y': [generator.random() for _ in range(case.points)],
+                        }
+                    ]
+                },
+            )
+            for i in range(case.embeds)
+        ],
+    )
@@ -0,0 +1,104 @@
+"""
+Import time benchmark for dash-template-rendering.
+
+Measures the time of ``import dash_template_rendering`` in fresh interpreters with
+``python -X importtime``. Dash, Flask and Jinja2 are imported beforehand, as every
+application imports them anyway, so only the cost added by this package is
+reported.
+
+Usage::
+
+    python benchmarks/import_time.py --output import_time.json
+    python benchmarks/import_time.py --baseline import_time.json --threshold 1.5
+
+When a baseline is given, the runner exits with status 1, if the import got
+slower than the threshold allows.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import typing
+
+MODULE = 'dash_template_rendering'
+PRELOADED = ('dash', 'flask', 'jinja2')
+
+
+def measure_import() -> typing.Tuple[float, typing.List[str]]:
+    """Import the package in a fresh interpreter and return the import time in
+    seconds together with the heavy modules it imported.
+    """
+    code = (
+        f'import sys; import {", ".join(PRELOADED)}; '
+        f'before = set(sys.modules); import {MODULE}; '
+        'print(" ".join(sorted(set(sys.modules) - before)))'
+    )
+    # Deployments import from cached bytecode, so it must be written.
+    environment = dict(os.environ)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=environment,
+    )
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = (part.strip() for part in line.split('|'))
+        if name == MODULE:
+            return int(cumulative) / 1e6, process.stdout.split()
+    raise RuntimeError(f'{MODULE} was not imported:\n{process.stderr}')
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare the results to this JSON file.')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=1.5,
+        help='Allowed slowdown factor compared to the baseline.',
+    )
+    parser.add_argument('--repeat', type=int, default=10)
+    arguments = parser.parse_args(argv)
+
+    # The first import writes the bytecode cache.
+    measure_import()
+    timings = []
+    for _ in range(arguments.repeat):
+        timing, modules = measure_import()
+        timings.append(timing)
+
+    result = dict(
+        min=min(timings),
+        median=statistics.median(timings),
+        modules=[module for module in modules if '.' not in module],
+    )
+    print(
+        f'import {MODULE}: min {result["min"] * 1000:.2f}ms  '
+        f'median {result["median"] * 1000:.2f}ms'
+    )
+    print(f'new top level modules: {", ".join(result["modules"])}')
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(result, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        ratio = result['min'] / max(baseline['min'], 1e-9)
+        print(f'ratio to baseline: {ratio:.2f}x')
+        if ratio > arguments.threshold:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
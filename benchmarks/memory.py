@@ -0,0 +1,104 @@
+"""
+Memory benchmark for dash-template-rendering.
+
+Renders the generated templates of :mod:`cases` with differing contexts and keeps
+all rendered layouts alive, like the layouts of concurrent sessions. The memory
+held by the layouts and the number of allocated blocks are measured with
+:mod:`tracemalloc`, once with fresh components for every render and once with
+``TemplateRenderer(share_static=True)``, which shares the static subtrees of the
+templates between the renders.
+
+Usage::
+
+    python benchmarks/memory.py --output memory.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+import typing
+
+import dash
+from cases import CASES, QUICK_CASES, Case, make_context, make_template
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+
+MODES = ('fresh', 'shared')
+
+
+def measure_case(
+    case: Case, renders: int, share_static: bool
+) -> typing.Dict[str, typing.Any]:
+    app = dash.Dash(__name__)
+    # Expression slots let renders with different contexts share one skeleton.
+    TemplateRenderer(dash=app, expression_slots=True, share_static=share_static)
+    source = make_template(case)
+    contexts = [make_context(case, seed=seed) for seed in range(renders)]
+
+    with app.server.app_context():
+        # The first render compiles the template and its skeleton.
+        render_dash_template_string(source, **contexts[0])
+        gc.collect()
+        tracemalloc.start()
+        start = tracemalloc.take_snapshot()
+        layouts = [
+            render_dash_template_string(source, **context) for context in contexts
+        ]
+        gc.collect()
+        end = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    statistics = end.compare_to(start, 'filename')
+    del layouts
+    return dict(
+        bytes=sum(statistic.size_diff for statistic in statistics),
+        blocks=sum(statistic.count_diff for statistic in statistics),
+    )
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument(
+        '--renders', type=int, default=20, help='Number of layouts kept alive.'
+    )
+    parser.add_argument('--quick', action='store_true', help='Run the small cases.')
+    arguments = parser.parse_args(argv)
+
+    results: typing.Dict[str, typing.Any] = dict(
+        meta=dict(
+            created=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            python=platform.python_version(),
+            dash=dash.__version__,
+            renders=arguments.renders,
+        ),
+        results={},
+    )
+    for case in QUICK_CASES if arguments.quick else CASES:
+        result = {
+            mode: measure_case(
+                case, renders=arguments.renders, share_static=mode == 'shared'
+            )
+            for mode in MODES
+        }
+        results['results'][case.name] = result
+        fresh, shared = result['fresh'], result['shared']
+        print(
+            f'{case.name:>16}  '
+            f'fresh {fresh["bytes"] / 1024:9.0f}KiB {fresh["blocks"]:>9} blocks  '
+            f'shared {shared["bytes"] / 1024:9.0f}KiB {shared["blocks"]:>9} blocks  '
+            f'({shared["bytes"] / max(fresh["bytes"], 1):.0%} of the memory)'
+        )
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Benchmark runner for dash-template-rendering.
+
+Renders the generated templates of :mod:`cases` and measures the time spent in
+the three phases of a render:
+
+``jinja``
+    Rendering the Jinja2 template to html.
+``parse``
+    Analyzing the rendered html into a template skeleton (``_parse_template``
+    without the skeleton cache).
+``build``
+    Building the Dash components, or their JSON with ``--json``, from the skeleton
+    and the embedded ``plotly`` payloads.
+``render``
+    A complete ``render_dash_template_string`` call including all caches.
+
+The JSON size of the rendered layout is reported as well, together with the size
+:func:`~dash_template_rendering.minimizing.minimize_layout` reduces it to.
+
+Usage::
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --baseline results.json --threshold 1.2
+
+When a baseline is given, every phase is compared to it and the runner exits
+with status 1, if a phase got slower than the threshold allows.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+import typing
+
+import dash
+from cases import CASES, QUICK_CASES, Case, make_context, make_template
+from flask import render_template_string
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+from dash_template_rendering.minimizing import size_report
+from dash_template_rendering.templating import (
+    _BUILDERS,
+    JSON_ENGINES,
+    PARSER_BACKENDS,
+    _compile_skeleton,
+    _count_nodes,
+    _embedded_components_scope,
+    _extract_plotly_payloads,
+)
+
+PHASES = ('jinja', 'parse', 'build', 'render')
+
+
+def _summary(timings: typing.List[float]) -> typing.Dict[str, float]:
+    return dict(min=min(timings), median=statistics.median(timings))
+
+
+def run_case(
+    app: dash.Dash, case: Case, repeat: int, parser: str, output: str = 'component'
+) -> typing.Dict[str, typing.Any]:
+    renderer = app.server.extensions['dash_template_rendering']
+    source = make_template(case)
+    context = make_context(case)
+    timings: typing.Dict[str, typing.List[float]] = {phase: [] for phase in PHASES}
+
+    with app.server.app_context():
+        for _ in range(repeat):
+            with _embedded_components_scope() as embedded:
+                start = time.perf_counter()
+                html = render_template_string(source, **context)
+                rendered = time.perf_counter()
+                skeleton_html, payloads = _extract_plotly_payloads(
+                    html, embedded=embedded
+                )
+                skeleton = _compile_skeleton(skeleton_html, parser=parser)
+                parsed = time.perf_counter()
+                _BUILDERS[output](
+                    skeleton[0], payloads=payloads, loads=renderer._json_loads
+                )
+                built = time.perf_counter()
+
+            layout = render_dash_template_string(source, output=output, **context)
+            finished = time.perf_counter()
+
+            timings['jinja'].append(rendered - start)
+            timings['parse'].append(parsed - rendered)
+            timings['build'].append(built - parsed)
+            timings['render'].append(finished - built)
+
+    result: typing.Dict[str, typing.Any] = {
+        phase: _summary(values) for phase, values in timings.items()
+    }
+    sizes = size_report(layout)
+    result.update(
+        html_bytes=len(html.encode()),
+        layout_bytes=sizes.original_bytes,
+        minimized_bytes=sizes.minimized_bytes,
+        nodes=_count_nodes(skeleton),
+        embeds=case.embeds,
+        points=case.points,
+    )
+    return result
+
+
+def compare(
+    results: typing.Dict[str, typing.Any],
+    baseline: typing.Dict[str, typing.Any],
+    threshold: float,
+) -> bool:
+    """Print the ratio of every phase to the baseline and return, if all phases
+    stayed within the threshold.
+    """
+    passed = True
+    for name, result in results['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+
+        for phase in PHASES:
+            ratio = result[phase]['min'] / max(reference[phase]['min'], 1e-9)
+            marker = ''
+            if ratio > threshold:
+                marker = '  <-- regression'
+                passed = False
+            print(f'{name:>16} {phase:>8}: {ratio:6.2f}x{marker}')
+    return passed
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', help='Write the results as JSON to this file.')
+    parser.add_argument('--baseline', help='Compare the results to this JSON file.')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=1.2,
+        help='Allowed slowdown factor compared to the baseline.',
+    )
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--parser', choices=sorted(PARSER_BACKENDS), default='bs4')
+    parser.add_argument('--quick', action='store_true', help='Run the small cases.')
+    parser.add_argument(
+        '--json', action='store_true', help='Build Dash JSON instead of components.'
+    )
+    parser.add_argument(
+        '--json-engine',
+        choices=JSON_ENGINES,
+        help='JSON engine of the plotly payloads, defaults to orjson if installed.',
+    )
+    arguments = parser.parse_args(argv)
+
+    app = dash.Dash(__name__)
+    TemplateRenderer(
+        dash=app, parser=arguments.parser, json_engine=arguments.json_engine
+    )
+
+    results: typing.Dict[str, typing.Any] = dict(
+        meta=dict(
+            created=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            python=platform.python_version(),
+            dash=dash.__version__,
+            parser=arguments.parser,
+            json_engine=arguments.json_engine,
+            output='json' if arguments.json else 'component',
+            repeat=arguments.repeat,
+        ),
+        results={},
+    )
+    for case in QUICK_CASES if arguments.quick else CASES:
+        result = run_case(
+            app=app,
+            case=case,
+            repeat=arguments.repeat,
+            parser=arguments.parser,
+            output=results['meta']['output'],
+        )
+        results['results'][case.name] = result
+        phases = '  '.join(
+            f'{phase} {result[phase]["min"] * 1000:9.2f}ms' for phase in PHASES
+        )
+        print(
+            f'{case.name:>16} ({result["nodes"]:>6} nodes)  {phases}  '
+            f'layout {result["layout_bytes"] / 1024:.0f}KiB '
+            f'(minimized {result["minimized_bytes"] / 1024:.0f}KiB)'
+        )
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        if not compare(results, baseline, threshold=arguments.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
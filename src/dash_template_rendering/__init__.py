@@ -4,7 +4,30 @@ for the dashboard with jinja2. The rendered content can be used for the ``dash.l
 and the return of callbacks.
 """
 
+from .patching import make_patch
+from .sharing import thaw
 from .template_renderer import TemplateRenderer
-from .templating import render_dash_template, render_dash_template_string
+from .templating import (
+    render_dash_template,
+    render_dash_template_async,
+    render_dash_template_many,
+    render_dash_template_patch,
+    render_dash_template_string,
+    render_dash_template_string_async,
+    render_dash_template_string_many,
+    render_dash_template_string_patch,
+)
 
-__all__ = ['TemplateRenderer', 'render_dash_template', 'render_dash_template_string']
+__all__ = [
+    'TemplateRenderer',
+    'make_patch',
+    'render_dash_template',
+    'render_dash_template_async',
+    'render_dash_template_many',
+    'render_dash_template_patch',
+    'render_dash_template_string',
+    'render_dash_template_string_async',
+    'render_dash_template_string_many',
+    'render_dash_template_string_patch',
+    'thaw',
+]
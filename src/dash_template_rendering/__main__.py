@@ -0,0 +1,87 @@
+"""
+Command line interface of dash-template-rendering.
+
+Usage::
+
+    python -m dash_template_rendering compile templates/ --output templates.artifact
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import typing
+
+from dash_template_rendering.artifact import compile_templates, save_artifact
+
+
+def _import_app(path: str) -> typing.Any:
+    module_name, _, attribute = path.partition(':')
+    app = getattr(importlib.import_module(module_name), attribute or 'app')
+    return app() if callable(app) and not hasattr(app, 'server') else app
+
+
+def compile_command(arguments: argparse.Namespace) -> int:
+    contexts = None
+    if arguments.contexts is not None:
+        with open(arguments.contexts) as file:
+            contexts = json.load(file)
+
+    app = None
+    if arguments.app is not None:
+        sys.path.insert(0, '.')
+        app = _import_app(arguments.app)
+
+    errors: typing.Dict[str, Exception] = {}
+    render_errors: typing.Dict[str, Exception] = {}
+    artifact = compile_templates(
+        arguments.template_dir,
+        app=app,
+        contexts=contexts,
+        errors=errors,
+        render_errors=render_errors,
+    )
+    save_artifact(artifact, arguments.output)
+
+    # Failed sample renders only leave skeletons out of the artifact, templates
+    # failing to compile are broken.
+    for name, error in render_errors.items():
+        print(f'Warning: {name}: {type(error).__name__}: {error}', file=sys.stderr)
+    for name, error in errors.items():
+        print(f'Error: {name}: {type(error).__name__}: {error}', file=sys.stderr)
+    print(
+        f'Compiled {len({name for _, name in artifact.bytecode})} templates and '
+        f'{len(artifact.skeletons)} skeletons into {arguments.output}.'
+    )
+    return 1 if errors else 0
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m dash_template_rendering')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    compile_parser = commands.add_parser(
+        'compile', help='Compile the templates of a directory into an artifact.'
+    )
+    compile_parser.add_argument('template_dir', help='The template directory.')
+    compile_parser.add_argument(
+        '--output', default='templates.artifact', help='The artifact file to write.'
+    )
+    compile_parser.add_argument(
+        '--app',
+        help='Import path "module:attribute" of the Dash application or its factory, '
+        'whose Jinja2 environment and TemplateRenderer are used.',
+    )
+    compile_parser.add_argument(
+        '--contexts',
+        help='JSON file mapping template names to lists of sample contexts, which '
+        'are rendered to analyze the template skeletons.',
+    )
+    compile_parser.set_defaults(handler=compile_command)
+
+    arguments = parser.parse_args(argv)
+    return arguments.handler(arguments)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
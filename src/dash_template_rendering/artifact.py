@@ -0,0 +1,292 @@
+"""
+Ahead-of-time compilation of the templates of an application.
+
+An artifact bundles the Jinja2 bytecode of all templates in a directory with the
+template skeletons analyzed from sample renders. It is created on deployment::
+
+    python -m dash_template_rendering compile templates/ --output templates.artifact
+
+and loaded by the ``TemplateRenderer`` at startup::
+
+    TemplateRenderer(dash=app, artifact='templates.artifact')
+
+Bytecode of templates, whose source changed since the compilation, is ignored. The
+artifact is a pickle file, so only artifacts of trusted origin must be loaded.
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import typing
+import warnings
+import zlib
+
+import dash
+import flask
+import jinja2
+from jinja2.bccache import Bucket
+
+from dash_template_rendering.templating import (
+    EXTENSION_NAME,
+    _environment,
+    _Skeleton,
+    render_dash_template,
+)
+
+#: Version of the artifact layout, artifacts of other versions are ignored.
+ARTIFACT_VERSION = 1
+
+
+class Artifact(typing.NamedTuple):
+    """Compiled templates of an application.
+
+    :param bytecode: Serialized bytecode buckets by environment options and
+        template name.
+    :param skeletons: Analyzed template skeletons by skeleton cache key.
+    :param versions: Versions of the libraries the artifact was compiled with.
+    """
+
+    bytecode: typing.Dict[typing.Tuple[typing.Hashable, str], bytes]
+    skeletons: typing.Dict[typing.Hashable, _Skeleton]
+    versions: typing.Dict[str, typing.Any]
+
+
+def _versions() -> typing.Dict[str, typing.Any]:
+    return {
+        'artifact': ARTIFACT_VERSION,
+        'python': tuple(sys.version_info[:2]),
+        'jinja2': jinja2.__version__,
+        'dash': dash.__version__,
+    }
+
+
+def _environment_key(environment: jinja2.Environment, name: str) -> typing.Hashable:
+    # Options changing the code generated for a template.
+    autoescape = environment.autoescape
+    if callable(autoescape):
+        autoescape = autoescape(name)
+    finalize = environment.finalize
+    if finalize is not None:
+        finalize = f'{finalize.__module__}.{finalize.__qualname__}'
+
+    return (
+        environment.block_start_string,
+        environment.block_end_string,
+        environment.variable_start_string,
+        environment.variable_end_string,
+        environment.comment_start_string,
+        environment.comment_end_string,
+        environment.line_statement_prefix,
+        environment.line_comment_prefix,
+        environment.trim_blocks,
+        environment.lstrip_blocks,
+        environment.newline_sequence,
+        environment.keep_trailing_newline,
+        tuple(sorted(environment.extensions)),
+        environment.optimized,
+        environment.is_async,
+        bool(autoescape),
+        finalize,
+    )
+
+
+class ArtifactBytecodeCache(jinja2.BytecodeCache):
+    """Jinja2 bytecode cache serving the bytecode of an artifact.
+
+    Templates are identified by their name only, so the artifact can be compiled
+    on another machine than it is used on.
+
+    :param bytecode: The bytecode of an :class:`Artifact`.
+    :param record: Store the bytecode of newly compiled templates.
+    """
+
+    def __init__(
+        self,
+        bytecode: typing.Optional[
+            typing.Dict[typing.Tuple[typing.Hashable, str], bytes]
+        ] = None,
+        record: bool = False,
+    ) -> None:
+        self.bytecode = {} if bytecode is None else bytecode
+        self.record = record
+
+    def get_cache_key(self, name: str, filename: typing.Optional[str] = None) -> str:
+        return name
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        data = self.bytecode.get((
+            _environment_key(bucket.environment, bucket.key),
+            bucket.key,
+        ))
+        if data is not None:
+            bucket.bytecode_from_string(data)
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        if self.record:
+            key = (_environment_key(bucket.environment, bucket.key), bucket.key)
+            self.bytecode[key] = bucket.bytecode_to_string()
+
+
+def save_artifact(artifact: Artifact, path: typing.Union[str, os.PathLike]) -> None:
+    """Write an artifact to a file.
+
+    :param artifact: The artifact to write.
+    :param path: The path of the file.
+    """
+    data = zlib.compress(pickle.dumps(artifact, protocol=pickle.HIGHEST_PROTOCOL))
+    _write_atomic(path, data)
+
+
+def _write_atomic(path: typing.Union[str, os.PathLike], data: bytes) -> None:
+    # Readers see either the previous or the complete new file.
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+        file.write(data)
+    try:
+        os.replace(file.name, path)
+    except OSError:
+        os.unlink(file.name)
+        raise
+
+
+def load_artifact(path: typing.Union[str, os.PathLike]) -> typing.Optional[Artifact]:
+    """Read an artifact from a file.
+
+    :param path: The path of the file.
+    :return: The artifact or ``None``, if it was compiled with another artifact
+        version.
+    """
+    with open(path, 'rb') as file:
+        artifact = pickle.loads(zlib.decompress(file.read()))
+
+    if artifact.versions.get('artifact') != ARTIFACT_VERSION:
+        warnings.warn(
+            f'Template artifact "{path}" has an unsupported version and is ignored.'
+        )
+        return None
+    return artifact
+
+
+def compile_templates(
+    template_dir: typing.Union[str, os.PathLike],
+    app: typing.Optional[dash.Dash] = None,
+    contexts: typing.Optional[
+        typing.Dict[str, typing.List[typing.Dict[str, typing.Any]]]
+    ] = None,
+    errors: typing.Optional[typing.Dict[str, Exception]] = None,
+    render_errors: typing.Optional[typing.Dict[str, Exception]] = None,
+) -> Artifact:
+    """Compile all templates of a directory into an artifact.
+
+    Every template is compiled to bytecode and rendered once for each of its
+    sample contexts, by default once with an empty context, to analyze its
+    skeleton. Templates, which fail to render, are only compiled.
+
+    :param template_dir: The directory of the templates. Template names are
+        relative to it.
+    :param app: The Dash application the templates are rendered with. Its Jinja2
+        environment options and ``TemplateRenderer`` are used. Without an
+        application, a default one using ``template_dir`` is created.
+    :param contexts: Sample contexts by template name.
+    :param errors: Collects the errors of templates, which failed to compile, by
+        template name.
+    :param render_errors: Collects the errors of failed sample renders by template
+        name. Without it, they are collected in ``errors``.
+    :return: The compiled artifact.
+    """
+    from dash_template_rendering.template_renderer import TemplateRenderer
+
+    template_dir = os.path.abspath(template_dir)
+    if app is None:
+        app = dash.Dash(
+            __name__, server=flask.Flask(__name__, template_folder=template_dir)
+        )
+    server = app.server
+    renderer = server.extensions.get(EXTENSION_NAME)
+    if renderer is None:
+        renderer = TemplateRenderer(dash=app)
+
+    bytecode_cache = ArtifactBytecodeCache(record=True)
+    previous_bytecode_cache = server.jinja_env.bytecode_cache
+    server.jinja_env.bytecode_cache = bytecode_cache
+    if server.jinja_env.cache is not None:
+        server.jinja_env.cache.clear()
+    renderer._jinja_envs = {}
+    renderer.clear_cache()
+
+    environments = [server.jinja_env]
+    if renderer.expression_slots:
+        environments.append(_environment(server, renderer, expression_slots=True))
+
+    errors = {} if errors is None else errors
+    if render_errors is None:
+        render_errors = errors
+    try:
+        names = jinja2.FileSystemLoader(template_dir).list_templates()
+        for name in names:
+            try:
+                for environment in environments:
+                    environment.get_template(name)
+            except Exception as e:
+                errors[name] = e
+                continue
+
+            for context in (contexts or {}).get(name, [{}]):
+                with app.server.test_request_context():
+                    try:
+                        render_dash_template(name, use_cache=False, **context)
+                    except Exception as e:
+                        render_errors[name] = e
+    finally:
+        server.jinja_env.bytecode_cache = previous_bytecode_cache
+        renderer._jinja_envs = {}
+
+    skeletons = {
+        key: renderer._skeleton_cache.get(key)
+        for key in renderer._skeleton_cache.keys()
+    }
+    renderer.clear_cache()
+    return Artifact(
+        bytecode=bytecode_cache.bytecode, skeletons=skeletons, versions=_versions()
+    )
+
+
+def install_artifact(renderer: typing.Any, artifact: Artifact) -> None:
+    """Load the bytecode and skeletons of an artifact into a ``TemplateRenderer``
+    and its Dash application.
+
+    :param renderer: An initialized ``TemplateRenderer``.
+    :param artifact: The artifact to load.
+    """
+    server = renderer._dash.server
+    versions = _versions()
+    if artifact.versions.get('dash') == versions['dash']:
+        for key, skeleton in artifact.skeletons.items():
+            renderer._skeleton_cache.set(key, skeleton)
+    else:
+        warnings.warn(
+            'Template skeletons of the artifact were compiled with another Dash '
+            'version and are ignored.'
+        )
+
+    if server.jinja_env.bytecode_cache is not None:
+        warnings.warn(
+            'The Jinja2 environment has a bytecode cache already, the bytecode of '
+            'the artifact is ignored.'
+        )
+        return
+
+    server.jinja_env.bytecode_cache = ArtifactBytecodeCache(artifact.bytecode)
+    renderer._jinja_envs = {}
+    environments = [server.jinja_env]
+    if renderer.expression_slots:
+        environments.append(_environment(server, renderer, expression_slots=True))
+
+    # Load the templates now instead of on the first request.
+    for name in sorted({name for _, name in artifact.bytecode}):
+        try:
+            for environment in environments:
+                environment.get_template(name)
+        except jinja2.TemplateNotFound:
+            continue
@@ -0,0 +1,148 @@
+"""
+Persistent template cache shared by the worker processes of a host.
+
+A cache directory holds the Jinja2 bytecode of the templates and the analyzed
+template skeletons, so only the first process compiling a template pays for it::
+
+    TemplateRenderer(dash=app, cache_dir='/var/cache/my-app/templates')
+
+Files are written to a temporary file and renamed, so concurrent readers and
+writers always see complete files. Skeletons are addressed by the digest of the
+rendered html and the library versions, stale files are never used. Only renders
+with ``expression_slots``, whose values were all filled into slots, store their
+skeletons, as their skeleton html does not change with the values of a render, so
+the directory grows with the templates only. Renders inlining html, like values
+marked safe or expressions in ``{% autoescape false %}`` blocks, are only cached
+in memory. The skeletons are pickle files, so the directory must only be writable by
+trusted users.
+"""
+
+import hashlib
+import os
+import pickle
+import typing
+import warnings
+
+import jinja2
+from jinja2.bccache import Bucket
+
+from dash_template_rendering.artifact import (
+    _environment_key,
+    _versions,
+    _write_atomic,
+)
+from dash_template_rendering.templating import _Skeleton
+
+
+class CacheDirBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """File system bytecode cache keeping the bytecode of differently configured
+    environments apart, e.g. the async overlay of an environment.
+
+    :param directory: The directory of the bytecode files.
+    """
+
+    def get_bucket(
+        self,
+        environment: jinja2.Environment,
+        name: str,
+        filename: typing.Optional[str],
+        source: str,
+    ) -> Bucket:
+        options = hashlib.blake2b(
+            repr(_environment_key(environment, name)).encode(), digest_size=8
+        ).hexdigest()
+        bucket = Bucket(
+            environment,
+            f'{self.get_cache_key(name, filename)}-{options}',
+            self.get_source_checksum(source),
+        )
+        self.load_bytecode(bucket)
+        return bucket
+
+
+class SkeletonStore:
+    """Directory of analyzed template skeletons.
+
+    :param directory: The directory of the skeleton files.
+    """
+
+    def __init__(self, directory: typing.Union[str, os.PathLike]) -> None:
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._versions = repr(sorted(_versions().items()))
+        self._options: typing.Optional[typing.Tuple[typing.Any, ...]] = None
+
+    def get(
+        self, key: typing.Hashable, renderer: typing.Any
+    ) -> typing.Optional[_Skeleton]:
+        """Read a skeleton.
+
+        :param key: The skeleton cache key.
+        :param renderer: The ``TemplateRenderer`` analyzing the templates.
+        :return: The skeleton or ``None``, if it was not stored or can not be read.
+        """
+        try:
+            with open(self._path(key, renderer), 'rb') as file:
+                skeleton = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+        return skeleton if isinstance(skeleton, _Skeleton) else None
+
+    def set(
+        self, key: typing.Hashable, skeleton: _Skeleton, renderer: typing.Any
+    ) -> None:
+        """Write a skeleton.
+
+        :param key: The skeleton cache key.
+        :param skeleton: The skeleton to write.
+        :param renderer: The ``TemplateRenderer`` analyzing the templates.
+        """
+        try:
+            data = pickle.dumps(skeleton, protocol=pickle.HIGHEST_PROTOCOL)
+            _write_atomic(self._path(key, renderer), data)
+        except (OSError, pickle.PicklingError, AttributeError, TypeError) as e:
+            warnings.warn(f'Unable to write template skeleton to the cache: {e}')
+
+    def _path(self, key: typing.Hashable, renderer: typing.Any) -> str:
+        digest = hashlib.blake2b(
+            repr((self._options_digest(renderer), key)).encode(), digest_size=16
+        )
+        return os.path.join(self.directory, f'{digest.hexdigest()}.pickle')
+
+    def _options_digest(self, renderer: typing.Any) -> str:
+        # Skeletons depend on the renderer options as well. Registering components
+        # replaces the tag mapping of the renderer.
+        tags = renderer._tag_mapping()
+        state = (renderer.parser, renderer.minimize, renderer.share_static)
+        options = self._options
+        if options is None or options[0] is not tags or options[1] != state:
+            digest = hashlib.blake2b(
+                repr((self._versions, state, sorted(tags))).encode(), digest_size=16
+            ).hexdigest()
+            options = self._options = (tags, state, digest)
+        return options[2]
+
+
+def install_cache_dir(
+    renderer: typing.Any, directory: typing.Union[str, os.PathLike]
+) -> None:
+    """Use a cache directory for the bytecode and skeletons of a ``TemplateRenderer``
+    and its Dash application.
+
+    :param renderer: An initialized ``TemplateRenderer``.
+    :param directory: The cache directory, it is created if missing.
+    """
+    bytecode_directory = os.path.join(directory, 'bytecode')
+    os.makedirs(bytecode_directory, exist_ok=True)
+    renderer._skeleton_store = SkeletonStore(os.path.join(directory, 'skeletons'))
+
+    server = renderer._dash.server
+    if server.jinja_env.bytecode_cache is not None:
+        warnings.warn(
+            'The Jinja2 environment has a bytecode cache already, the cache '
+            'directory only stores template skeletons.'
+        )
+        return
+
+    server.jinja_env.bytecode_cache = CacheDirBytecodeCache(bytecode_directory)
+    renderer._jinja_envs = {}
@@ -0,0 +1,168 @@
+import collections
+import collections.abc
+import datetime
+import decimal
+import hashlib
+import threading
+import time
+import typing
+
+from dash.development.base_component import Component
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe mapping with least recently used eviction.
+
+    :param maxsize: Maximal number of entries kept. ``0`` disables the cache.
+    :param ttl: Seconds after which an entry expires. ``None`` keeps entries until
+        they are evicted.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: typing.Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: typing.Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """Return the value for ``key`` and mark it as recently used.
+
+        :param key: The key to look up.
+        :param default: Returned if ``key`` is not cached.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(
+        self,
+        key: typing.Hashable,
+        value: typing.Any,
+        ttl: typing.Optional[float] = None,
+    ) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entries.
+
+        :param key: The key to store the value under.
+        :param value: The value to store.
+        :param ttl: Seconds after which this entry expires instead of the ``ttl`` of
+            the cache.
+        """
+        if self.maxsize <= 0:
+            return
+
+        if ttl is None:
+            ttl = self.ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """Remove ``key`` and return its value.
+
+        :param key: The key to remove.
+        :param default: Returned if ``key`` is not cached.
+        """
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            return entry[0]
+
+    def keys(self) -> typing.List[typing.Hashable]:
+        """Return a snapshot of the cached keys, least recently used first."""
+        with self._lock:
+            return list(self._data.keys())
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+
+def fingerprint(value: typing.Any) -> str:
+    """Create a stable fingerprint of a template context value.
+
+    Supported are ``None``, numbers, strings, bytes, dates, lists, tuples, sets,
+    dicts, Dash components, plotly figures and NumPy arrays, as well as any nesting
+    of them. Two values with equal content get the same fingerprint.
+
+    :param value: The value to fingerprint.
+    :return: The hexadecimal digest of the value.
+    :raises TypeError: If the value or a nested value is not supported.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    _update_fingerprint(hasher, value)
+    return hasher.hexdigest()
+
+
+def _update_fingerprint(hasher: typing.Any, value: typing.Any) -> None:
+    if value is None or isinstance(
+        value,
+        (
+            bool,
+            int,
+            float,
+            complex,
+            str,
+            bytes,
+            decimal.Decimal,
+            datetime.date,
+            datetime.time,
+            datetime.timedelta,
+        ),
+    ):
+        hasher.update(f'{type(value).__qualname__}:{value!r};'.encode())
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f'{type(value).__qualname__}[{len(value)}:'.encode())
+        for item in value:
+            _update_fingerprint(hasher, item)
+        hasher.update(b']')
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(f'{type(value).__qualname__}[{len(value)}:'.encode())
+        for item in sorted(map(fingerprint, value)):
+            hasher.update(item.encode())
+        hasher.update(b']')
+    elif isinstance(value, collections.abc.Mapping):
+        hasher.update(f'{type(value).__qualname__}{{{len(value)}:'.encode())
+        for key, item in sorted(
+            ((fingerprint(key), item) for key, item in value.items()),
+            key=lambda entry: entry[0],
+        ):
+            hasher.update(key.encode())
+            _update_fingerprint(hasher, item)
+        hasher.update(b'}')
+    elif isinstance(value, Component):
+        hasher.update(f'{value._namespace}.{value._type}:'.encode())
+        _update_fingerprint(hasher, value.to_plotly_json()['props'])
+    elif hasattr(value, 'to_plotly_json'):
+        hasher.update(f'{type(value).__qualname__}:'.encode())
+        _update_fingerprint(hasher, value.to_plotly_json())
+    elif (
+        hasattr(value, 'dtype')
+        and hasattr(value, 'shape')
+        and hasattr(value, 'tobytes')
+    ):
+        hasher.update(f'array:{value.dtype}:{value.shape}:'.encode())
+        hasher.update(value.tobytes())
+    else:
+        raise TypeError(f'Unable to fingerprint value of type {type(value)}.')
@@ -0,0 +1,134 @@
+import threading
+import typing
+
+import jinja2
+import jinja2.meta
+
+_Uptodate = typing.Optional[typing.Callable[[], bool]]
+
+
+class TemplateDependencies:
+    """Thread-safe record of the template files every cached template depends on.
+
+    Dependencies are the template itself and the templates it references with
+    ``{% extends %}``, ``{% include %}``, ``{% import %}`` and ``{% from %}``,
+    collected transitively. Templates referenced by a variable, like
+    ``{% include name %}``, can not be tracked.
+    """
+
+    def __init__(self) -> None:
+        self._dependencies: typing.Dict[typing.Hashable, typing.FrozenSet[str]] = {}
+        self._templates: typing.Dict[
+            str, typing.Tuple[jinja2.Environment, _Uptodate]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, template_key: typing.Hashable) -> bool:
+        return template_key in self._dependencies
+
+    def track(
+        self,
+        environment: jinja2.Environment,
+        template_key: typing.Hashable,
+        names: typing.Iterable[str] = (),
+        source: typing.Optional[str] = None,
+    ) -> None:
+        """Record the dependencies of a template.
+
+        :param environment: The Jinja2 environment loading the templates.
+        :param template_key: The key of the template in the renderer caches.
+        :param names: Names of the template. Templates of a list, which do not
+            exist yet, are tracked too, as their creation changes the selected
+            template.
+        :param source: The source of a template rendered from a string.
+        """
+        pending = list(names)
+        if source is not None:
+            pending.extend(_referenced_templates(environment, source))
+
+        dependencies = set()
+        templates = {}
+        while pending:
+            name = pending.pop()
+            if name in dependencies:
+                continue
+            dependencies.add(name)
+
+            try:
+                source, _, uptodate = environment.loader.get_source(environment, name)
+            except jinja2.TemplateNotFound:
+                templates[name] = (environment, None)
+                continue
+            templates[name] = (environment, uptodate)
+            pending.extend(_referenced_templates(environment, source))
+
+        with self._lock:
+            for name, template in templates.items():
+                self._templates.setdefault(name, template)
+            self._dependencies[template_key] = frozenset(dependencies)
+
+    def dependents(self, names: typing.Iterable[str]) -> typing.Set[typing.Hashable]:
+        """Return the keys of the templates depending on any of the given
+        templates.
+
+        :param names: Template names.
+        """
+        names = set(names)
+        with self._lock:
+            return {
+                template_key
+                for template_key, dependencies in self._dependencies.items()
+                if not names.isdisjoint(dependencies)
+            }
+
+    def changed(self) -> typing.Set[str]:
+        """Return the names of the tracked templates, which were modified, created
+        or deleted since they were tracked.
+        """
+        with self._lock:
+            templates = list(self._templates.items())
+
+        changed = set()
+        for name, (environment, uptodate) in templates:
+            if uptodate is None:
+                try:
+                    environment.loader.get_source(environment, name)
+                except jinja2.TemplateNotFound:
+                    continue
+                changed.add(name)
+            elif not uptodate():
+                changed.add(name)
+        return changed
+
+    def discard(self, names: typing.Iterable[str]) -> typing.Set[typing.Hashable]:
+        """Stop tracking the given templates and the templates depending on them.
+
+        :param names: Template names.
+        :return: The keys of the templates, which depended on them.
+        """
+        names = set(names)
+        template_keys = self.dependents(names)
+        with self._lock:
+            for name in names:
+                self._templates.pop(name, None)
+            for template_key in template_keys:
+                self._dependencies.pop(template_key, None)
+        return template_keys
+
+    def clear(self) -> None:
+        """Stop tracking all templates."""
+        with self._lock:
+            self._dependencies.clear()
+            self._templates.clear()
+
+
+def _referenced_templates(
+    environment: jinja2.Environment, source: str
+) -> typing.List[str]:
+    try:
+        ast = environment.parse(source)
+    except jinja2.TemplateSyntaxError:
+        return []
+    return [
+        name for name in jinja2.meta.find_referenced_templates(ast) if name is not None
+    ]
@@ -0,0 +1,338 @@
+"""
+Cache for rendered regions of templates.
+
+The ``TemplateRenderer`` registers the ``dashcache`` tag, which caches the output of
+its block under a key, optionally for a number of seconds::
+
+    {% dashcache 'navigation', 300 %}
+        <nav>{% for page in load_pages() %}...{% endfor %}</nav>
+    {% enddashcache %}
+
+A block consisting of one html element is cached as the built Dash component, so
+later renders neither render the block nor analyze its html. Other blocks are
+cached as html. Components embedded with the ``plotly`` filter are cached with the
+block.
+
+The fragments are kept in a :class:`FragmentStore`, in memory by default::
+
+    TemplateRenderer(dash=app, fragment_store=FileSystemFragmentStore('/var/cache/app'))
+
+Blocks are cached across templates and contexts, so the key has to contain every
+value the block depends on, e.g. ``{% dashcache 'navigation-' ~ user.role %}``.
+"""
+
+import abc
+import copy
+import hashlib
+import os
+import pickle
+import re
+import time
+import typing
+import warnings
+
+import jinja2
+import jinja2.ext
+import jinja2.nodes
+import plotly
+from dash.development.base_component import Component
+from markupsafe import Markup, escape
+
+from dash_template_rendering.caching import LRUCache
+from dash_template_rendering.sharing import freeze, is_frozen
+from dash_template_rendering.templating import (
+    _EMBEDDED_COMPONENTS,
+    _EXPRESSION_PATTERN,
+    _EXPRESSION_VALUES,
+    _PLOTLY_CLOSE_TAG,
+    _PLOTLY_OPEN_TAG,
+    _PLOTLY_REFERENCE_TAG,
+    _VOID_ELEMENTS,
+    _build_node,
+    _check_values,
+    _compile_skeleton,
+    _Element,
+    _extract_plotly_payloads,
+    _minimize_node,
+)
+
+_REFERENCE_PATTERN = re.compile(
+    f'{re.escape(_PLOTLY_REFERENCE_TAG)}(\\d+)">{re.escape(_PLOTLY_CLOSE_TAG)}'
+)
+
+
+def _reference_tag(index: int) -> str:
+    return f'{_PLOTLY_REFERENCE_TAG}{index}">{_PLOTLY_CLOSE_TAG}'
+
+
+class Fragment(typing.NamedTuple):
+    """Cached output of a ``dashcache`` block.
+
+    :param markup: The rendered html. ``<plotly ref="index">`` tags reference the
+        components by their index.
+    :param components: Components referenced by the html.
+    """
+
+    markup: str
+    components: typing.Tuple[Component, ...] = ()
+
+
+class FragmentStore(abc.ABC):
+    """Storage of the ``dashcache`` blocks."""
+
+    @abc.abstractmethod
+    def get(self, key: typing.Hashable) -> typing.Optional[Fragment]:
+        """Return the fragment stored under a key.
+
+        :param key: The key of the block.
+        :return: The fragment or ``None``, if it is missing or expired.
+        """
+
+    @abc.abstractmethod
+    def set(
+        self, key: typing.Hashable, fragment: Fragment, timeout: typing.Optional[float]
+    ) -> None:
+        """Store a fragment.
+
+        :param key: The key of the block.
+        :param fragment: The rendered fragment.
+        :param timeout: Seconds after which the fragment expires, ``None`` uses the
+            default of the store.
+        """
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove all fragments."""
+
+
+class MemoryFragmentStore(FragmentStore):
+    """Fragment store in the memory of the process.
+
+    :param maxsize: Maximal number of fragments kept, the least recently used
+        fragments are evicted.
+    :param timeout: Default seconds after which a fragment expires. ``None`` keeps
+        fragments until they are evicted.
+    """
+
+    def __init__(self, maxsize: int = 128, timeout: typing.Optional[float] = None):
+        self._cache = LRUCache(maxsize=maxsize, ttl=timeout)
+
+    def get(self, key: typing.Hashable) -> typing.Optional[Fragment]:
+        return self._cache.get(key)
+
+    def set(
+        self, key: typing.Hashable, fragment: Fragment, timeout: typing.Optional[float]
+    ) -> None:
+        self._cache.set(key, fragment, ttl=timeout)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class FileSystemFragmentStore(FragmentStore):
+    """Fragment store in a directory, which can be shared by the processes of a
+    host. Fragments are pickle files, so the directory must only be writable by
+    trusted users.
+
+    :param directory: The directory of the fragment files, it is created if
+        missing.
+    :param timeout: Default seconds after which a fragment expires. ``None`` keeps
+        fragments until they are removed.
+    """
+
+    def __init__(
+        self,
+        directory: typing.Union[str, os.PathLike],
+        timeout: typing.Optional[float] = None,
+    ) -> None:
+        self.directory = os.fspath(directory)
+        self.timeout = timeout
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: typing.Hashable) -> typing.Optional[Fragment]:
+        try:
+            with open(self._path(key), 'rb') as file:
+                expires, fragment = pickle.load(file)
+        except (
+            OSError,
+            EOFError,
+            ValueError,
+            TypeError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+        ):
+            return None
+        if expires is not None and expires <= time.time():
+            return None
+        return fragment if isinstance(fragment, Fragment) else None
+
+    def set(
+        self, key: typing.Hashable, fragment: Fragment, timeout: typing.Optional[float]
+    ) -> None:
+        from dash_template_rendering.artifact import _write_atomic
+
+        if timeout is None:
+            timeout = self.timeout
+        expires = None if timeout is None else time.time() + timeout
+        try:
+            data = pickle.dumps((expires, fragment), protocol=pickle.HIGHEST_PROTOCOL)
+            _write_atomic(self._path(key), data)
+        except (OSError, pickle.PicklingError, AttributeError, TypeError) as e:
+            warnings.warn(f'Unable to write template fragment to the cache: {e}')
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith('.pickle'):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def _path(self, key: typing.Hashable) -> str:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.directory, f'{digest}.pickle')
+
+
+class DashCacheExtension(jinja2.ext.Extension):
+    """Jinja2 extension providing the ``{% dashcache key, timeout %}`` tag."""
+
+    tags = {'dashcache'}
+
+    def __init__(self, environment: jinja2.Environment) -> None:
+        super().__init__(environment)
+        self.store: FragmentStore = MemoryFragmentStore()
+        self.renderer: typing.Any = None
+
+    def parse(self, parser: jinja2.parser.Parser) -> jinja2.nodes.Node:
+        lineno = next(parser.stream).lineno
+        arguments = [parser.parse_expression()]
+        if parser.stream.skip_if('comma'):
+            arguments.append(parser.parse_expression())
+        else:
+            arguments.append(jinja2.nodes.Const(None))
+
+        body = parser.parse_statements(('name:enddashcache',), drop_needle=True)
+        return jinja2.nodes.CallBlock(
+            self.call_method('_render_block', arguments), [], [], body
+        ).set_lineno(lineno)
+
+    def _render_block(
+        self,
+        key: typing.Hashable,
+        timeout: typing.Optional[float],
+        caller: typing.Callable[[], typing.Any],
+    ) -> typing.Any:
+        if self.environment.is_async:
+            return self._render_block_async(key, timeout, caller)
+
+        fragment = self.store.get(key)
+        if fragment is None:
+            fragment = self._fragment(caller())
+            self.store.set(key, fragment, timeout)
+        return self._insert(fragment)
+
+    async def _render_block_async(
+        self,
+        key: typing.Hashable,
+        timeout: typing.Optional[float],
+        caller: typing.Callable[[], typing.Any],
+    ) -> Markup:
+        fragment = self.store.get(key)
+        if fragment is None:
+            fragment = self._fragment(await caller())
+            self.store.set(key, fragment, timeout)
+        return self._insert(fragment)
+
+    def _fragment(self, markup: str) -> Fragment:
+        # Values of expression slots belong to the current render.
+        values = _EXPRESSION_VALUES.get()
+        if values is not None:
+            _check_values(values)
+            markup = _EXPRESSION_PATTERN.sub(
+                lambda match: escape(values[int(match.group(1))]), markup
+            )
+
+        embedded = _EMBEDDED_COMPONENTS.get()
+        if embedded is None:
+            return Fragment(markup=markup)
+
+        component = self._build_component(markup, embedded)
+        if component is not None:
+            return Fragment(
+                markup=_reference_tag(0),
+                components=(self._detach(component),),
+            )
+
+        components: typing.List[Component] = []
+
+        def renumber(match: typing.Match[str]) -> str:
+            components.append(embedded[int(match.group(1))])
+            return _reference_tag(len(components) - 1)
+
+        markup = _REFERENCE_PATTERN.sub(renumber, markup)
+        return Fragment(markup=markup, components=tuple(map(self._detach, components)))
+
+    def _build_component(
+        self, markup: str, embedded: typing.Sequence[Component]
+    ) -> typing.Optional[Component]:
+        renderer = self.renderer
+        if renderer is None:
+            return None
+
+        skeleton_html, payloads = _extract_plotly_payloads(markup, embedded=embedded)
+        nodes = _compile_skeleton(
+            skeleton_html, parser=renderer.parser, tags=renderer._tag_mapping()
+        )
+        if len(nodes) != 1 or not isinstance(nodes[0], _Element):
+            return None
+        # Only complete elements, the parser closes elements left open by the
+        # block and ignores end tags of elements opened before it.
+        tag = nodes[0].tag.lower()
+        skeleton_html = skeleton_html.strip().lower()
+        if not skeleton_html.startswith(f'<{tag}') or not (
+            skeleton_html.endswith(f'</{tag}>') or tag in _VOID_ELEMENTS
+        ):
+            return None
+
+        node = _minimize_node(nodes[0]) if renderer.minimize else nodes[0]
+        return _build_node(node, payloads=payloads, loads=renderer._json_loads)
+
+    def _detach(self, component: Component) -> Component:
+        # Cached components must not change with the template context.
+        if self.renderer is not None and self.renderer.share_static:
+            return freeze(component)
+        return copy.deepcopy(component)
+
+    def _insert(self, fragment: Fragment) -> Markup:
+        if not fragment.components:
+            return Markup(fragment.markup)
+
+        components = [
+            component if is_frozen(component) else copy.deepcopy(component)
+            for component in fragment.components
+        ]
+        embedded = _EMBEDDED_COMPONENTS.get()
+        if embedded is None:
+            engine = None if self.renderer is None else self.renderer.json_engine
+            return Markup(
+                _REFERENCE_PATTERN.sub(
+                    lambda match: (
+                        _PLOTLY_OPEN_TAG
+                        + plotly.io.json.to_json_plotly(
+                            components[int(match.group(1))], engine=engine
+                        )
+                        + _PLOTLY_CLOSE_TAG
+                    ),
+                    fragment.markup,
+                )
+            )
+
+        offset = len(embedded)
+        embedded.extend(components)
+        return Markup(
+            _REFERENCE_PATTERN.sub(
+                lambda match: _reference_tag(offset + int(match.group(1))),
+                fragment.markup,
+            )
+        )
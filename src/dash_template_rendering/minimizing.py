@@ -0,0 +1,139 @@
+import json
+import typing
+
+import plotly
+
+#: Props, whose empty string value is dropped. An empty value of other props, like
+#: ``href``, ``alt``, ``value`` or ``data-*`` attributes, differs from a missing prop.
+DROP_EMPTY_PROPS = frozenset({'className', 'class'})
+
+
+# Elements rendering their text as it is. Children of other libraries, like the
+# list children of dcc.Markdown, are interpreted by the component.
+_PRESERVED_TEXT_TYPES = frozenset({'Pre', 'Textarea', 'Code', 'Script', 'Style'})
+
+
+class SizeReport(typing.NamedTuple):
+    """Size of the JSON Dash sends for a layout.
+
+    :param original_bytes: Bytes of the layout.
+    :param minimized_bytes: Bytes of the minimized layout.
+    """
+
+    original_bytes: int
+    minimized_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.minimized_bytes
+
+    @property
+    def ratio(self) -> float:
+        return self.minimized_bytes / max(self.original_bytes, 1)
+
+
+def _is_component(value: typing.Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and 'props' in value
+        and 'type' in value
+        and 'namespace' in value
+    )
+
+
+def _is_empty(name: str, value: typing.Any) -> bool:
+    return (
+        value is None
+        or (value == '' and name in DROP_EMPTY_PROPS)
+        or (name == 'style' and value == {})
+    )
+
+
+def _merges_children(namespace: str, component_type: str) -> bool:
+    return (
+        namespace == 'dash_html_components'
+        and component_type not in _PRESERVED_TEXT_TYPES
+    )
+
+
+def _minimize_children(children: typing.List[typing.Any]) -> typing.Any:
+    merged: typing.List[typing.Any] = []
+    for child in children:
+        if isinstance(child, str):
+            if not child:
+                continue
+            if child.isspace():
+                child = ' '
+            if merged and isinstance(merged[-1], str):
+                if not (child == ' ' and merged[-1].endswith(' ')):
+                    merged[-1] += child
+                continue
+        merged.append(child)
+
+    # Whitespace at the borders of an element is not rendered.
+    if merged and merged[0] == ' ':
+        del merged[0]
+    if merged and merged[-1] == ' ':
+        del merged[-1]
+
+    if len(merged) == 0:
+        return None
+    if len(merged) == 1:
+        return merged[0]
+    return merged
+
+
+def minimize_layout(layout: typing.Any) -> typing.Any:
+    """Reduce the JSON Dash sends for a layout without changing what is rendered.
+
+    Adjacent text children of html elements are merged, whitespace-only text
+    children collapsed and single item children lists unwrapped, except for
+    elements like ``Pre`` rendering their text as it is. Children of other
+    components are left alone. ``None`` props, empty styles and empty class names
+    are dropped. The
+    ``TemplateRenderer`` applies the same rules while rendering with
+    ``minimize=True``.
+
+    :param layout: A Dash component, its JSON dict or a list of them.
+    :return: The minimized layout as JSON dicts.
+    """
+    layout = json.loads(plotly.io.json.to_json_plotly(layout))
+    stack = [layout]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, dict):
+            if not _is_component(value):
+                stack.extend(value.values())
+                continue
+
+            props = value['props']
+            for name in [name for name, prop in props.items() if _is_empty(name, prop)]:
+                del props[name]
+            if 'children' in props and _merges_children(
+                value['namespace'], value['type']
+            ):
+                children = props['children']
+                children = _minimize_children(
+                    children if isinstance(children, list) else [children]
+                )
+                if children is None:
+                    del props['children']
+                else:
+                    props['children'] = children
+            stack.extend(props.values())
+    return layout
+
+
+def size_report(layout: typing.Any) -> SizeReport:
+    """Measure the bytes :func:`minimize_layout` saves for a layout.
+
+    :param layout: A Dash component, its JSON dict or a list of them.
+    """
+    return SizeReport(
+        original_bytes=len(plotly.io.json.to_json_plotly(layout).encode()),
+        minimized_bytes=len(
+            plotly.io.json.to_json_plotly(minimize_layout(layout)).encode()
+        ),
+    )
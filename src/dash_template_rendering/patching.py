@@ -0,0 +1,112 @@
+import json
+import typing
+
+import dash
+import plotly
+
+_Location = typing.List[typing.Union[str, int]]
+
+
+def _to_json(value: typing.Any) -> typing.Any:
+    return json.loads(plotly.io.json.to_json_plotly(value))
+
+
+def _is_component(value: typing.Any) -> bool:
+    return (
+        isinstance(value, dict)
+        and 'props' in value
+        and 'type' in value
+        and 'namespace' in value
+    )
+
+
+def _same_component(previous: dict, current: dict) -> bool:
+    return (
+        previous['type'] == current['type']
+        and previous['namespace'] == current['namespace']
+        and previous['props'].get('id') == current['props'].get('id')
+    )
+
+
+def _has_components(value: typing.Any) -> bool:
+    return isinstance(value, list) and any(map(_is_component, value))
+
+
+def make_patch(previous: typing.Any, current: typing.Any) -> typing.Any:
+    """Compare two renders of a callback output and describe the changes as a
+    ``dash.Patch``.
+
+    Components are matched by their position in the tree, type and ``id``. Props
+    of matched components and lists of components are compared item by item, other
+    values are replaced as a whole when they differ::
+
+        @callback(
+            Output('report', 'children'),
+            Input('year', 'value'),
+            State('report', 'children'),
+        )
+        def update_report(year, children):
+            return make_patch(children, render_dash_template('report.html', year=year))
+
+    :param previous: The previous value of the output, as received from a
+        ``State`` or a Dash component.
+    :param current: The new value of the output.
+    :return: A ``dash.Patch`` with the changes, ``dash.no_update`` if nothing
+        changed or the new value itself, if the two values do not match at the top
+        level.
+    """
+    rendered = current
+    previous = _to_json(previous)
+    current = _to_json(current)
+    if _is_component(previous) and _is_component(current):
+        if not _same_component(previous, current):
+            return rendered
+    elif not (
+        isinstance(previous, list)
+        and isinstance(current, list)
+        and (_has_components(previous) or _has_components(current))
+    ):
+        return dash.no_update if previous == current else rendered
+
+    patch = dash.Patch()
+    # Iterative, as rendered layouts may be deeper than the recursion limit.
+    stack: typing.List[typing.Tuple[typing.Any, typing.Any, _Location]] = [
+        (previous, current, [])
+    ]
+    while stack:
+        old, new, location = stack.pop()
+        if _is_component(old) and _is_component(new):
+            if not _same_component(old, new):
+                _assign(patch, location, new)
+                continue
+
+            old_props = old['props']
+            new_props = new['props']
+            for name in old_props.keys() - new_props.keys():
+                del dash.Patch(location + ['props'], parent=patch)[name]
+            for name, value in new_props.items():
+                if name not in old_props:
+                    dash.Patch(location + ['props'], parent=patch)[name] = value
+                else:
+                    stack.append((old_props[name], value, location + ['props', name]))
+        elif (
+            isinstance(old, list)
+            and isinstance(new, list)
+            and (_has_components(old) or _has_components(new))
+        ):
+            for index in range(min(len(old), len(new))):
+                stack.append((old[index], new[index], location + [index]))
+            for index in reversed(range(len(new), len(old))):
+                del dash.Patch(location, parent=patch)[index]
+            if len(new) > len(old):
+                dash.Patch(location, parent=patch).extend(new[len(old) :])
+        elif old != new:
+            _assign(patch, location, new)
+
+    if not patch._operations:
+        return dash.no_update
+    return patch
+
+
+def _assign(patch: dash.Patch, location: _Location, value: typing.Any) -> None:
+    dash.Patch(location[:-1], parent=patch)[location[-1]] = value
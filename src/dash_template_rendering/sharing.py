@@ -0,0 +1,219 @@
+"""
+Immutable components shared between renders.
+
+With ``TemplateRenderer(share_static=True)`` the subtrees of a template without
+any dynamic content are built once and every render returns the same objects.
+Shared components and their props can not be modified, :func:`thaw` returns a
+modifiable copy::
+
+    layout = render_dash_template('page.html')
+    header = thaw(layout.children[0])
+    header.className = 'active'
+    layout.children[0] = header
+"""
+
+import typing
+
+from dash.development.base_component import Component
+
+_FROZEN_CLASSES: typing.Dict[typing.Type[Component], type] = {}
+
+# Instance attributes of components, which are not props.
+_COMPONENT_ATTRIBUTES = frozenset({
+    '_prop_names',
+    '_valid_wildcard_attributes',
+    'available_properties',
+    'available_wildcard_properties',
+})
+
+
+def _modification_error(value: typing.Any) -> TypeError:
+    return TypeError(
+        f'{type(value).__name__} is shared between renders and can not be '
+        'modified. Use dash_template_rendering.thaw() to get a modifiable copy.'
+    )
+
+
+class _FrozenDict(dict):
+    """Dict, which can not be modified after its creation."""
+
+    def _immutable(self, *args: typing.Any, **kwargs: typing.Any) -> typing.NoReturn:
+        raise _modification_error(self)
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return _FrozenDict, (dict(self),)
+
+    def __copy__(self) -> '_FrozenDict':
+        return self
+
+    def __deepcopy__(self, memo: typing.Dict[int, typing.Any]) -> '_FrozenDict':
+        return self
+
+
+class _FrozenComponent:
+    """Mixin of shared components, see :func:`_frozen_class`."""
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise _modification_error(self)
+
+    def __delattr__(self, name: str) -> None:
+        raise _modification_error(self)
+
+    def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+        raise _modification_error(self)
+
+    def __delitem__(self, key: typing.Any) -> None:
+        raise _modification_error(self)
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        return _frozen_instance, (type(self).__bases__[1], dict(self.__dict__))
+
+    def __copy__(self) -> '_FrozenComponent':
+        return self
+
+    def __deepcopy__(self, memo: typing.Dict[int, typing.Any]) -> '_FrozenComponent':
+        return self
+
+
+def _frozen_class(component_class: typing.Type[Component]) -> type:
+    frozen_class = _FROZEN_CLASSES.get(component_class)
+    if frozen_class is None:
+        # Same name, module, namespace and children props as the component class,
+        # so the Dash component registry stays unchanged.
+        frozen_class = type(component_class)(
+            component_class.__name__,
+            (_FrozenComponent, component_class),
+            {
+                '__module__': component_class.__module__,
+                '__qualname__': component_class.__qualname__,
+                '_namespace': component_class._namespace,
+                '_children_props': getattr(component_class, '_children_props', []),
+            },
+        )
+        _FROZEN_CLASSES[component_class] = frozen_class
+    return frozen_class
+
+
+def _frozen_instance(
+    component_class: typing.Type[Component], state: typing.Dict[str, typing.Any]
+) -> Component:
+    component = component_class.__new__(component_class)
+    component.__dict__.update(state)
+    object.__setattr__(component, '__class__', _frozen_class(component_class))
+    return component
+
+
+def is_frozen(value: typing.Any) -> bool:
+    """Return, if a value is shared between renders and can not be modified.
+
+    :param value: A component or prop value.
+    """
+    return isinstance(value, (_FrozenComponent, _FrozenDict))
+
+
+def freeze(value: typing.Any) -> typing.Any:
+    """Return an immutable copy of a component tree or JSON value.
+
+    Components are converted to immutable subclasses, lists to tuples and dicts to
+    immutable dicts. Values, which are immutable already, are reused.
+
+    :param value: A component, its JSON dict or a prop value.
+    """
+    return _convert(value, _freeze_container, leaf=is_frozen)
+
+
+def thaw(value: typing.Any) -> typing.Any:
+    """Return a modifiable copy of a shared component tree or JSON value.
+
+    Values, which are not shared, are returned as they are.
+
+    :param value: A component, its JSON dict or a prop value.
+    """
+    if not isinstance(value, (_FrozenComponent, _FrozenDict, tuple)):
+        return value
+    return _convert(value, _thaw_container, leaf=_is_leaf)
+
+
+def _freeze_container(value: typing.Any, items: typing.List[typing.Any]) -> typing.Any:
+    if isinstance(value, Component):
+        return _frozen_instance(_original_class(value), _state(value, items))
+    if isinstance(value, dict):
+        return _FrozenDict(zip(value, items))
+    return tuple(items)
+
+
+def _thaw_container(value: typing.Any, items: typing.List[typing.Any]) -> typing.Any:
+    if isinstance(value, Component):
+        component_class = _original_class(value)
+        component = component_class.__new__(component_class)
+        component.__dict__.update(_state(value, items))
+        return component
+    if isinstance(value, dict):
+        return dict(zip(value, items))
+    return list(items)
+
+
+def _original_class(component: Component) -> typing.Type[Component]:
+    component_class = type(component)
+    if issubclass(component_class, _FrozenComponent):
+        return component_class.__bases__[1]
+    return component_class
+
+
+def _prop_names(component: Component) -> typing.List[str]:
+    return [name for name in component.__dict__ if name not in _COMPONENT_ATTRIBUTES]
+
+
+def _state(
+    component: Component, items: typing.List[typing.Any]
+) -> typing.Dict[str, typing.Any]:
+    state = dict(component.__dict__)
+    state.update(zip(_prop_names(component), items))
+    return state
+
+
+def _container_items(value: typing.Any) -> typing.Optional[typing.List[typing.Any]]:
+    if isinstance(value, Component):
+        return [value.__dict__[name] for name in _prop_names(value)]
+    if isinstance(value, dict):
+        return list(value.values())
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return None
+
+
+def _is_leaf(value: typing.Any) -> bool:
+    return False
+
+
+def _convert(
+    value: typing.Any,
+    convert_container: typing.Callable[
+        [typing.Any, typing.List[typing.Any]], typing.Any
+    ],
+    leaf: typing.Callable[[typing.Any], bool],
+) -> typing.Any:
+    # Post-order traversal with an explicit stack, as layouts may be deeper than
+    # the recursion limit.
+    root: typing.List[typing.Any] = []
+    stack: typing.List[typing.Tuple[typing.Any, typing.List[typing.Any], bool]] = [
+        (value, root, False)
+    ]
+    while stack:
+        current, results, expanded = stack.pop()
+        items = None if leaf(current) else _container_items(current)
+        if items is None:
+            results.append(current)
+        elif expanded:
+            children = results.pop()
+            results.append(convert_container(current, children))
+        else:
+            children: typing.List[typing.Any] = []
+            stack.append((current, results, True))
+            results.append(children)
+            stack.extend((item, children, False) for item in reversed(items))
+    return root[0]
@@ -0,0 +1,212 @@
+"""
+Render statistics of a running application.
+
+:class:`RenderStats` is a tracer, which counts the renders and errors of every
+template and keeps histograms of the phase latencies, the analyzed html nodes and
+the bytes of the ``plotly`` payloads. ``TemplateRenderer(stats=True)`` installs
+it, ``stats_route`` additionally serves the statistics as JSON::
+
+    renderer = TemplateRenderer(dash=app, stats_route=STATS_ROUTE)
+    renderer.stats.snapshot()['report.html']['phases']['render']['p95']
+
+The histograms have fixed buckets growing by a factor of ``2 ** 0.25``, so the
+reported percentiles are the upper bound of their bucket and at most 19 % too
+high. Recording takes a few microseconds, independent of the number of renders.
+Statistics cover the current and the previous window of ``window`` seconds.
+"""
+
+import bisect
+import threading
+import time
+import typing
+
+from dash_template_rendering.tracing import PHASES, RenderInfo
+
+#: Default route of the statistics endpoint.
+STATS_ROUTE = '/_dash-template-rendering/stats'
+
+PERCENTILES = (50, 95, 99)
+
+_BUCKET_FACTOR = 2**0.25
+# Seconds from 1 microsecond to about 15 minutes.
+_LATENCY_BOUNDS = tuple(1e-6 * _BUCKET_FACTOR**index for index in range(120))
+# Node counts and payload bytes up to about 10 ** 12.
+_SIZE_BOUNDS = tuple(_BUCKET_FACTOR**index for index in range(160))
+
+
+class _Histogram:
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'maximum')
+
+    def __init__(self, bounds: typing.Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: '_Histogram') -> None:
+        self.counts = [count + other for count, other in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+
+    def percentile(self, percentile: float) -> float:
+        rank = self.count * percentile / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                if index == len(self.bounds):
+                    return self.maximum
+                return min(self.bounds[index], self.maximum)
+        return 0.0
+
+    def summary(self) -> typing.Dict[str, float]:
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.maximum,
+        }
+        for percentile in PERCENTILES:
+            summary[f'p{percentile}'] = self.percentile(percentile)
+        return summary
+
+
+class _TemplateStats:
+    __slots__ = ('renders', 'errors', 'phases', 'nodes', 'embed_bytes')
+
+    def __init__(self) -> None:
+        self.renders = 0
+        self.errors = 0
+        self.phases = {phase: _Histogram(_LATENCY_BOUNDS) for phase in PHASES}
+        self.nodes = _Histogram(_SIZE_BOUNDS)
+        self.embed_bytes = _Histogram(_SIZE_BOUNDS)
+
+    def merge(self, other: '_TemplateStats') -> None:
+        self.renders += other.renders
+        self.errors += other.errors
+        for phase, histogram in other.phases.items():
+            self.phases[phase].merge(histogram)
+        self.nodes.merge(other.nodes)
+        self.embed_bytes.merge(other.embed_bytes)
+
+
+class _PhaseTimer:
+    __slots__ = ('stats', 'phase', 'info', 'start')
+
+    def __init__(self, stats: 'RenderStats', phase: str, info: RenderInfo) -> None:
+        self.stats = stats
+        self.phase = phase
+        self.info = info
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type: typing.Any, *args: typing.Any) -> None:
+        self.stats._record(
+            self.phase, self.info, time.perf_counter() - self.start, exc_type
+        )
+
+
+class RenderStats:
+    """Tracer collecting the render statistics of every template.
+
+    :param window: Seconds after which statistics are rotated out. The statistics
+        of the previous window are reported together with the current one.
+        ``None`` keeps all statistics since the start.
+    """
+
+    def __init__(self, window: typing.Optional[float] = 300) -> None:
+        self.window = window
+        self._current: typing.Dict[str, _TemplateStats] = {}
+        self._previous: typing.Dict[str, _TemplateStats] = {}
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self, phase: str, info: RenderInfo) -> _PhaseTimer:
+        return _PhaseTimer(self, phase, info)
+
+    def _record(
+        self,
+        phase: str,
+        info: RenderInfo,
+        duration: float,
+        exc_type: typing.Optional[type],
+    ) -> None:
+        name = _template_name(info.template)
+        with self._lock:
+            self._rotate()
+            stats = self._current.get(name)
+            if stats is None:
+                stats = self._current[name] = _TemplateStats()
+
+            stats.phases[phase].add(duration)
+            if phase != 'render':
+                return
+            stats.renders += 1
+            if exc_type is not None:
+                stats.errors += 1
+            if info.node_count is not None:
+                stats.nodes.add(info.node_count)
+            if info.embed_bytes is not None:
+                stats.embed_bytes.add(info.embed_bytes)
+
+    def _rotate(self) -> None:
+        if self.window is None:
+            return
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return
+        # After a quiet period both windows are outdated.
+        self._previous = self._current if elapsed < 2 * self.window else {}
+        self._current = {}
+        self._window_start = now
+
+    def snapshot(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        """Return the statistics of every template as JSON serializable dicts.
+
+        Latencies are in seconds. ``nodes`` and ``embed_bytes`` summarize the
+        analyzed html nodes and the bytes of the ``plotly`` payloads per render.
+        """
+        with self._lock:
+            self._rotate()
+            merged: typing.Dict[str, _TemplateStats] = {}
+            for windows in (self._previous, self._current):
+                for name, stats in windows.items():
+                    merged.setdefault(name, _TemplateStats()).merge(stats)
+
+        return {
+            name: {
+                'renders': stats.renders,
+                'errors': stats.errors,
+                'phases': {
+                    phase: histogram.summary()
+                    for phase, histogram in stats.phases.items()
+                    if histogram.count
+                },
+                'nodes': stats.nodes.summary(),
+                'embed_bytes': stats.embed_bytes.summary(),
+            }
+            for name, stats in sorted(merged.items())
+        }
+
+    def clear(self) -> None:
+        """Remove all statistics."""
+        with self._lock:
+            self._current = {}
+            self._previous = {}
+            self._window_start = time.monotonic()
+
+
+def _template_name(template: typing.Optional[typing.Hashable]) -> str:
+    if isinstance(template, tuple):
+        return ', '.join(map(_template_name, template))
+    return '<template>' if template is None else str(template)
@@ -0,0 +1,127 @@
+"""
+Tables built directly from pandas DataFrames.
+
+Rendering a DataFrame cell by cell in a template, like
+``{% for row in df.itertuples() %}<tr>...``, stringifies every cell in Jinja and
+analyzes the html of every cell. The ``html_table`` filter converts the columns of
+the DataFrame to text in bulk, builds the table components directly and inserts
+them by reference::
+
+    {{ df|html_table(formats={'price': ',.2f', 'share': '.1%'}, className='prices') }}
+    {{ df|html_table(datatable=True, id='prices', page_size=20) }}
+
+pandas is not a dependency of this package, it is only used through the
+DataFrame passed to the filter.
+"""
+
+import functools
+import typing
+
+from dash import dash_table, html
+from dash.development.base_component import Component
+
+_Format = typing.Union[str, typing.Callable[[typing.Any], str]]
+
+
+@functools.lru_cache(maxsize=None)
+def _component_factory(
+    component_class: typing.Type[Component],
+) -> typing.Callable[[typing.Any], Component]:
+    # Copies the attributes of an empty component instead of calling the
+    # constructor for every cell. With ``children`` as only prop, the checks of the
+    # constructor (unknown props, components in other props, ids) can not fail, so
+    # the result is the same. Factories are created on first use, so importing the
+    # module creates no components.
+    prototype = component_class().__dict__
+
+    def create(children: typing.Any) -> Component:
+        component = object.__new__(component_class)
+        component.__dict__.update(prototype)
+        component.__dict__['children'] = children
+        return component
+
+    return create
+
+
+def _to_list(values: typing.Any) -> list:
+    # pandas objects and NumPy arrays convert to Python values in bulk.
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+def _format_values(values: typing.Any, format: typing.Optional[_Format]) -> list:
+    if format is None:
+        if hasattr(values, 'astype'):
+            return values.astype(str).tolist()
+        return list(map(str, values))
+    if isinstance(format, str):
+        return [value.__format__(format) for value in _to_list(values)]
+    return list(map(format, _to_list(values)))
+
+
+def _columns(
+    frame: typing.Any, fields: typing.Optional[typing.Sequence[typing.Any]]
+) -> typing.List[typing.Any]:
+    if fields is None:
+        return list(frame.columns)
+    missing = [column for column in fields if column not in frame.columns]
+    if missing:
+        raise KeyError(f'Columns not found in the DataFrame: {missing}')
+    return list(fields)
+
+
+def html_table(
+    frame: typing.Any,
+    fields: typing.Optional[typing.Sequence[typing.Any]] = None,
+    formats: typing.Optional[typing.Dict[typing.Any, _Format]] = None,
+    header: bool = True,
+    index: bool = False,
+    datatable: bool = False,
+    **props: typing.Any,
+) -> Component:
+    """Build a table component from a DataFrame.
+
+    :param frame: A pandas DataFrame.
+    :param fields: Columns of the DataFrame to show, defaults to all columns.
+    :param formats: Format of the cells by column, either a format spec like
+        ``',.2f'`` or a callable returning the text of a value. Cells of other
+        columns are converted with ``str``.
+    :param header: Add a header row with the column names.
+    :param index: Show the index of the DataFrame as first column.
+    :param datatable: Build a ``dash_table.DataTable`` instead of an
+        ``html.Table``.
+    :param props: Additional props of the table component, like ``id`` or
+        ``className``. The ``columns`` prop of a ``DataTable`` replaces the
+        generated column definitions.
+    :return: The ``html.Table`` or ``dash_table.DataTable``.
+    """
+    formats = formats or {}
+    columns = _columns(frame, fields)
+    names = [str(column) for column in columns]
+    if datatable:
+        values = [
+            _to_list(frame[column])
+            if column not in formats
+            else _format_values(frame[column], formats[column])
+            for column in columns
+        ]
+        if index:
+            names.insert(0, str(frame.index.name or 'index'))
+            values.insert(0, _to_list(frame.index))
+        props.setdefault('columns', [{'name': name, 'id': name} for name in names])
+        return dash_table.DataTable(
+            data=[dict(zip(names, row)) for row in zip(*values)], **props
+        )
+
+    cells = [_format_values(frame[column], formats.get(column)) for column in columns]
+    if index:
+        names.insert(0, str(frame.index.name or ''))
+        cells.insert(0, _format_values(frame.index, None))
+
+    td = _component_factory(html.Td)
+    th = _component_factory(html.Th)
+    tr = _component_factory(html.Tr)
+    children = []
+    if header:
+        children.append(html.Thead(tr(list(map(th, names)))))
+    children.append(html.Tbody([tr(list(map(td, row))) for row in zip(*cells)]))
+    return html.Table(children, **props)
@@ -1,17 +1,121 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+import types
 import typing
+import warnings
 
 import dash
+import flask
+import jinja2
 import plotly
 from dash.development.base_component import Component
+from jinja2 import Template
 from markupsafe import Markup
 
+from dash_template_rendering.caching import LRUCache, fingerprint
+from dash_template_rendering.dependencies import TemplateDependencies
+from dash_template_rendering.templating import (
+    _EMBEDDED_COMPONENTS,
+    _PLOTLY_CLOSE_TAG,
+    _PLOTLY_OPEN_TAG,
+    _PLOTLY_REFERENCE_TAG,
+    EXTENSION_NAME,
+    PARSER_BACKENDS,
+    _component_tags,
+    _dash_tags_mapping,
+    _from_string,
+    _get_template,
+    _environment,
+    _json_loads,
+    _render_app,
+    _source_key,
+    _template_key,
+    _track_dependencies,
+)
+from dash_template_rendering.tracing import Tracer, combine_tracers
 
-def to_json_plotly_tag(component: Component):
+if typing.TYPE_CHECKING:
+    from dash_template_rendering.fragment_cache import FragmentStore
+    from dash_template_rendering.stats import RenderStats
+
+_ComponentLibrary = typing.Union[
+    str, types.ModuleType, typing.Iterable[typing.Type[Component]]
+]
+
+#: Component libraries available as template tags by default.
+DEFAULT_COMPONENT_LIBRARIES: typing.Dict[str, _ComponentLibrary] = {
+    'dcc': 'dash.dcc',
+    'dash-table': 'dash.dash_table',
+}
+
+
+def to_json_plotly_tag(component: Component, engine: typing.Optional[str] = None):
     return Markup(
-        f'<plotly>{plotly.io.json.to_json_plotly(component)}</plotly>',
+        f'{_PLOTLY_OPEN_TAG}{plotly.io.json.to_json_plotly(component, engine=engine)}'
+        f'{_PLOTLY_CLOSE_TAG}',
     )
 
 
+def to_plotly_reference_tag(component: Component, engine: typing.Optional[str] = None):
+    embedded = _EMBEDDED_COMPONENTS.get()
+    if embedded is None:
+        return to_json_plotly_tag(component, engine=engine)
+
+    embedded.append(component)
+    return Markup(f'{_PLOTLY_REFERENCE_TAG}{len(embedded) - 1}">{_PLOTLY_CLOSE_TAG}')
+
+
+def to_html_table_tag(
+    frame: typing.Any, engine: typing.Optional[str] = None, **options: typing.Any
+):
+    from dash_template_rendering.tables import html_table
+
+    return to_plotly_reference_tag(html_table(frame, **options), engine=engine)
+
+
+# Renderer and renders of a running warm-up, inherited by forked processes.
+_WARMUP: typing.Optional[
+    typing.Tuple['TemplateRenderer', typing.List[typing.Tuple[str, typing.Any]]]
+] = None
+
+
+def _warmup_chunk(
+    indices: typing.Iterable[int],
+) -> typing.Tuple[
+    typing.List[typing.Tuple[typing.Hashable, typing.Any]],
+    typing.List[typing.Tuple[typing.Hashable, typing.Any]],
+    typing.Dict[str, Exception],
+]:
+    renderer, items = _WARMUP
+    errors = renderer._warmup(items[index] for index in indices)
+    return (
+        [
+            (key, renderer._skeleton_cache.get(key))
+            for key in renderer._skeleton_cache.keys()
+        ],
+        [
+            (key, renderer._result_cache.get(key))
+            for key in renderer._result_cache.keys()
+        ],
+        {name: _picklable_error(error) for name, error in errors.items()},
+    )
+
+
+def _picklable_error(error: Exception) -> Exception:
+    # Errors are sent back to the parent process, exceptions with custom
+    # constructors often fail to unpickle.
+    import pickle
+
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return RuntimeError(f'{type(error).__name__}: {error}')
+    return error
+
+
 class TemplateRenderer:
     """Extension class for rendering html content with jinja2 templates.
 
@@ -34,11 +138,142 @@ class TemplateRenderer:
             app = Dash(__name__)
             template_renderer.init_dash(dash=app)
 
+    The static html structure of rendered templates is analyzed once and kept in a
+    skeleton cache. Later renders of the same structure only fill in the embedded
+    ``plotly`` components.
+
     :param dash: Call :meth:`init_dash` on this Dash application now.
+    :param skeleton_cache_size: Maximal number of analyzed template skeletons kept
+        in memory. ``0`` disables the cache.
+    :param embed_by_reference: Let the ``plotly`` filter insert the given component
+        object itself instead of a JSON serialized copy. This avoids serializing
+        and rebuilding large components like ``dcc.Graph``, but the rendered
+        layout shares the embedded objects with the template context.
+    :param parser: Name of the html parser backend used to analyze rendered
+        templates. ``'bs4'`` builds a BeautifulSoup document, ``'html.parser'``
+        creates the Dash components directly from the events of the standard
+        library parser.
+    :param tracer: Context manager factory wrapping every phase of a render, see
+        :mod:`dash_template_rendering.tracing`.
+    :param result_cache_size: Maximal number of rendered layouts kept in memory.
+        Renders of the same template with a context of equal content return a
+        deep copy of the cached layout. ``0`` disables the cache. Templates,
+        which depend on request or session state, should opt out with
+        ``use_cache=False``.
+    :param result_cache_ttl: Seconds after which a cached layout expires.
+    :param expression_slots: Replace the output of Jinja expressions like
+        ``{{ title }}`` by placeholders before the rendered html is analyzed. Renders
+        of a template, which only differ in expression values, then share one
+        template skeleton and only the values are filled in. Templates, which
+        render expressions into tag names or unquoted attribute values, fall back
+        to a complete analysis. Filter blocks like ``{% filter upper %}`` and block
+        assignments see the placeholders instead of the values.
+    :param artifact: Path of a template artifact created with
+        ``python -m dash_template_rendering compile``. Its bytecode and template
+        skeletons are loaded by :meth:`init_dash`, see
+        :mod:`dash_template_rendering.artifact`.
+    :param components: Additional component libraries by tag prefix, see
+        :meth:`register_components`. The components of ``dash.dcc`` and
+        ``dash.dash_table`` are available with the prefixes ``dcc`` and
+        ``dash-table``.
+    :param template_check_interval: Check the template files, which cached layouts
+        and skeletons depend on, for changes at most every given seconds while
+        rendering, see :meth:`check_templates`. ``None`` disables the checks.
+    :param cache_dir: Directory of a persistent cache for the Jinja2 bytecode and
+        the template skeletons, which is shared by all processes using it, see
+        :mod:`dash_template_rendering.cache_dir`.
+    :param minimize: Reduce the JSON Dash sends for rendered layouts by merging
+        adjacent text children, unwrapping single children and dropping empty
+        props, see :func:`~dash_template_rendering.minimizing.minimize_layout`.
+    :param share_static: Build the subtrees of a template without dynamic content
+        once and return the same immutable components from every render, see
+        :mod:`dash_template_rendering.sharing`.
+    :param fragment_store: Storage of the blocks cached with the ``dashcache`` tag,
+        see :mod:`dash_template_rendering.fragment_cache`. Defaults to a
+        :class:`~dash_template_rendering.fragment_cache.MemoryFragmentStore`.
+    :param stats: Collect render counts, errors, phase latencies and sizes of every
+        template in :attr:`stats`, see :mod:`dash_template_rendering.stats`.
+    :param stats_route: Serve the collected statistics as JSON under this route of
+        the Flask server, e.g.
+        :data:`~dash_template_rendering.stats.STATS_ROUTE`. Implies ``stats``. The
+        route is not protected, only enable it where it is not public.
+    :param json_engine: Engine serializing the components embedded with the
+        ``plotly`` filter and decoding them again, ``'json'`` or ``'orjson'``.
+        ``None`` uses orjson, if it is installed. NumPy arrays are encoded as
+        plotly typed arrays (``bdata``) by both engines and passed on to Dash
+        without being expanded.
     """
 
-    def __init__(self, dash: typing.Optional[dash.Dash] = None) -> None:
+    def __init__(
+        self,
+        dash: typing.Optional[dash.Dash] = None,
+        skeleton_cache_size: int = 128,
+        embed_by_reference: bool = False,
+        parser: str = 'bs4',
+        tracer: typing.Optional[Tracer] = None,
+        result_cache_size: int = 0,
+        result_cache_ttl: typing.Optional[float] = None,
+        expression_slots: bool = False,
+        artifact: typing.Union[str, os.PathLike, None] = None,
+        components: typing.Optional[typing.Dict[str, _ComponentLibrary]] = None,
+        template_check_interval: typing.Optional[float] = None,
+        cache_dir: typing.Union[str, os.PathLike, None] = None,
+        minimize: bool = False,
+        share_static: bool = False,
+        fragment_store: typing.Optional['FragmentStore'] = None,
+        stats: bool = False,
+        stats_route: typing.Optional[str] = None,
+        json_engine: typing.Optional[str] = None,
+    ) -> None:
+        if parser not in PARSER_BACKENDS:
+            raise ValueError(
+                f'Unknown parser backend "{parser}". '
+                f'Available backends: {", ".join(PARSER_BACKENDS)}.'
+            )
+
         self._dash = None
+        self.parser = parser
+        self._json_loads = _json_loads(json_engine)
+        self.json_engine = json_engine
+        self._skeleton_cache = LRUCache(maxsize=skeleton_cache_size)
+        self._result_cache = LRUCache(maxsize=result_cache_size, ttl=result_cache_ttl)
+        self._jinja_envs: typing.Dict[typing.Tuple[bool, bool], jinja2.Environment] = {}
+        self._plain_templates = LRUCache(maxsize=128)
+        self.embed_by_reference = embed_by_reference
+        self.expression_slots = expression_slots
+        self.artifact = artifact
+        self.cache_dir = cache_dir
+        self.minimize = minimize
+        self.share_static = share_static
+        if fragment_store is None:
+            # The fragment cache loads jinja2.ext, it is imported with the first
+            # renderer instead of the package.
+            from dash_template_rendering.fragment_cache import MemoryFragmentStore
+
+            fragment_store = MemoryFragmentStore()
+        self.fragment_store = fragment_store
+        self._skeleton_store = None
+        self.tracer: typing.Optional[Tracer] = None
+        self._tracers: typing.List[Tracer] = []
+        self._component_libraries = dict(DEFAULT_COMPONENT_LIBRARIES)
+        self._component_libraries.update(components or {})
+        self._tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None
+        self._dependencies = TemplateDependencies()
+        self.template_check_interval = template_check_interval
+        self._last_template_check = time.monotonic()
+        self._watcher: typing.Optional[threading.Thread] = None
+        self._stop_watcher = threading.Event()
+
+        self.stats_route = stats_route
+        self.stats: typing.Optional['RenderStats'] = None
+        if stats or stats_route is not None:
+            from dash_template_rendering.stats import RenderStats
+
+            self.stats = RenderStats()
+            self.add_tracer(self.stats)
+
+        if tracer is not None:
+            self.add_tracer(tracer)
 
         if dash is not None:
             self.init_dash(dash=dash)
@@ -50,4 +285,427 @@ class TemplateRenderer:
         :param dash: The Dash application to initialize.
         """
         self._dash = dash
-        dash.server.jinja_env.filters['plotly'] = to_json_plotly_tag
+        self._jinja_envs = {}
+        dash.server.extensions[EXTENSION_NAME] = self
+        dash.server.jinja_env.filters['plotly'] = functools.partial(
+            to_plotly_reference_tag if self.embed_by_reference else to_json_plotly_tag,
+            engine=self.json_engine,
+        )
+        dash.server.jinja_env.filters['html_table'] = functools.partial(
+            to_html_table_tag, engine=self.json_engine
+        )
+        from dash_template_rendering.fragment_cache import DashCacheExtension
+
+        dash.server.jinja_env.add_extension(DashCacheExtension)
+        extension = dash.server.jinja_env.extensions[DashCacheExtension.identifier]
+        extension.store = self.fragment_store
+        extension.renderer = self
+
+        if self.stats_route is not None:
+            endpoint = f'{EXTENSION_NAME}_stats'
+            if endpoint in dash.server.view_functions:
+                dash.server.view_functions[endpoint] = self._stats_view
+            else:
+                dash.server.add_url_rule(
+                    self.stats_route, endpoint=endpoint, view_func=self._stats_view
+                )
+
+        if self.artifact is not None:
+            from dash_template_rendering.artifact import install_artifact, load_artifact
+
+            artifact = load_artifact(self.artifact)
+            if artifact is not None:
+                install_artifact(self, artifact)
+
+        if self.cache_dir is not None:
+            from dash_template_rendering.cache_dir import install_cache_dir
+
+            install_cache_dir(self, self.cache_dir)
+
+    def _stats_view(self) -> flask.Response:
+        return flask.jsonify(self.stats.snapshot())
+
+    def render(
+        self,
+        template_name_or_list: typing.Union[
+            str, Template, typing.List[typing.Union[str, Template]]
+        ],
+        *,
+        use_cache: bool = True,
+        output: str = 'component',
+        **context: typing.Any,
+    ) -> typing.Any:
+        """Render a template by name with the Dash application of this extension.
+
+        Unlike :func:`~dash_template_rendering.render_dash_template`, the
+        application is not looked up globally, so templates can be rendered
+        outside of Dash requests and callbacks, e.g. in background jobs and worker
+        threads. An active application context is reused. The method can be
+        called from multiple threads.
+
+        :param template_name_or_list: The name of the template to render. If
+            a list is given, the first name to exist will be rendered.
+        :param use_cache: Use the result cache, if enabled.
+        :param output: ``'component'`` to build Dash components, ``'json'`` to
+            build the ``{'props', 'type', 'namespace'}`` dicts Dash serializes
+            components to, for callback outputs and children of components.
+        :param context: The variables to make available in the template.
+        :return: The render html content expressed as Dash ``Component`` or its
+            JSON dict.
+        """
+        return _render_app(
+            self._server(),
+            self,
+            _get_template,
+            template_name_or_list,
+            template_key=_template_key(template_name_or_list),
+            context=context,
+            use_cache=use_cache,
+            output=output,
+        )
+
+    def render_string(
+        self,
+        source: str,
+        *,
+        use_cache: bool = True,
+        output: str = 'component',
+        **context: typing.Any,
+    ) -> typing.Any:
+        """Render a template from the given source string with the Dash application
+        of this extension, see :meth:`render`.
+
+        :param source: The source code of the template to render.
+        :param use_cache: Use the result cache, if enabled.
+        :param output: ``'component'`` to build Dash components, ``'json'`` to
+            build the ``{'props', 'type', 'namespace'}`` dicts Dash serializes
+            components to, for callback outputs and children of components.
+        :param context: The variables to make available in the template.
+        :return: The render html content expressed as Dash ``Component`` or its
+            JSON dict.
+        """
+        return _render_app(
+            self._server(),
+            self,
+            _from_string,
+            source,
+            template_key=_source_key(source),
+            context=context,
+            use_cache=use_cache,
+            output=output,
+        )
+
+    def warmup(
+        self,
+        templates: typing.Dict[str, typing.List[typing.Dict[str, typing.Any]]],
+        processes: typing.Optional[int] = None,
+        freeze: bool = False,
+        errors: typing.Optional[typing.Dict[str, Exception]] = None,
+    ) -> None:
+        """Render templates at startup, so their skeletons and, if the result cache
+        is enabled, their layouts are cached before the first request.
+
+        Call it in the master process of a pre-forking server, e.g. with
+        ``preload_app`` of gunicorn, to share the caches with all workers through
+        copy-on-write memory::
+
+            template_renderer.warmup(
+                {'index.html': [{}], 'report.html': [{'year': 2024}, {'year': 2025}]},
+                processes=4,
+                freeze=True,
+            )
+
+        Renders, which depend on a request, fail and are reported in ``errors``.
+
+        :param templates: Contexts by template name. Every template is rendered
+            once for each of its contexts.
+        :param processes: Spread the renders across this many forked processes,
+            whose caches are merged into this process. Only supported where
+            processes can be forked, otherwise the templates are rendered one after
+            another. No other threads should run while forking.
+        :param freeze: Move all objects to the permanent generation of the garbage
+            collector afterwards with ``gc.freeze()``. Collections in forked workers
+            then do not touch, and thereby copy, the memory of the cached objects.
+        :param errors: Collects the errors of failed renders by template name.
+        """
+        # Imported here, as they are only needed at startup.
+        import gc
+        import multiprocessing
+
+        server = self._server()
+        items = [
+            (name, context)
+            for name, contexts in templates.items()
+            for context in contexts
+        ]
+        errors = {} if errors is None else errors
+
+        if processes is not None and processes > 1:
+            if 'fork' in multiprocessing.get_all_start_methods():
+                self._warmup_forked(server, templates, items, processes, errors)
+                items = []
+            else:
+                warnings.warn(
+                    'Processes can not be forked on this platform, the templates '
+                    'are rendered one after another.'
+                )
+        errors.update(self._warmup(items))
+
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+    def _warmup(
+        self, items: typing.Iterable[typing.Tuple[str, typing.Dict[str, typing.Any]]]
+    ) -> typing.Dict[str, Exception]:
+        errors = {}
+        for name, context in items:
+            try:
+                self.render(name, **context)
+            except Exception as e:
+                errors[name] = e
+        return errors
+
+    def _warmup_forked(
+        self,
+        server: flask.Flask,
+        templates: typing.Iterable[str],
+        items: typing.List[typing.Tuple[str, typing.Dict[str, typing.Any]]],
+        processes: int,
+        errors: typing.Dict[str, Exception],
+    ) -> None:
+        import concurrent.futures
+        import multiprocessing
+
+        global _WARMUP
+
+        _WARMUP = (self, items)
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context('fork')
+            ) as executor:
+                chunks = [
+                    range(start, len(items), processes) for start in range(processes)
+                ]
+                for skeletons, results, chunk_errors in executor.map(
+                    _warmup_chunk, chunks
+                ):
+                    for cache, entries in (
+                        (self._skeleton_cache, skeletons),
+                        (self._result_cache, results),
+                    ):
+                        for key, value in entries:
+                            if value is not None:
+                                cache.set(key, value)
+                    errors.update(chunk_errors)
+        finally:
+            _WARMUP = None
+
+        # Compiled templates can not be transferred between processes.
+        environments = [server.jinja_env]
+        if self.expression_slots:
+            environments.append(_environment(server, self, expression_slots=True))
+        for name in templates:
+            try:
+                for environment in environments:
+                    environment.get_template(name)
+            except Exception as e:
+                errors.setdefault(name, e)
+                continue
+            _track_dependencies(server, self, _get_template, name, _template_key(name))
+
+    def _server(self) -> flask.Flask:
+        if self._dash is None:
+            raise RuntimeError(
+                'The TemplateRenderer is not initialized, call init_dash first.'
+            )
+        return self._dash.server
+
+    def register_components(self, prefix: str, components: _ComponentLibrary) -> None:
+        """Make the components of a library available as template tags.
+
+        A component is available by its lower case class name and its kebab case
+        class name after the prefix, e.g. ``dcc.DatePickerRange`` as
+        ``<dcc-datepickerrange>`` and ``<dcc-date-picker-range>``::
+
+            template_renderer.register_components('dbc', dash_bootstrap_components)
+
+        Unlike the attributes of html tags, attribute values are converted to
+        numbers, booleans or JSON data according to the prop types of the
+        component, e.g. ``<dcc-slider min="0" max="10" included="false">``. Props
+        accepting strings receive the attribute value unchanged.
+
+        :param prefix: The tag name prefix of the library.
+        :param components: The module of the library, its import name or an
+            iterable of component classes.
+        """
+        self._component_libraries[prefix.lower()] = components
+        self._tags = None
+        self._skeleton_cache.clear()
+        self._result_cache.clear()
+
+    def _tag_mapping(self) -> typing.Dict[str, typing.Type[Component]]:
+        tags = self._tags
+        if tags is None:
+            tags = dict(_dash_tags_mapping())
+            for prefix, components in self._component_libraries.items():
+                tags.update(_component_tags(prefix, components))
+            self._tags = tags
+        return tags
+
+    def add_tracer(self, tracer: Tracer) -> None:
+        """Wrap the phases of every following render with the given tracer.
+
+        :param tracer: Context manager factory getting the phase and the
+            :class:`~dash_template_rendering.tracing.RenderInfo` of the render.
+        """
+        self._tracers.append(tracer)
+        self._update_tracer()
+
+    def remove_tracer(self, tracer: Tracer) -> None:
+        """Stop tracing renders with the given tracer.
+
+        :param tracer: A tracer added before.
+        """
+        self._tracers.remove(tracer)
+        self._update_tracer()
+
+    def _update_tracer(self) -> None:
+        if len(self._tracers) == 0:
+            self.tracer = None
+        elif len(self._tracers) == 1:
+            self.tracer = self._tracers[0]
+        else:
+            self.tracer = combine_tracers(*self._tracers)
+
+    def invalidate(
+        self,
+        template_name_or_list: typing.Union[
+            str, Template, typing.List[typing.Union[str, Template]], None
+        ] = None,
+        source: typing.Optional[str] = None,
+    ) -> None:
+        """Remove cached layouts of a template from the result cache.
+
+        Without arguments all cached layouts are removed.
+
+        :param template_name_or_list: The template as passed to
+            :func:`~dash_template_rendering.render_dash_template`.
+        :param source: The source as passed to
+            :func:`~dash_template_rendering.render_dash_template_string`.
+        """
+        if template_name_or_list is None and source is None:
+            self._result_cache.clear()
+            return
+
+        template_keys = set()
+        if template_name_or_list is not None:
+            template_key = _template_key(template_name_or_list)
+            template_keys.add(template_key)
+            # Templates extending or including the template.
+            names = template_key if isinstance(template_key, tuple) else (template_key,)
+            template_keys.update(self._dependencies.dependents(names))
+        if source is not None:
+            template_keys.add(_source_key(source))
+
+        for key in self._result_cache.keys():
+            if key[0] in template_keys:
+                self._result_cache.pop(key)
+
+    def check_templates(self) -> typing.Set[str]:
+        """Invalidate the cached layouts, template skeletons and expression slot
+        checks of templates, whose template file or one of its dependencies was
+        modified, created or deleted. The dependencies are recorded by every render,
+        with or without the result cache.
+
+        Dependencies are the templates referenced with ``{% extends %}``,
+        ``{% include %}``, ``{% import %}`` and ``{% from %}``. The changed templates
+        are removed from the Jinja2 template caches as well, so they are reloaded
+        even if ``auto_reload`` is disabled. Entries of other templates are kept.
+
+        :return: The names of the changed templates.
+        """
+        changed = self._dependencies.changed()
+        if not changed:
+            return changed
+
+        template_keys = self._dependencies.discard(changed)
+        for cache in (self._result_cache, self._skeleton_cache):
+            for key in cache.keys():
+                if key[0] in template_keys:
+                    cache.pop(key)
+        for template_key in template_keys:
+            self._plain_templates.pop(template_key)
+
+        if self._dash is not None:
+            environments = [self._dash.server.jinja_env, *self._jinja_envs.values()]
+            for environment in environments:
+                if environment.cache is None:
+                    continue
+                for key in list(environment.cache.keys()):
+                    if key[1] in changed:
+                        with contextlib.suppress(KeyError):
+                            del environment.cache[key]
+        return changed
+
+    def start_watcher(self, interval: float = 1.0) -> None:
+        """Call :meth:`check_templates` periodically in a daemon thread.
+
+        :param interval: Seconds between two checks.
+        """
+        if self._watcher is not None:
+            return
+
+        self._stop_watcher.clear()
+        self._watcher = threading.Thread(
+            target=self._watch,
+            args=(interval,),
+            name='dash-template-rendering-watcher',
+            daemon=True,
+        )
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        """Stop the thread started by :meth:`start_watcher`."""
+        if self._watcher is None:
+            return
+
+        self._stop_watcher.set()
+        self._watcher.join()
+        self._watcher = None
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop_watcher.wait(interval):
+            self.check_templates()
+
+    def _check_templates_if_due(self) -> None:
+        if self.template_check_interval is None:
+            return
+
+        now = time.monotonic()
+        if now - self._last_template_check >= self.template_check_interval:
+            self._last_template_check = now
+            self.check_templates()
+
+    def clear_cache(self) -> None:
+        """Remove all cached template skeletons, rendered layouts and ``dashcache``
+        blocks."""
+        self._skeleton_cache.clear()
+        self._result_cache.clear()
+        self._plain_templates.clear()
+        self._dependencies.clear()
+        self.fragment_store.clear()
+
+    def _result_cache_key(
+        self,
+        template_key: typing.Optional[typing.Hashable],
+        context: typing.Dict[str, typing.Any],
+        output: str = 'component',
+    ) -> typing.Optional[typing.Hashable]:
+        if self._result_cache.maxsize <= 0 or template_key is None:
+            return None
+
+        try:
+            return template_key, fingerprint(context), output
+        except TypeError:
+            return None
@@ -1,24 +1,43 @@
+import asyncio
+import contextlib
+import contextvars
+import copy
+import functools
+import hashlib
+import html.parser
 import importlib
 import inspect
 import json
 import re
 import textwrap
+import types
 import typing
 import warnings
 
-import bs4
-import bs4.element
 import dash
+import flask
+import jinja2
+import jinja2.meta
 from dash.development.base_component import Component
-from flask import render_template, render_template_string
 from jinja2 import Template
+from markupsafe import Markup
 
-DASH_TAGS_MAPPING = dict(
-    map(
-        lambda x: (x[0].lower(), x[1]),
-        inspect.getmembers(dash.html, inspect.isclass),
-    )
+from dash_template_rendering.caching import LRUCache
+from dash_template_rendering.minimizing import (
+    DROP_EMPTY_PROPS,
+    _is_empty,
+    _merges_children,
+    _minimize_children,
 )
+from dash_template_rendering.patching import make_patch
+from dash_template_rendering.sharing import freeze
+from dash_template_rendering.tracing import RenderInfo
+
+if typing.TYPE_CHECKING:
+    import bs4
+
+# Built on first use, see ``_dash_tags_mapping``.
+_DASH_TAGS_MAPPING: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None
 
 NAMESPACE_MAPPING = {
     'dash_html_components': 'dash.html',
@@ -26,29 +45,625 @@ NAMESPACE_MAPPING = {
     'dash_table': 'dash.dash_table',
 }
 
+EXTENSION_NAME = 'dash_template_rendering'
+
+# Compiled string templates by environment and source.
+_STRING_TEMPLATES = LRUCache(maxsize=128)
+
+#: Engines encoding and decoding the ``plotly`` payloads, ``None`` selects orjson,
+#: if it is installed.
+JSON_ENGINES = ('json', 'orjson')
+
+# Tags written by the ``plotly`` filter start with a private use character, so
+# ``<plotly>`` in comments, attribute values or text of a template is left alone.
+_PLOTLY_MARKER = '\ue002'
+_PLOTLY_TAG = f'{_PLOTLY_MARKER}<plotly'
+_PLOTLY_OPEN_TAG = f'{_PLOTLY_MARKER}<plotly>'
+_PLOTLY_REFERENCE_TAG = f'{_PLOTLY_MARKER}<plotly ref="'
+_PLOTLY_CLOSE_TAG = '</plotly>'
+
+_EMBEDDED_COMPONENTS: contextvars.ContextVar[
+    typing.Optional[typing.List[Component]]
+] = contextvars.ContextVar('embedded_components', default=None)
+
+# Rendered values of Jinja expressions are replaced by numbered placeholders, if
+# expression slots are enabled. The placeholders use private use characters, which
+# are not expected in the html of a template.
+_EXPRESSION_START = '\ue000'
+_EXPRESSION_END = '\ue001'
+_EXPRESSION_PATTERN = re.compile(f'{_EXPRESSION_START}(\\d+){_EXPRESSION_END}')
+# Placeholders in tag names or unquoted attribute values change the structure of
+# the html depending on the value.
+_UNSUPPORTED_EXPRESSION_PATTERN = re.compile(
+    f'</?{_EXPRESSION_START}|=[ \\t\\n\\r\\f]*{_EXPRESSION_START}'
+)
+
+
+class _ExpressionValues(list):
+    """Rendered values of the expression slots of a render. ``inlined`` is set,
+    if html was rendered into the skeleton, which then depends on the values."""
+
+    inlined = False
+
+
+_EXPRESSION_VALUES: contextvars.ContextVar[typing.Optional[_ExpressionValues]] = (
+    contextvars.ContextVar('expression_values', default=None)
+)
+# Macros, call blocks, block assignments and filter blocks capture rendered html,
+# which contains the placeholders instead of the values. Templates using them are
+# rendered without expression slots.
+_CAPTURING_NODES = (
+    jinja2.nodes.Macro,
+    jinja2.nodes.CallBlock,
+    jinja2.nodes.AssignBlock,
+    jinja2.nodes.FilterBlock,
+)
+
+
+class _Element(typing.NamedTuple):
+    """Analyzed html tag of a template skeleton."""
+
+    tag: str
+    component_class: typing.Type[Component]
+    props: typing.Tuple[typing.Tuple[str, typing.Any], ...]
+    children: typing.Tuple['_Node', ...]
+    dynamic: bool = False
+    minimized: bool = False
+
+
+class _Slot(typing.NamedTuple):
+    """Position of an embedded ``plotly`` payload in a template skeleton."""
+
+    index: int
+
+
+class _Payload(typing.NamedTuple):
+    """``plotly`` tag written in the html of a template."""
+
+    json: str
+
+
+_Parts = typing.Tuple[typing.Union[str, int], ...]
+
+
+class _Text(typing.NamedTuple):
+    """Text of a template skeleton containing rendered Jinja expressions."""
+
+    parts: _Parts
+
+
+class _Value(typing.NamedTuple):
+    """Attribute value of a template skeleton containing rendered Jinja
+    expressions."""
+
+    parts: _Parts
+    multi_valued: bool
+    coerce: typing.Optional[typing.Callable[[str], typing.Any]] = None
+
+
+class _Shared:
+    """Static subtree of a template skeleton, which is built once per output on
+    first use and shared by all renders."""
+
+    __slots__ = ('node', '_component', '_json')
+
+    def __init__(self, node: _Element) -> None:
+        self.node = node
+        self._component: typing.Optional[Component] = None
+        self._json: typing.Optional[typing.Dict[str, typing.Any]] = None
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        # Stored skeletons build their shared subtrees again on first use.
+        return _Shared, (self.node,)
+
+    # Concurrent first renders may both build a subtree, one of the equal results
+    # is kept.
+    @property
+    def component(self) -> Component:
+        component = self._component
+        if component is None:
+            component = self._component = freeze(_build_node(self.node, payloads=()))
+        return component
+
+    @property
+    def json(self) -> typing.Dict[str, typing.Any]:
+        data = self._json
+        if data is None:
+            data = self._json = freeze(_build_json_node(self.node, payloads=()))
+        return data
+
+
+_Node = typing.Union[_Element, _Slot, _Payload, _Text, _Shared, str]
+
+
+class _UnsupportedExpressionSlot(ValueError):
+    """A Jinja expression was rendered at a position, which can not be filled in
+    after analyzing the template skeleton."""
+
+
+class _Skeleton(typing.NamedTuple):
+    """Analyzed top level nodes of a rendered template."""
+
+    nodes: typing.Tuple[_Node, ...]
+    node_count: int
+
+
+class _ComponentMetadata(typing.NamedTuple):
+    """Attribute mapping rules of a component class."""
+
+    property_names: typing.Dict[str, str]
+    class_property: typing.Optional[str]
+    html_for: bool
+    style: bool
+    available_properties: typing.FrozenSet[str]
+    wildcard_attributes: typing.Tuple[str, ...]
+    coercions: typing.Dict[str, typing.Callable[[str], typing.Any]]
+
+
+_COMPONENT_METADATA: typing.Dict[typing.Type[Component], _ComponentMetadata] = {}
+_COMPONENT_CLASSES: typing.Dict[
+    typing.Tuple[str, str], typing.Tuple[typing.Type[Component], typing.Tuple[str, ...]]
+] = {}
+
+_STYLE_NAME_PATTERN = re.compile(r'\-(\w)')
+_NODE_PATH_PATTERN = re.compile(r'[\[\.{]')
+_TAG_NAME_PATTERN = re.compile(r'(?<!^)(?=[A-Z])')
+_NUMBER_TYPES = frozenset({
+    int,
+    float,
+    typing.SupportsFloat,
+    typing.SupportsInt,
+    typing.SupportsComplex,
+})
+
+# Tag and attribute rules of the ``bs4`` html tree builder, which are replicated
+# by the event driven parser backend.
+_VOID_ELEMENTS = frozenset({
+    'area',
+    'base',
+    'basefont',
+    'bgsound',
+    'br',
+    'col',
+    'command',
+    'embed',
+    'frame',
+    'hr',
+    'image',
+    'img',
+    'input',
+    'isindex',
+    'keygen',
+    'link',
+    'menuitem',
+    'meta',
+    'nextid',
+    'param',
+    'source',
+    'spacer',
+    'track',
+    'wbr',
+})
+_STRING_CONTAINER_TAGS = frozenset({'rt', 'script', 'style', 'template'})
+_MULTI_VALUED_ATTRIBUTES = {
+    '*': frozenset({'accesskey', 'class', 'dropzone'}),
+    'a': frozenset({'rel', 'rev'}),
+    'area': frozenset({'rel'}),
+    'form': frozenset({'accept-charset'}),
+    'icon': frozenset({'sizes'}),
+    'iframe': frozenset({'sandbox'}),
+    'link': frozenset({'rel', 'rev'}),
+    'object': frozenset({'archive'}),
+    'output': frozenset({'for'}),
+    'td': frozenset({'headers'}),
+    'th': frozenset({'headers'}),
+}
+
+
+def _dash_tags_mapping() -> typing.Dict[str, typing.Type[Component]]:
+    global _DASH_TAGS_MAPPING
+    if _DASH_TAGS_MAPPING is None:
+        _DASH_TAGS_MAPPING = {
+            name.lower(): getattr(dash.html, name) for name in dash.html.__all__
+        }
+    return _DASH_TAGS_MAPPING
+
+
+def _component_tags(
+    prefix: str,
+    components: typing.Union[
+        str, types.ModuleType, typing.Iterable[typing.Type[Component]]
+    ],
+) -> typing.Dict[str, typing.Type[Component]]:
+    if isinstance(components, str):
+        components = importlib.import_module(components)
+    if isinstance(components, types.ModuleType):
+        names = getattr(components, '__all__', None) or dir(components)
+        components = [getattr(components, name) for name in names]
+
+    tags = {}
+    for component_class in components:
+        if not (
+            isinstance(component_class, type) and issubclass(component_class, Component)
+        ):
+            continue
+        name = component_class.__name__
+        tags[f'{prefix}-{name.lower()}'] = component_class
+        tags[f'{prefix}-{_TAG_NAME_PATTERN.sub("-", name).lower()}'] = component_class
+    return tags
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name == 'DASH_TAGS_MAPPING':
+        return _dash_tags_mapping()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _template_key(
+    template_name_or_list: typing.Union[
+        str, Template, typing.List[typing.Union[str, Template]], None
+    ],
+) -> typing.Optional[typing.Hashable]:
+    if isinstance(template_name_or_list, (list, tuple)):
+        return tuple(map(_template_key, template_name_or_list))
+    if isinstance(template_name_or_list, Template):
+        return template_name_or_list.name
+    return template_name_or_list
+
+
+def _json_loads(engine: typing.Optional[str]) -> typing.Callable[[str], typing.Any]:
+    if engine not in (None, *JSON_ENGINES):
+        raise ValueError(
+            f'Unknown JSON engine "{engine}". '
+            f'Available engines: {", ".join(JSON_ENGINES)}.'
+        )
+    if engine == 'json':
+        return json.loads
+
+    try:
+        import orjson
+    except ImportError:
+        if engine == 'orjson':
+            raise ValueError('The JSON engine "orjson" requires the orjson package.')
+        return json.loads
+
+    def loads(payload: str) -> typing.Any:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Payloads written by hand may contain NaN or Infinity, which only
+            # the json module accepts.
+            return json.loads(payload)
+
+    return loads
+
+
+@contextlib.contextmanager
+def _embedded_components_scope() -> typing.Iterator[typing.List[Component]]:
+    embedded: typing.List[Component] = []
+    token = _EMBEDDED_COMPONENTS.set(embedded)
+    try:
+        yield embedded
+    finally:
+        _EMBEDDED_COMPONENTS.reset(token)
+
+
+@contextlib.contextmanager
+def _expression_values_scope(
+    expression_slots: bool,
+) -> typing.Iterator[typing.Optional[_ExpressionValues]]:
+    if not expression_slots:
+        yield None
+        return
+
+    values = _ExpressionValues()
+    token = _EXPRESSION_VALUES.set(values)
+    try:
+        yield values
+    finally:
+        _EXPRESSION_VALUES.reset(token)
+
+
+@jinja2.pass_eval_context
+def _finalize_expression(eval_ctx: jinja2.nodes.EvalContext, value: typing.Any):
+    values = _EXPRESSION_VALUES.get()
+    if values is None:
+        return value
+    # Without autoescaping the value is html, just like markup such as the output
+    # of the ``plotly`` filter. Html has to be analyzed with the skeleton, only
+    # the tags of the ``plotly`` filter are cut out of it.
+    if not eval_ctx.autoescape or hasattr(value, '__html__'):
+        if not (isinstance(value, str) and value.startswith(_PLOTLY_TAG)):
+            values.inlined = True
+        return value
+
+    values.append(str(value))
+    return Markup(f'{_EXPRESSION_START}{len(values) - 1}{_EXPRESSION_END}')
+
+
+def _persistent(values: typing.Optional[typing.Sequence[str]]) -> bool:
+    # Skeletons of renders, whose values were all filled into slots, only depend
+    # on the structure of the template. Templates loaded without slots, like
+    # ``Template`` objects, render no values at all.
+    return bool(values) and not getattr(values, 'inlined', False)
+
+
+def _check_values(values: typing.Optional[typing.Sequence[str]]) -> None:
+    # Placeholders in a value come from html captured by the template, like the
+    # output of a block passed through a filter, and are never filled in.
+    if values and any(_EXPRESSION_START in value for value in values):
+        raise _UnsupportedExpressionSlot()
+
+
+def _split_expressions(text: str) -> _Parts:
+    parts = _EXPRESSION_PATTERN.split(text)
+    return tuple(
+        int(part) if position % 2 else part
+        for position, part in enumerate(parts)
+        if part
+    )
+
+
+def _join_expressions(parts: _Parts, values: typing.Sequence[str]) -> str:
+    return ''.join(part if isinstance(part, str) else values[part] for part in parts)
+
+
+def _text_node(text: str) -> typing.Union[_Text, str]:
+    if _EXPRESSION_START in text:
+        return _Text(parts=_split_expressions(text))
+    return text
+
+
+def _extract_plotly_payloads(
+    template_string: str,
+    embedded: typing.Optional[typing.Sequence[Component]] = None,
+    values: typing.Optional[typing.Sequence[str]] = None,
+) -> typing.Tuple[str, typing.List[typing.Union[str, Component]]]:
+    """Replace every ``<plotly>`` tag written by the filter with a numbered slot.
+
+    The payloads are the only part of a rendered template, which usually changes
+    between renders. Cutting them out leaves the static skeleton html, which can be
+    analyzed once and reused. Tags referencing an ``embedded`` component are
+    resolved to the component itself.
+    """
+    parts = []
+    payloads: typing.List[typing.Union[str, Component]] = []
+    position = 0
+    while True:
+        start = template_string.find(_PLOTLY_TAG, position)
+        if start == -1:
+            break
+
+        if template_string.startswith(_PLOTLY_OPEN_TAG, start):
+            payload_start = start + len(_PLOTLY_OPEN_TAG)
+            end = template_string.find(_PLOTLY_CLOSE_TAG, payload_start)
+            if end == -1:
+                break
+            payload = template_string[payload_start:end]
+            if values is not None and _EXPRESSION_START in payload:
+                raise _UnsupportedExpressionSlot()
+        elif embedded is not None and template_string.startswith(
+            _PLOTLY_REFERENCE_TAG, start
+        ):
+            reference_start = start + len(_PLOTLY_REFERENCE_TAG)
+            reference_end = template_string.find('"', reference_start)
+            end = template_string.find(_PLOTLY_CLOSE_TAG, reference_end)
+            if reference_end == -1 or end == -1:
+                break
+            payload = embedded[int(template_string[reference_start:reference_end])]
+        else:
+            position = start + len(_PLOTLY_TAG)
+            continue
+
+        parts.append(template_string[position:start])
+        parts.append(f'<plotly slot="{len(payloads)}"></plotly>')
+        payloads.append(payload)
+        position = end + len(_PLOTLY_CLOSE_TAG)
+
+    if not payloads:
+        return template_string, payloads
+
+    parts.append(template_string[position:])
+    return ''.join(parts), payloads
+
+
+def _source_key(source: str) -> str:
+    return f'<string {_skeleton_digest(source)[:12]}>'
+
 
-def _parse_template(template_string: str) -> Component:
-    soup = bs4.BeautifulSoup(template_string, 'html.parser')
-    plotly_elements = _parse_elements(html_elements=soup.contents)
-    if len(plotly_elements) >= 1:
-        if len(plotly_elements) > 1:
+def _skeleton_digest(skeleton_html: str) -> str:
+    return hashlib.blake2b(skeleton_html.encode(), digest_size=16).hexdigest()
+
+
+def _count_nodes(nodes: typing.Iterable[_Node]) -> int:
+    count = 0
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, _Element):
+            stack.extend(node.children)
+    return count
+
+
+def _load_skeleton(
+    skeleton_html: str,
+    template_key: typing.Optional[typing.Hashable] = None,
+    renderer: typing.Any = None,
+    persist: bool = False,
+) -> _Skeleton:
+    if renderer is None:
+        nodes = _compile_skeleton(skeleton_html)
+        return _Skeleton(nodes=nodes, node_count=_count_nodes(nodes))
+
+    key = (template_key, _skeleton_digest(skeleton_html))
+    skeleton = renderer._skeleton_cache.get(key)
+    if skeleton is not None:
+        return skeleton
+
+    # Without expression slots every distinct html has its own skeleton, which
+    # is only kept in memory.
+    store = renderer._skeleton_store if persist else None
+    if store is not None:
+        skeleton = store.get(key, renderer)
+    if skeleton is None:
+        nodes = _compile_skeleton(
+            skeleton_html, parser=renderer.parser, tags=renderer._tag_mapping()
+        )
+        if renderer.minimize:
+            nodes = tuple(map(_minimize_node, nodes))
+        node_count = _count_nodes(nodes)
+        if renderer.share_static:
+            nodes = tuple(map(_share_static, nodes))
+        skeleton = _Skeleton(nodes=nodes, node_count=node_count)
+        if store is not None:
+            store.set(key, skeleton, renderer)
+    renderer._skeleton_cache.set(key, skeleton)
+    return skeleton
+
+
+def _minimize_node(node: _Node) -> _Node:
+    if not isinstance(node, _Element):
+        return node
+    return node._replace(
+        props=tuple(
+            (name, value) for name, value in node.props if not _is_empty(name, value)
+        ),
+        children=tuple(map(_minimize_node, node.children)),
+        minimized=True,
+    )
+
+
+def _share_static(node: _Node) -> _Node:
+    if not isinstance(node, _Element):
+        return node
+    children = tuple(map(_share_static, node.children))
+    if not node.dynamic and all(
+        isinstance(child, (str, _Payload, _Shared)) for child in children
+    ):
+        return _Shared(node._replace(children=children))
+    return node._replace(children=children)
+
+
+def _compile_skeleton(
+    skeleton_html: str,
+    parser: str = 'bs4',
+    tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None,
+) -> typing.Tuple[_Node, ...]:
+    if _EXPRESSION_START in skeleton_html and _UNSUPPORTED_EXPRESSION_PATTERN.search(
+        skeleton_html
+    ):
+        raise _UnsupportedExpressionSlot()
+    return PARSER_BACKENDS[parser](skeleton_html, tags=tags)
+
+
+def _compile_skeleton_bs4(
+    skeleton_html: str,
+    tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None,
+) -> typing.Tuple[_Node, ...]:
+    import bs4
+
+    soup = bs4.BeautifulSoup(skeleton_html, 'html.parser')
+    return tuple(_parse_elements(html_elements=soup.contents, tags=tags))
+
+
+def _compile_skeleton_html_parser(
+    skeleton_html: str,
+    tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None,
+) -> typing.Tuple[_Node, ...]:
+    parser = _SkeletonParser(tags=tags)
+    parser.feed(skeleton_html)
+    parser.close()
+    return tuple(parser.nodes)
+
+
+def _parse_template(
+    template_string: str,
+    template_key: typing.Optional[typing.Hashable] = None,
+    embedded: typing.Optional[typing.Sequence[Component]] = None,
+    renderer: typing.Any = None,
+    info: typing.Optional[RenderInfo] = None,
+    values: typing.Optional[typing.Sequence[str]] = None,
+    output: str = 'component',
+) -> typing.Any:
+    _check_values(values)
+    if info is None:
+        skeleton_html, payloads = _extract_plotly_payloads(
+            template_string, embedded=embedded, values=values
+        )
+        skeleton = _load_skeleton(
+            skeleton_html,
+            template_key=template_key,
+            renderer=renderer,
+            persist=_persistent(values),
+        )
+        return _build_skeleton(
+            skeleton,
+            payloads=payloads,
+            values=values,
+            output=output,
+            loads=json.loads if renderer is None else renderer._json_loads,
+        )
+
+    tracer = renderer.tracer
+    info.html_size = len(template_string)
+    with tracer('parse', info):
+        skeleton_html, payloads = _extract_plotly_payloads(
+            template_string, embedded=embedded, values=values
+        )
+        skeleton = _load_skeleton(
+            skeleton_html,
+            template_key=template_key,
+            renderer=renderer,
+            persist=_persistent(values),
+        )
+    info.node_count = skeleton.node_count
+    info.embed_count = len(payloads)
+    info.embed_bytes = sum(
+        len(payload) for payload in payloads if isinstance(payload, str)
+    )
+
+    with tracer('build', info):
+        return _build_skeleton(
+            skeleton,
+            payloads=payloads,
+            values=values,
+            output=output,
+            loads=json.loads if renderer is None else renderer._json_loads,
+        )
+
+
+def _build_skeleton(
+    skeleton: _Skeleton,
+    payloads: typing.Sequence[typing.Union[str, Component]],
+    values: typing.Optional[typing.Sequence[str]] = None,
+    output: str = 'component',
+    loads: typing.Callable[[str], typing.Any] = json.loads,
+) -> typing.Any:
+    if len(skeleton.nodes) >= 1:
+        if len(skeleton.nodes) > 1:
             warnings.warn(
                 'Template Tag has more than one main tag, '
                 'which is not supported. '
                 'Only the first tag is used.'
             )
-        return plotly_elements[0]
+        return _BUILDERS[output](
+            skeleton.nodes[0], payloads=payloads, values=values or (), loads=loads
+        )
     else:
         raise ValueError('Empty template in use. Please remove.')
 
 
 def _parse_elements(
-    html_elements: typing.Iterable[bs4.PageElement],
-) -> typing.List[Component]:
+    html_elements: typing.Iterable['bs4.PageElement'],
+    tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None,
+) -> typing.List[_Node]:
+    import bs4.element
+
     plotly_elements = []
     for child in html_elements:
         if isinstance(child, bs4.element.Tag):
-            tag = _parse_tag(child)
+            tag = _parse_tag(child, tags=tags)
             if tag is not None:
                 plotly_elements.append(tag)
         elif isinstance(child, bs4.element.NavigableString):
@@ -68,7 +683,7 @@ def _parse_elements(
             else:
                 try:
                     text = _parse_navigable_string(child)
-                    plotly_elements.append(text)
+                    plotly_elements.append(_text_node(text))
                 except ValueError:
                     pass
         else:
@@ -87,88 +702,502 @@ def _resolve_namespace(namespace: str) -> str:
     return namespace
 
 
+def _component_class(
+    namespace: str, type_name: str
+) -> typing.Tuple[typing.Type[Component], typing.Tuple[str, ...]]:
+    key = (namespace, type_name)
+    entry = _COMPONENT_CLASSES.get(key)
+    if entry is None:
+        component_class = getattr(
+            importlib.import_module(_resolve_namespace(namespace)), type_name
+        )
+        # Props, which may contain components, e.g. "children" or the paths
+        # "tabs[].children" and "labels{}" of component libraries.
+        node_properties = {
+            _NODE_PATH_PATTERN.split(path, maxsplit=1)[0]
+            for path in (
+                *getattr(component_class, '_base_nodes', ('children',)),
+                *getattr(component_class, '_children_props', ()),
+            )
+        }
+        entry = (component_class, tuple(sorted(node_properties)))
+        _COMPONENT_CLASSES[key] = entry
+    return entry
+
+
+def _is_component_json(value: dict) -> bool:
+    return 'type' in value and 'namespace' in value and 'props' in value
+
+
 def _parse_dash_json(data: dict) -> Component:
-    component_class = getattr(
-        importlib.import_module(_resolve_namespace(data['namespace'])),
-        data['type'],
-    )
-    element = component_class(**data['props'])
-    if hasattr(element, 'children') and element.children is not None:
-        if isinstance(element.children, dict):
-            element.children = [element.children]
+    # Walks the payload iteratively, as embedded layouts may be deeper than the
+    # recursion limit. Components are created in reverse pre-order, so their
+    # component-valued props are replaced by components beforehand. The payload
+    # is modified in place.
+    root = [data]
+    stack: typing.List[typing.Tuple[typing.Any, typing.Any]] = [(root, 0)]
+    components = []
+    while stack:
+        container, key = stack.pop()
+        value = container[key]
+        if isinstance(value, list):
+            stack.extend((value, index) for index in range(len(value)))
+        elif isinstance(value, dict):
+            if not _is_component_json(value):
+                stack.extend((value, name) for name in value)
+                continue
 
-        if isinstance(element.children, list):
-            children = []
-            for child in element.children:
-                if isinstance(child, str):
-                    children.append(child)
-                    continue
+            component_class, node_properties = _component_class(
+                value['namespace'], value['type']
+            )
+            props = value['props']
+            children = props.get('children')
+            if isinstance(children, dict) and _is_component_json(children):
+                props['children'] = [children]
+            components.append((container, key, component_class))
+            stack.extend((props, name) for name in node_properties if name in props)
 
-                children.append(_parse_dash_json(child))
-            element.children = children
-    return element
+    for container, key, component_class in reversed(components):
+        container[key] = component_class(**container[key]['props'])
+    return root[0]
 
 
-def _parse_tag(tag: bs4.Tag) -> Component:
-    if tag.name == 'plotly':
-        return _parse_dash_json(data=json.loads(tag.text))
-    elif tag.name.lower() in DASH_TAGS_MAPPING.keys():
-        component_class = DASH_TAGS_MAPPING[tag.name.lower()]
-        available_properties = component_class().available_properties
+def _parse_tag(
+    tag: 'bs4.Tag',
+    tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None,
+) -> _Node:
+    tag_attributes = {
+        k: ' '.join(v) if isinstance(v, list) else v for k, v in tag.attrs.items()
+    }
+    return _make_node(
+        tag_name=tag.name,
+        tag_attributes=tag_attributes,
+        children=tuple(_parse_elements(tag.contents, tags=tags)),
+        tags=tags,
+    )
 
-        tag_attributes = tag.attrs
 
-        tag_attributes.update({
-            k: ' '.join(v) for k, v in tag_attributes.items() if isinstance(v, list)
-        })
+def _make_node(
+    tag_name: str,
+    tag_attributes: typing.Dict[str, str],
+    children: typing.Tuple[_Node, ...],
+    tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None,
+) -> _Node:
+    if tags is None:
+        tags = _dash_tags_mapping()
 
+    if tag_name == 'plotly':
+        if 'slot' in tag_attributes:
+            return _Slot(index=int(tag_attributes['slot']))
+        if len(children) == 1 and isinstance(children[0], str):
+            return _Payload(json=children[0])
+        if any(isinstance(child, _Text) for child in children):
+            raise _UnsupportedExpressionSlot()
+        raise ValueError('Embedded plotly tag without payload found.')
+    elif tag_name.lower() in tags:
+        component_class = tags[tag_name.lower()]
+        dynamic = _apply_expression_values(tag_name, tag_attributes) or any(
+            isinstance(child, _Text) for child in children
+        )
+
+        metadata = _component_metadata(component_class)
         _apply_special_dash_attribute_naming(
-            available_properties=available_properties, tag_attributes=tag_attributes
+            metadata=metadata, tag_attributes=tag_attributes
+        )
+        # Attributes of html components are strings, registered components
+        # receive typed props.
+        if tag_name.lower() not in _dash_tags_mapping():
+            _apply_coercions(metadata=metadata, tag_attributes=tag_attributes)
+
+        return _Element(
+            tag=tag_name,
+            component_class=component_class,
+            props=tuple(tag_attributes.items()),
+            children=children,
+            dynamic=dynamic,
+        )
+    elif _EXPRESSION_START in tag_name:
+        raise _UnsupportedExpressionSlot()
+    raise TypeError(
+        f'Generating dash component from html tag failed. '
+        f'No corresponding dash component found for html tag "{tag_name}".'
+    )
+
+
+def _apply_expression_values(tag_name: str, tag_attributes: typing.Dict[str, str]):
+    dynamic = False
+    for name, value in tag_attributes.items():
+        if _EXPRESSION_START in name or (
+            name == 'style' and _EXPRESSION_START in value
+        ):
+            raise _UnsupportedExpressionSlot()
+        if _EXPRESSION_START in value:
+            tag_attributes[name] = _Value(
+                parts=_split_expressions(value),
+                multi_valued=name in _MULTI_VALUED_ATTRIBUTES['*']
+                or name in _MULTI_VALUED_ATTRIBUTES.get(tag_name, ()),
+            )
+            dynamic = True
+    return dynamic
+
+
+class _SkeletonParser(html.parser.HTMLParser):
+    """Event driven parser, which creates the skeleton nodes without building an
+    intermediate document tree. Mirrors the behavior of the ``bs4`` backend.
+    """
+
+    def __init__(
+        self, tags: typing.Optional[typing.Dict[str, typing.Type[Component]]] = None
+    ) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tags = tags
+        self.nodes: typing.List[_Node] = []
+        self._open_tags: typing.List[
+            typing.Tuple[str, typing.Dict[str, str], typing.List[_Node]]
+        ] = []
+        self._text: typing.List[str] = []
+        # Like bs4, text anywhere within a string container tag is skipped, also
+        # in descendants of <template> and <rt>.
+        self._string_containers = 0
+        # Like bs4, a later end tag of a void element opened by a start tag is
+        # ignored, without ending the text around it.
+        self._closed_void_elements: typing.List[str] = []
+
+    def handle_starttag(
+        self, tag: str, attrs: typing.List[typing.Tuple[str, typing.Optional[str]]]
+    ) -> None:
+        self._open_tag(tag, attrs)
+        if tag in _VOID_ELEMENTS:
+            self._close_tag()
+            self._closed_void_elements.append(tag)
+
+    def handle_startendtag(
+        self, tag: str, attrs: typing.List[typing.Tuple[str, typing.Optional[str]]]
+    ) -> None:
+        self._open_tag(tag, attrs)
+        self._close_tag()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._closed_void_elements:
+            self._closed_void_elements.remove(tag)
+            return
+
+        self._flush_text()
+        for position in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[position][0] == tag:
+                break
+        else:
+            return
+
+        while len(self._open_tags) > position:
+            self._close_tag()
+
+    def handle_data(self, data: str) -> None:
+        self._text.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush_text()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush_text()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush_text()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush_text()
+
+    def close(self) -> None:
+        super().close()
+        self._flush_text()
+        while self._open_tags:
+            self._close_tag()
+
+    def _append(self, node: _Node) -> None:
+        if self._open_tags:
+            self._open_tags[-1][2].append(node)
+        else:
+            self.nodes.append(node)
+
+    def _flush_text(self) -> None:
+        if not self._text:
+            return
+
+        text = ''.join(self._text)
+        self._text.clear()
+        if self._string_containers:
+            container = next(
+                tag
+                for tag, _, _ in reversed(self._open_tags)
+                if tag in _STRING_CONTAINER_TAGS
+            )
+            warnings.warn(
+                f'Node type {container} content is not supported '
+                'in templates yet. Node will be skipped.'
+            )
+            return
+
+        text = text.strip()
+        if text:
+            self._append(_text_node(text))
+
+    def _open_tag(
+        self, tag: str, attrs: typing.List[typing.Tuple[str, typing.Optional[str]]]
+    ) -> None:
+        self._flush_text()
+        tag_attributes = {}
+        for name, value in attrs:
+            if value is None:
+                value = ''
+            elif name in _MULTI_VALUED_ATTRIBUTES['*'] or name in (
+                _MULTI_VALUED_ATTRIBUTES.get(tag, ())
+            ):
+                value = ' '.join(value.split())
+            tag_attributes[name] = value
+
+        self._open_tags.append((tag, tag_attributes, []))
+        if tag in _STRING_CONTAINER_TAGS:
+            self._string_containers += 1
+
+    def _close_tag(self) -> None:
+        tag_name, tag_attributes, children = self._open_tags.pop()
+        if tag_name in _STRING_CONTAINER_TAGS:
+            self._string_containers -= 1
+        self._append(
+            _make_node(
+                tag_name=tag_name,
+                tag_attributes=tag_attributes,
+                children=tuple(children),
+                tags=self.tags,
+            )
         )
 
-        children = list(
-            filter(lambda x: x is not None, _parse_elements(tag.contents)),
+
+def _build_node(
+    node: _Node,
+    payloads: typing.Sequence[typing.Union[str, Component]],
+    values: typing.Sequence[str] = (),
+    loads: typing.Callable[[str], typing.Any] = json.loads,
+) -> typing.Any:
+    if isinstance(node, str):
+        return node
+    if isinstance(node, _Shared):
+        return node.component
+    if isinstance(node, _Slot):
+        payload = payloads[node.index]
+        if isinstance(payload, Component):
+            return payload
+        return _parse_dash_json(data=loads(payload))
+    if isinstance(node, _Payload):
+        return _parse_dash_json(data=loads(node.json))
+    if isinstance(node, _Text):
+        return _join_expressions(node.parts, values).strip()
+
+    tag_attributes = _build_attributes(
+        node, payloads, values, build=_build_node, loads=loads
+    )
+    try:
+        return node.component_class(**tag_attributes)
+    except TypeError as e:
+        raise _build_error(node, e.args[0])
+
+
+def _build_json_node(
+    node: _Node,
+    payloads: typing.Sequence[typing.Union[str, Component]],
+    values: typing.Sequence[str] = (),
+    loads: typing.Callable[[str], typing.Any] = json.loads,
+) -> typing.Any:
+    if isinstance(node, str):
+        return node
+    if isinstance(node, _Shared):
+        return node.json
+    if isinstance(node, _Slot):
+        payload = payloads[node.index]
+        if isinstance(payload, Component):
+            return payload
+        return loads(payload)
+    if isinstance(node, _Payload):
+        return loads(node.json)
+    if isinstance(node, _Text):
+        return _join_expressions(node.parts, values).strip()
+
+    tag_attributes = _build_attributes(
+        node, payloads, values, build=_build_json_node, loads=loads
+    )
+    component_class = node.component_class
+    metadata = _component_metadata(component_class)
+    for name in tag_attributes:
+        if name not in metadata.available_properties and not name.startswith(
+            metadata.wildcard_attributes
+        ):
+            raise _build_error(
+                node,
+                f'The `{component_class._type}` component received an unexpected '
+                f'keyword argument: `{name}`',
+            )
+
+    return {
+        'props': tag_attributes,
+        'type': component_class._type,
+        'namespace': component_class._namespace,
+    }
+
+
+def _build_attributes(
+    node: _Element,
+    payloads: typing.Sequence[typing.Union[str, Component]],
+    values: typing.Sequence[str],
+    build: typing.Callable[..., typing.Any],
+    loads: typing.Callable[[str], typing.Any] = json.loads,
+) -> typing.Dict[str, typing.Any]:
+    tag_attributes = dict(node.props)
+    # Styles and JSON attribute values are decoded once with the skeleton, every
+    # render gets its own copy.
+    for name, value in node.props:
+        if isinstance(value, (dict, list)):
+            tag_attributes[name] = copy.deepcopy(value)
+
+    if not node.dynamic:
+        if len(node.children) > 0:
+            children = [
+                build(child, payloads=payloads, values=values, loads=loads)
+                for child in node.children
+            ]
+            if node.minimized:
+                _set_minimized_children(node, tag_attributes, children)
+            else:
+                tag_attributes['children'] = children
+        return tag_attributes
+
+    for name, value in node.props:
+        if isinstance(value, _Value):
+            text = _join_expressions(value.parts, values)
+            if value.multi_valued:
+                text = ' '.join(text.split())
+            if node.minimized and text == '' and name in DROP_EMPTY_PROPS:
+                del tag_attributes[name]
+                continue
+            tag_attributes[name] = text if value.coerce is None else value.coerce(text)
+
+    # Like whitespace-only text in a template, empty expression values do
+    # not create a child.
+    children = [
+        child
+        for child in (
+            build(child, payloads=payloads, values=values, loads=loads)
+            for child in node.children
         )
+        if not isinstance(child, str) or child
+    ]
+    if node.minimized:
+        _set_minimized_children(node, tag_attributes, children)
+    elif len(children) > 0:
+        tag_attributes['children'] = children
+    return tag_attributes
+
+
+def _set_minimized_children(
+    node: _Element,
+    tag_attributes: typing.Dict[str, typing.Any],
+    children: typing.List[typing.Any],
+) -> None:
+    component_class = node.component_class
+    if not _merges_children(component_class._namespace, component_class._type):
         if len(children) > 0:
             tag_attributes['children'] = children
+        return
 
-        try:
-            return component_class(**tag_attributes)
-        except TypeError as e:
-            tag_content = tag.prettify(encoding=None)
-            if not isinstance(tag_content, str):
-                tag_content = tag_content.decode(encoding='utf8')
-
-            pretty_tag = textwrap.indent(textwrap.shorten(tag_content, width=200), '+ ')
-            raise TypeError(
-                f'Generating dash component from html tag failed.\n'
-                f'HTML Tag:\n'
-                f'{pretty_tag}\n'
-                f'Dash Failure:\n{textwrap.indent(e.args[0], "+ ")}'
-            )
-    raise TypeError(
-        f'Generating dash component from html tag failed. '
-        f'No corresponding dash component found for html tag "{tag.name}".'
+    children = _minimize_children(children)
+    if children is not None:
+        tag_attributes['children'] = children
+
+
+def _build_error(element: _Element, message: str) -> TypeError:
+    pretty_tag = textwrap.indent(
+        textwrap.shorten(_format_element(element), width=200), '+ '
+    )
+    return TypeError(
+        f'Generating dash component from html tag failed.\n'
+        f'HTML Tag:\n'
+        f'{pretty_tag}\n'
+        f'Dash Failure:\n{textwrap.indent(message, "+ ")}'
     )
 
 
-def _apply_special_dash_attribute_naming(available_properties, tag_attributes):
-    for dash_name in available_properties:
-        if dash_name.lower() in tag_attributes:
-            tag_attributes[dash_name] = tag_attributes.pop(dash_name.lower())
+def _format_element(element: _Element) -> str:
+    attributes = ''.join(f' {k}="{v}"' for k, v in element.props)
+    return f'<{element.tag}{attributes}>'
+
+
+def _available_properties(component_class: typing.Type[Component]) -> typing.List[str]:
+    try:
+        return component_class().available_properties
+    except TypeError:
+        # Components with required props can not be created without arguments.
+        parameters = inspect.signature(component_class.__init__).parameters
+        return [
+            name
+            for name, parameter in parameters.items()
+            if name != 'self' and parameter.kind is parameter.POSITIONAL_OR_KEYWORD
+        ]
+
+
+def _wildcard_attributes(
+    component_class: typing.Type[Component],
+) -> typing.Tuple[str, ...]:
+    try:
+        return tuple(component_class()._valid_wildcard_attributes)
+    except TypeError:
+        return ('data-', 'aria-')
+
+
+def _component_metadata(component_class: typing.Type[Component]) -> _ComponentMetadata:
+    metadata = _COMPONENT_METADATA.get(component_class)
+    if metadata is not None:
+        return metadata
+
+    available_properties = _available_properties(component_class)
+
+    class_property = None
+    if 'class_name' in available_properties:
+        class_property = 'class_name'
+    elif 'className' in available_properties:
+        class_property = 'className'
+
+    metadata = _ComponentMetadata(
+        property_names={
+            dash_name.lower(): dash_name
+            for dash_name in available_properties
+            if dash_name.lower() != dash_name
+        },
+        class_property=class_property,
+        html_for='htmlFor' in available_properties,
+        style='style' in available_properties,
+        available_properties=frozenset(available_properties),
+        wildcard_attributes=_wildcard_attributes(component_class),
+        coercions=_coercions(component_class),
+    )
+    _COMPONENT_METADATA[component_class] = metadata
+    return metadata
 
-    if 'class_name' in available_properties and 'class' in tag_attributes:
-        tag_attributes['class_name'] = tag_attributes.pop('class')
-    if 'className' in available_properties and 'class' in tag_attributes:
-        tag_attributes['className'] = tag_attributes.pop('class')
-    if 'htmlFor' in available_properties and 'for' in tag_attributes:
+
+def _apply_special_dash_attribute_naming(metadata, tag_attributes):
+    for html_name in [k for k in tag_attributes if k in metadata.property_names]:
+        tag_attributes[metadata.property_names[html_name]] = tag_attributes.pop(
+            html_name
+        )
+
+    if metadata.class_property is not None and 'class' in tag_attributes:
+        tag_attributes[metadata.class_property] = tag_attributes.pop('class')
+    if metadata.html_for and 'for' in tag_attributes:
         tag_attributes['htmlFor'] = tag_attributes.pop('for')
 
-    if 'style' in tag_attributes and 'style' in available_properties:
+    if metadata.style and 'style' in tag_attributes:
         styles = {}
         for style in tag_attributes['style'].split(';'):
             key, _, value = style.partition(':')
-            key = re.sub(r'\-(\w)', lambda y: y.group(1).upper(), key).strip()
+            key = _STYLE_NAME_PATTERN.sub(lambda y: y.group(1).upper(), key).strip()
             value = value.strip()
             if len(key) == 0:
                 continue
@@ -178,7 +1207,98 @@ def _apply_special_dash_attribute_naming(available_properties, tag_attributes):
         tag_attributes['style'] = styles
 
 
-def _parse_navigable_string(navigable_string: bs4.NavigableString) -> str:
+_FALSE_VALUES = frozenset({'false', 'off', 'no'})
+
+
+def _coerce_attribute(
+    value: str,
+    kinds: typing.FrozenSet[str],
+    literals: typing.FrozenSet[typing.Any],
+) -> typing.Any:
+    if value in literals:
+        return value
+    if 'number' in kinds:
+        for number_type in (int, float):
+            try:
+                return number_type(value)
+            except ValueError:
+                pass
+    if 'bool' in kinds or True in literals or False in literals:
+        # Like html boolean attributes, any value but an explicit false is true.
+        return value.strip().lower() not in _FALSE_VALUES
+    if 'json' in kinds:
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _annotation_members(annotation: typing.Any) -> typing.Iterator[typing.Any]:
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union or origin is types.UnionType:
+        for argument in typing.get_args(annotation):
+            yield from _annotation_members(argument)
+    elif origin is typing.Annotated:
+        yield from _annotation_members(typing.get_args(annotation)[0])
+    else:
+        yield annotation
+
+
+def _coercion(
+    annotation: typing.Any,
+) -> typing.Optional[typing.Callable[[str], typing.Any]]:
+    if annotation is inspect.Parameter.empty or isinstance(annotation, str):
+        return None
+
+    kinds = set()
+    literals = set()
+    for member in _annotation_members(annotation):
+        if member is type(None):
+            continue
+        elif member is str:
+            # Props accepting strings are passed unchanged.
+            return None
+        elif member is bool:
+            kinds.add('bool')
+        elif member in _NUMBER_TYPES:
+            kinds.add('number')
+        elif typing.get_origin(member) is typing.Literal:
+            literals.update(typing.get_args(member))
+        else:
+            kinds.add('json')
+
+    if not kinds and not literals:
+        return None
+    return functools.partial(
+        _coerce_attribute, kinds=frozenset(kinds), literals=frozenset(literals)
+    )
+
+
+def _coercions(
+    component_class: typing.Type[Component],
+) -> typing.Dict[str, typing.Callable[[str], typing.Any]]:
+    parameters = inspect.signature(component_class.__init__).parameters
+    coercions = {}
+    for name, parameter in parameters.items():
+        coerce = _coercion(parameter.annotation)
+        if coerce is not None:
+            coercions[name] = coerce
+    return coercions
+
+
+def _apply_coercions(metadata, tag_attributes):
+    for name, value in tag_attributes.items():
+        coerce = metadata.coercions.get(name)
+        if coerce is None:
+            continue
+        if isinstance(value, _Value):
+            tag_attributes[name] = value._replace(coerce=coerce)
+        elif isinstance(value, str):
+            tag_attributes[name] = coerce(value)
+
+
+def _parse_navigable_string(navigable_string: 'bs4.NavigableString') -> str:
     text = navigable_string.text.strip()
     if text:
         return text
@@ -187,36 +1307,840 @@ def _parse_navigable_string(navigable_string: bs4.NavigableString) -> str:
         raise ValueError(msg)
 
 
+PARSER_BACKENDS: typing.Dict[str, typing.Callable[..., typing.Tuple[_Node, ...]]] = {
+    'bs4': _compile_skeleton_bs4,
+    'html.parser': _compile_skeleton_html_parser,
+}
+
+_BUILDERS = {
+    'component': _build_node,
+    'json': _build_json_node,
+}
+
+
+def _check_output(output: str) -> None:
+    if output not in _BUILDERS:
+        raise ValueError(
+            f'Unknown output "{output}". Available outputs: {", ".join(_BUILDERS)}.'
+        )
+
+
+def _load_result(
+    renderer: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    use_cache: bool,
+    output: str = 'component',
+) -> typing.Tuple[typing.Optional[typing.Hashable], typing.Any]:
+    if renderer is None:
+        return None, None
+
+    renderer._check_templates_if_due()
+    if not use_cache:
+        return None, None
+
+    cache_key = renderer._result_cache_key(template_key, context, output)
+    if cache_key is None:
+        return None, None
+
+    cached = renderer._result_cache.get(cache_key)
+    if cached is None:
+        return cache_key, None
+    return cache_key, copy.deepcopy(cached)
+
+
+def _store_result(
+    renderer: typing.Any,
+    cache_key: typing.Optional[typing.Hashable],
+    component: typing.Any,
+) -> None:
+    if cache_key is not None:
+        renderer._result_cache.set(cache_key, copy.deepcopy(component))
+
+
+def _track_dependencies(
+    server: flask.Flask,
+    renderer: typing.Any,
+    load_template: '_LoadTemplate',
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+) -> None:
+    # Skeletons, expression slot checks and results are cached by template, the
+    # dependencies are tracked for every render to invalidate them.
+    if renderer is None or template_key in renderer._dependencies:
+        return
+
+    if load_template is _from_string:
+        renderer._dependencies.track(server.jinja_env, template_key, source=template)
+    else:
+        names = template_key if isinstance(template_key, tuple) else (template_key,)
+        renderer._dependencies.track(
+            server.jinja_env,
+            template_key,
+            names=[name for name in names if isinstance(name, str)],
+        )
+
+
+_LoadTemplate = typing.Callable[[jinja2.Environment, typing.Any], Template]
+
+
+def _get_template(
+    environment: jinja2.Environment,
+    template_name_or_list: typing.Union[
+        str, Template, typing.List[typing.Union[str, Template]]
+    ],
+) -> Template:
+    return environment.get_or_select_template(template_name_or_list)
+
+
+def _from_string(environment: jinja2.Environment, source: str) -> Template:
+    # Jinja2 compiles string templates on every call, renders in a loop reuse them.
+    key = (environment, source)
+    template = _STRING_TEMPLATES.get(key)
+    if template is None:
+        template = environment.from_string(source)
+        _STRING_TEMPLATES.set(key, template)
+    return template
+
+
+def _environment(
+    server: flask.Flask,
+    renderer: typing.Any,
+    enable_async: bool = False,
+    expression_slots: bool = False,
+) -> jinja2.Environment:
+    if not enable_async and not expression_slots:
+        return server.jinja_env
+    if renderer is None:
+        return server.jinja_env.overlay(enable_async=enable_async, cache_size=0)
+
+    key = (enable_async, expression_slots)
+    environment = renderer._jinja_envs.get(key)
+    if environment is None:
+        # Templates are compiled for the options of their environment, so every
+        # overlay needs its own template cache.
+        options: typing.Dict[str, typing.Any] = {
+            'enable_async': enable_async,
+            'cache_size': 400,
+        }
+        if expression_slots:
+            options['finalize'] = _finalize_expression
+        environment = server.jinja_env.overlay(**options)
+        renderer._jinja_envs[key] = environment
+    return environment
+
+
+def _expression_slots(
+    server: flask.Flask,
+    renderer: typing.Any,
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+) -> bool:
+    if (
+        renderer is None
+        or not renderer.expression_slots
+        or server.jinja_env.finalize is not None
+    ):
+        return False
+
+    plain = renderer._plain_templates.get(template_key)
+    if plain is None:
+        if load_template is _from_string:
+            plain = _captures_markup(server.jinja_env, source=template)
+        else:
+            names = template_key if isinstance(template_key, tuple) else (template_key,)
+            plain = _captures_markup(
+                server.jinja_env,
+                names=[name for name in names if isinstance(name, str)],
+            )
+        renderer._plain_templates.set(template_key, plain)
+    return not plain
+
+
+def _captures_markup(
+    environment: jinja2.Environment,
+    names: typing.Iterable[str] = (),
+    source: typing.Optional[str] = None,
+) -> bool:
+    # Checks the template and the templates it references, templates referenced
+    # by a variable can not be checked.
+    sources = [] if source is None else [source]
+    pending = list(names)
+    seen = set()
+    while sources or (pending and environment.loader is not None):
+        if not sources:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            try:
+                sources.append(environment.loader.get_source(environment, name)[0])
+            except jinja2.TemplateNotFound:
+                continue
+
+        try:
+            ast = environment.parse(sources.pop())
+        except jinja2.TemplateSyntaxError:
+            continue
+        for node in ast.find_all(_CAPTURING_NODES):
+            # The dashcache tag fills in the values itself.
+            if not (
+                isinstance(node, jinja2.nodes.CallBlock)
+                and isinstance(node.call.node, jinja2.nodes.ExtensionAttribute)
+                and node.call.node.name == '_render_block'
+            ):
+                return True
+        pending.extend(
+            name
+            for name in jinja2.meta.find_referenced_templates(ast)
+            if name is not None
+        )
+    return False
+
+
+def _app_context(server: flask.Flask) -> typing.ContextManager[typing.Any]:
+    # Reuse an active application context of the server instead of pushing one.
+    if flask.has_app_context() and flask.current_app._get_current_object() is server:
+        return contextlib.nullcontext()
+    return server.app_context()
+
+
+def _render_template(
+    app: flask.Flask, template: Template, context: typing.Dict[str, typing.Any]
+) -> str:
+    flask.signals.before_render_template.send(
+        app, _async_wrapper=app.ensure_sync, template=template, context=context
+    )
+    rendered = template.render(context)
+    flask.signals.template_rendered.send(
+        app, _async_wrapper=app.ensure_sync, template=template, context=context
+    )
+    return rendered
+
+
+def _render_component(
+    server: flask.Flask,
+    renderer: typing.Any,
+    jinja_template: Template,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    expression_slots: bool,
+    output: str,
+    info: typing.Optional[RenderInfo] = None,
+) -> typing.Any:
+    with (
+        _embedded_components_scope() as embedded,
+        _expression_values_scope(expression_slots) as values,
+    ):
+        if info is None:
+            template_string = _render_template(server, jinja_template, context)
+        else:
+            with renderer.tracer('jinja', info):
+                template_string = _render_template(server, jinja_template, context)
+
+    return _parse_template(
+        template_string=template_string,
+        template_key=template_key,
+        embedded=embedded,
+        renderer=renderer,
+        info=info,
+        values=values,
+        output=output,
+    )
+
+
+def _render_loaded(
+    server: flask.Flask,
+    renderer: typing.Any,
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    output: str,
+    info: typing.Optional[RenderInfo] = None,
+    loaded: typing.Optional[typing.Dict[bool, Template]] = None,
+) -> typing.Any:
+    if loaded is None:
+        loaded = {}
+
+    def load(expression_slots: bool) -> Template:
+        if expression_slots not in loaded:
+            loaded[expression_slots] = load_template(
+                _environment(server, renderer, expression_slots=expression_slots),
+                template,
+            )
+        return loaded[expression_slots]
+
+    expression_slots = _expression_slots(
+        server, renderer, load_template, template, template_key
+    )
+    try:
+        return _render_component(
+            server,
+            renderer,
+            load(expression_slots),
+            template_key,
+            context,
+            expression_slots,
+            output,
+            info,
+        )
+    except _UnsupportedExpressionSlot:
+        if not expression_slots:
+            raise
+        renderer._plain_templates.set(template_key, True)
+
+    return _render_component(
+        server, renderer, load(False), template_key, context, False, output, info
+    )
+
+
+def _render(
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    use_cache: bool = True,
+    output: str = 'component',
+) -> typing.Any:
+    server = dash.get_app().server
+    return _render_app(
+        server,
+        server.extensions.get(EXTENSION_NAME),
+        load_template,
+        template,
+        template_key,
+        context,
+        use_cache,
+        output,
+    )
+
+
+def _render_app(
+    server: flask.Flask,
+    renderer: typing.Any,
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    use_cache: bool = True,
+    output: str = 'component',
+) -> typing.Any:
+    _check_output(output)
+    if renderer is None or renderer.tracer is None:
+        return _render_cached(
+            server,
+            renderer,
+            load_template,
+            template,
+            template_key,
+            context,
+            use_cache,
+            output,
+        )
+
+    info = RenderInfo(template=template_key)
+    with renderer.tracer('render', info):
+        return _render_cached(
+            server,
+            renderer,
+            load_template,
+            template,
+            template_key,
+            context,
+            use_cache,
+            output,
+            info,
+        )
+
+
+def _render_cached(
+    server: flask.Flask,
+    renderer: typing.Any,
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    use_cache: bool,
+    output: str,
+    info: typing.Optional[RenderInfo] = None,
+) -> typing.Any:
+    cache_key, component = _load_result(
+        renderer, template_key, context, use_cache, output
+    )
+    if component is not None:
+        return component
+
+    with _app_context(server):
+        server.update_template_context(context)
+        component = _render_loaded(
+            server,
+            renderer,
+            load_template,
+            template,
+            template_key,
+            context,
+            output,
+            info,
+        )
+
+    _store_result(renderer, cache_key, component)
+    _track_dependencies(server, renderer, load_template, template, template_key)
+    return component
+
+
+def _render_many(
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    contexts: typing.Iterable[typing.Mapping[str, typing.Any]],
+    shared_context: typing.Dict[str, typing.Any],
+    output: str = 'component',
+) -> typing.List[typing.Any]:
+    _check_output(output)
+    server = dash.get_app().server
+    renderer = server.extensions.get(EXTENSION_NAME)
+    tracer = None if renderer is None else renderer.tracer
+    if renderer is not None:
+        renderer._check_templates_if_due()
+
+    components = []
+    loaded: typing.Dict[bool, Template] = {}
+    with _app_context(server):
+        server.update_template_context(shared_context)
+        for item_context in contexts:
+            context = {**shared_context, **item_context}
+            if tracer is None:
+                component = _render_loaded(
+                    server,
+                    renderer,
+                    load_template,
+                    template,
+                    template_key,
+                    context,
+                    output,
+                    loaded=loaded,
+                )
+            else:
+                info = RenderInfo(template=template_key)
+                with tracer('render', info):
+                    component = _render_loaded(
+                        server,
+                        renderer,
+                        load_template,
+                        template,
+                        template_key,
+                        context,
+                        output,
+                        info,
+                        loaded,
+                    )
+            components.append(component)
+    _track_dependencies(server, renderer, load_template, template, template_key)
+    return components
+
+
+async def _render_template_async(
+    app: flask.Flask, template: Template, context: typing.Dict[str, typing.Any]
+) -> str:
+    flask.signals.before_render_template.send(
+        app, _async_wrapper=app.ensure_sync, template=template, context=context
+    )
+    rendered = await template.render_async(context)
+    flask.signals.template_rendered.send(
+        app, _async_wrapper=app.ensure_sync, template=template, context=context
+    )
+    return rendered
+
+
+async def _render_component_async(
+    server: flask.Flask,
+    renderer: typing.Any,
+    jinja_template: Template,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    expression_slots: bool,
+    output: str,
+    info: typing.Optional[RenderInfo] = None,
+) -> typing.Any:
+    with (
+        _embedded_components_scope() as embedded,
+        _expression_values_scope(expression_slots) as values,
+    ):
+        if info is None:
+            template_string = await _render_template_async(
+                server, jinja_template, context
+            )
+        else:
+            with renderer.tracer('jinja', info):
+                template_string = await _render_template_async(
+                    server, jinja_template, context
+                )
+
+    return await asyncio.to_thread(
+        _parse_template,
+        template_string=template_string,
+        template_key=template_key,
+        embedded=embedded,
+        renderer=renderer,
+        info=info,
+        values=values,
+        output=output,
+    )
+
+
+async def _render_async(
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    use_cache: bool = True,
+    output: str = 'component',
+) -> typing.Any:
+    _check_output(output)
+    server = dash.get_app().server
+    renderer = server.extensions.get(EXTENSION_NAME)
+    if renderer is None or renderer.tracer is None:
+        return await _render_cached_async(
+            server,
+            renderer,
+            load_template,
+            template,
+            template_key,
+            context,
+            use_cache,
+            output,
+        )
+
+    info = RenderInfo(template=template_key)
+    with renderer.tracer('render', info):
+        return await _render_cached_async(
+            server,
+            renderer,
+            load_template,
+            template,
+            template_key,
+            context,
+            use_cache,
+            output,
+            info,
+        )
+
+
+async def _render_cached_async(
+    server: flask.Flask,
+    renderer: typing.Any,
+    load_template: _LoadTemplate,
+    template: typing.Any,
+    template_key: typing.Optional[typing.Hashable],
+    context: typing.Dict[str, typing.Any],
+    use_cache: bool,
+    output: str,
+    info: typing.Optional[RenderInfo] = None,
+) -> typing.Any:
+    cache_key, component = _load_result(
+        renderer, template_key, context, use_cache, output
+    )
+    if component is not None:
+        return component
+
+    expression_slots = _expression_slots(
+        server, renderer, load_template, template, template_key
+    )
+    with _app_context(server):
+        server.update_template_context(context)
+        try:
+            component = await _render_component_async(
+                server,
+                renderer,
+                load_template(
+                    _environment(
+                        server,
+                        renderer,
+                        enable_async=True,
+                        expression_slots=expression_slots,
+                    ),
+                    template,
+                ),
+                template_key,
+                context,
+                expression_slots,
+                output,
+                info,
+            )
+        except _UnsupportedExpressionSlot:
+            if not expression_slots:
+                raise
+            renderer._plain_templates.set(template_key, True)
+            component = await _render_component_async(
+                server,
+                renderer,
+                load_template(
+                    _environment(server, renderer, enable_async=True), template
+                ),
+                template_key,
+                context,
+                False,
+                output,
+                info,
+            )
+
+    _store_result(renderer, cache_key, component)
+    _track_dependencies(server, renderer, load_template, template, template_key)
+    return component
+
+
 def render_dash_template(
     template_name_or_list: typing.Union[
         str, Template, typing.List[typing.Union[str, Template]]
     ],
+    *,
+    use_cache: bool = True,
+    output: str = 'component',
     **context: typing.Any,
-) -> Component:
+) -> typing.Any:
     """Render a template by name with the given context.
 
     :param template_name_or_list: The name of the template to render. If
         a list is given, the first name to exist will be rendered.
+    :param use_cache: Use the result cache of the ``TemplateRenderer``, if enabled.
+    :param output: ``'component'`` to build Dash components, ``'json'`` to build
+        the ``{'props', 'type', 'namespace'}`` dicts Dash serializes components to,
+        for callback outputs and children of components.
     :param context: The variables to make available in the template.
-    :return: The render html content expressed as Dash ``Component``.
+    :return: The render html content expressed as Dash ``Component`` or its JSON
+        dict.
     """
-    with dash.get_app().server.app_context():
-        return _parse_template(
-            template_string=render_template(template_name_or_list, **context)
-        )
+    return _render(
+        _get_template,
+        template_name_or_list,
+        template_key=_template_key(template_name_or_list),
+        context=context,
+        use_cache=use_cache,
+        output=output,
+    )
 
 
 def render_dash_template_string(
     source: str,
+    *,
+    use_cache: bool = True,
+    output: str = 'component',
     **context: typing.Any,
-) -> Component:
+) -> typing.Any:
     """Render a template from the given source string with the given context.
 
     :param source: The source code of the template to render.
+    :param use_cache: Use the result cache of the ``TemplateRenderer``, if enabled.
+    :param output: ``'component'`` to build Dash components, ``'json'`` to build
+        the ``{'props', 'type', 'namespace'}`` dicts Dash serializes components to,
+        for callback outputs and children of components.
     :param context: The variables to make available in the template.
-    :return: The render html content expressed as Dash ``Component``.
+    :return: The render html content expressed as Dash ``Component`` or its JSON
+        dict.
     """
-    with dash.get_app().server.app_context():
-        return _parse_template(
-            template_string=render_template_string(source, **context)
-        )
+    return _render(
+        _from_string,
+        source,
+        template_key=_source_key(source),
+        context=context,
+        use_cache=use_cache,
+        output=output,
+    )
+
+
+def render_dash_template_many(
+    template_name_or_list: typing.Union[
+        str, Template, typing.List[typing.Union[str, Template]]
+    ],
+    contexts: typing.Iterable[typing.Mapping[str, typing.Any]],
+    *,
+    output: str = 'component',
+    **shared_context: typing.Any,
+) -> typing.List[typing.Any]:
+    """Render a template by name once for every given context.
+
+    The template is looked up and the context processors of the Flask application
+    run only once for the whole batch. Renders with the same html structure share
+    the analyzed template skeleton, see the ``expression_slots`` option of the
+    ``TemplateRenderer``. The result cache is not used.
+
+    :param template_name_or_list: The name of the template to render. If
+        a list is given, the first name to exist will be rendered.
+    :param contexts: The variables of every single render.
+    :param output: ``'component'`` to build Dash components, ``'json'`` to build
+        the ``{'props', 'type', 'namespace'}`` dicts Dash serializes components to,
+        for callback outputs and children of components.
+    :param shared_context: The variables available in all renders. Variables of
+        ``contexts`` take precedence.
+    :return: The rendered html content of every context expressed as Dash
+        ``Component`` or its JSON dict.
+    """
+    return _render_many(
+        _get_template,
+        template_name_or_list,
+        template_key=_template_key(template_name_or_list),
+        contexts=contexts,
+        shared_context=shared_context,
+        output=output,
+    )
+
+
+def render_dash_template_string_many(
+    source: str,
+    contexts: typing.Iterable[typing.Mapping[str, typing.Any]],
+    *,
+    output: str = 'component',
+    **shared_context: typing.Any,
+) -> typing.List[typing.Any]:
+    """Render a template from the given source string once for every given context.
+
+    The source is compiled and the context processors of the Flask application run
+    only once for the whole batch. Renders with the same html structure share the
+    analyzed template skeleton, see the ``expression_slots`` option of the
+    ``TemplateRenderer``. The result cache is not used.
+
+    :param source: The source code of the template to render.
+    :param contexts: The variables of every single render.
+    :param output: ``'component'`` to build Dash components, ``'json'`` to build
+        the ``{'props', 'type', 'namespace'}`` dicts Dash serializes components to,
+        for callback outputs and children of components.
+    :param shared_context: The variables available in all renders. Variables of
+        ``contexts`` take precedence.
+    :return: The rendered html content of every context expressed as Dash
+        ``Component`` or its JSON dict.
+    """
+    return _render_many(
+        _from_string,
+        source,
+        template_key=_source_key(source),
+        contexts=contexts,
+        shared_context=shared_context,
+        output=output,
+    )
+
+
+def render_dash_template_patch(
+    template_name_or_list: typing.Union[
+        str, Template, typing.List[typing.Union[str, Template]]
+    ],
+    previous: typing.Any,
+    *,
+    use_cache: bool = True,
+    **context: typing.Any,
+) -> typing.Any:
+    """Render a template by name and return the changes to a previous render of
+    the same callback output as ``dash.Patch``, see
+    :func:`~dash_template_rendering.patching.make_patch`.
+
+    :param template_name_or_list: The name of the template to render. If
+        a list is given, the first name to exist will be rendered.
+    :param previous: The previous value of the output, e.g. from a ``State``.
+    :param use_cache: Use the result cache of the ``TemplateRenderer``, if enabled.
+    :param context: The variables to make available in the template.
+    :return: A ``dash.Patch``, ``dash.no_update`` or the rendered JSON, if it does
+        not match the previous value at the top level.
+    """
+    current = _render(
+        _get_template,
+        template_name_or_list,
+        template_key=_template_key(template_name_or_list),
+        context=context,
+        use_cache=use_cache,
+        output='json',
+    )
+    return make_patch(previous, current)
+
+
+def render_dash_template_string_patch(
+    source: str,
+    previous: typing.Any,
+    *,
+    use_cache: bool = True,
+    **context: typing.Any,
+) -> typing.Any:
+    """Render a template from the given source string and return the changes to a
+    previous render of the same callback output as ``dash.Patch``, see
+    :func:`~dash_template_rendering.patching.make_patch`.
+
+    :param source: The source code of the template to render.
+    :param previous: The previous value of the output, e.g. from a ``State``.
+    :param use_cache: Use the result cache of the ``TemplateRenderer``, if enabled.
+    :param context: The variables to make available in the template.
+    :return: A ``dash.Patch``, ``dash.no_update`` or the rendered JSON, if it does
+        not match the previous value at the top level.
+    """
+    current = _render(
+        _from_string,
+        source,
+        template_key=_source_key(source),
+        context=context,
+        use_cache=use_cache,
+        output='json',
+    )
+    return make_patch(previous, current)
+
+
+async def render_dash_template_async(
+    template_name_or_list: typing.Union[
+        str, Template, typing.List[typing.Union[str, Template]]
+    ],
+    *,
+    use_cache: bool = True,
+    output: str = 'component',
+    **context: typing.Any,
+) -> typing.Any:
+    """Render a template by name with the given context in an async callback.
+
+    The template is rendered with an async enabled Jinja2 environment, so awaitable
+    context values are awaited within the template. Parsing the rendered html and
+    building the components runs in a worker thread to keep the event loop free.
+
+    :param template_name_or_list: The name of the template to render. If
+        a list is given, the first name to exist will be rendered.
+    :param use_cache: Use the result cache of the ``TemplateRenderer``, if enabled.
+    :param output: ``'component'`` to build Dash components, ``'json'`` to build
+        the ``{'props', 'type', 'namespace'}`` dicts Dash serializes components to,
+        for callback outputs and children of components.
+    :param context: The variables to make available in the template.
+    :return: The render html content expressed as Dash ``Component`` or its JSON
+        dict.
+    """
+    return await _render_async(
+        _get_template,
+        template_name_or_list,
+        template_key=_template_key(template_name_or_list),
+        context=context,
+        use_cache=use_cache,
+        output=output,
+    )
+
+
+async def render_dash_template_string_async(
+    source: str,
+    *,
+    use_cache: bool = True,
+    output: str = 'component',
+    **context: typing.Any,
+) -> typing.Any:
+    """Render a template from the given source string with the given context in an
+    async callback.
+
+    :param source: The source code of the template to render.
+    :param use_cache: Use the result cache of the ``TemplateRenderer``, if enabled.
+    :param output: ``'component'`` to build Dash components, ``'json'`` to build
+        the ``{'props', 'type', 'namespace'}`` dicts Dash serializes components to,
+        for callback outputs and children of components.
+    :param context: The variables to make available in the template.
+    :return: The render html content expressed as Dash ``Component`` or its JSON
+        dict.
+    """
+    return await _render_async(
+        _from_string,
+        source,
+        template_key=_source_key(source),
+        context=context,
+        use_cache=use_cache,
+        output=output,
+    )
@@ -0,0 +1,98 @@
+"""
+Tracing hooks for the phases of a template render.
+
+A tracer is a callable, which gets the name of a phase and the :class:`RenderInfo`
+of the current render and returns a context manager wrapping the phase::
+
+    import contextlib
+    import time
+
+    @contextlib.contextmanager
+    def log_tracer(phase, info):
+        start = time.perf_counter()
+        yield
+        print(info.template, phase, time.perf_counter() - start)
+
+    TemplateRenderer(dash=app, tracer=log_tracer)
+
+The phases of a render are ``render`` (wrapping all others), ``jinja``, ``parse``
+and ``build``. The attributes of :class:`RenderInfo` are filled in as soon as the
+corresponding phase finished.
+"""
+
+import contextlib
+import typing
+
+PHASES = ('render', 'jinja', 'parse', 'build')
+
+
+class RenderInfo:
+    """Information about a single template render passed to tracers.
+
+    :param template: The name of the rendered template, or an identifier derived
+        from the source of a string template.
+    """
+
+    __slots__ = ('template', 'html_size', 'node_count', 'embed_count', 'embed_bytes')
+
+    def __init__(self, template: typing.Optional[typing.Hashable]) -> None:
+        self.template = template
+        #: Length of the html rendered by Jinja.
+        self.html_size: typing.Optional[int] = None
+        #: Number of html nodes of the analyzed template.
+        self.node_count: typing.Optional[int] = None
+        #: Number of components embedded with the ``plotly`` filter.
+        self.embed_count: typing.Optional[int] = None
+        #: Length of the JSON payloads of the embedded components.
+        self.embed_bytes: typing.Optional[int] = None
+
+    def __repr__(self) -> str:
+        attributes = ', '.join(
+            f'{name}={getattr(self, name)!r}' for name in self.__slots__
+        )
+        return f'{type(self).__name__}({attributes})'
+
+
+Tracer = typing.Callable[[str, RenderInfo], typing.ContextManager[typing.Any]]
+
+
+def callback_tracer(
+    on_start: typing.Optional[typing.Callable[[str, RenderInfo], None]] = None,
+    on_end: typing.Optional[typing.Callable[[str, RenderInfo], None]] = None,
+) -> Tracer:
+    """Create a tracer from start and end callbacks.
+
+    :param on_start: Called with the phase and render info before a phase starts.
+    :param on_end: Called with the phase and render info after a phase ended,
+        even if the phase failed.
+    :return: The tracer calling the callbacks.
+    """
+
+    @contextlib.contextmanager
+    def tracer(phase: str, info: RenderInfo) -> typing.Iterator[None]:
+        if on_start is not None:
+            on_start(phase, info)
+        try:
+            yield
+        finally:
+            if on_end is not None:
+                on_end(phase, info)
+
+    return tracer
+
+
+def combine_tracers(*tracers: Tracer) -> Tracer:
+    """Combine several tracers into one, entering them in the given order.
+
+    :param tracers: The tracers to combine.
+    :return: The combined tracer.
+    """
+
+    @contextlib.contextmanager
+    def tracer(phase: str, info: RenderInfo) -> typing.Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            for inner_tracer in tracers:
+                stack.enter_context(inner_tracer(phase, info))
+            yield
+
+    return tracer
@@ -0,0 +1,103 @@
+import jinja2
+import pytest
+from dash import Dash, html
+from flask import Flask
+
+from dash_template_rendering import TemplateRenderer, render_dash_template
+from dash_template_rendering.__main__ import main
+from dash_template_rendering.artifact import (
+    ArtifactBytecodeCache,
+    compile_templates,
+    load_artifact,
+    save_artifact,
+)
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / 'templates'
+    (directory / 'cards').mkdir(parents=True)
+    (directory / 'page.html').write_text('<main><h1>Title</h1>{{ text }}</main>')
+    (directory / 'cards' / 'card.html').write_text('<div>{{ card.title }}</div>')
+    (directory / 'broken.html').write_text('<div>{% if %}</div>')
+    return directory
+
+
+def create_dash(template_dir, **kwargs):
+    dashboard = Dash(server=Flask('test', template_folder=str(template_dir)))
+    dashboard.layout = html.Div()
+    TemplateRenderer(dash=dashboard, **kwargs)
+    return dashboard
+
+
+def test_compile_templates(template_dir):
+    errors = {}
+    artifact = compile_templates(
+        template_dir,
+        contexts={'cards/card.html': [{'card': {'title': 'a'}}]},
+        errors=errors,
+    )
+
+    assert {name for _, name in artifact.bytecode} == {'cards/card.html', 'page.html'}
+    assert {key[0] for key in artifact.skeletons} == {'cards/card.html', 'page.html'}
+    assert set(errors) == {'broken.html'}
+
+
+def test_init_dash_loads_artifact(template_dir, tmp_path, monkeypatch):
+    path = tmp_path / 'templates.artifact'
+    save_artifact(compile_templates(template_dir), path)
+    monkeypatch.setattr(jinja2.Environment, 'compile', pytest.fail)
+
+    dashboard = create_dash(template_dir, artifact=path)
+    renderer = dashboard.server.extensions['dash_template_rendering']
+
+    assert isinstance(dashboard.server.jinja_env.bytecode_cache, ArtifactBytecodeCache)
+    assert len(dashboard.server.jinja_env.cache) == 2
+    assert len(renderer._skeleton_cache) == 1
+
+    with dashboard.server.test_request_context():
+        component = render_dash_template('page.html')
+
+    assert component.children[0].children == ['Title']
+    assert len(renderer._skeleton_cache) == 1
+
+
+def test_changed_template_ignores_bytecode(template_dir, tmp_path):
+    path = tmp_path / 'templates.artifact'
+    save_artifact(compile_templates(template_dir), path)
+    (template_dir / 'page.html').write_text('<section>{{ text }}</section>')
+
+    dashboard = create_dash(template_dir, artifact=path)
+
+    with dashboard.server.test_request_context():
+        component = render_dash_template('page.html', text='changed')
+
+    assert isinstance(component, html.Section)
+    assert component.children == ['changed']
+
+
+def test_compile_command(template_dir, tmp_path, capsys):
+    path = tmp_path / 'out.artifact'
+
+    assert main(['compile', str(template_dir), '--output', str(path)]) == 1
+
+    output = capsys.readouterr()
+    assert 'Compiled 2 templates and 1 skeletons' in output.out
+    assert 'Error: broken.html: TemplateSyntaxError' in output.err
+    assert "Warning: cards/card.html: UndefinedError: 'card' is undefined" in output.err
+    assert load_artifact(path) is not None
+
+
+def test_compile_command_succeeds_with_failed_sample_renders(template_dir, tmp_path):
+    (template_dir / 'broken.html').unlink()
+
+    assert main(['compile', str(template_dir), '--output', str(tmp_path / 'a')]) == 0
+
+
+def test_compile_templates_render_errors(template_dir):
+    errors = {}
+    render_errors = {}
+    compile_templates(template_dir, errors=errors, render_errors=render_errors)
+
+    assert set(errors) == {'broken.html'}
+    assert set(render_errors) == {'cards/card.html'}
@@ -0,0 +1,50 @@
+import asyncio
+
+import jinja2
+import pytest
+from dash import html
+
+from dash_template_rendering import (
+    render_dash_template_async,
+    render_dash_template_string_async,
+)
+
+
+async def load_title():
+    await asyncio.sleep(0)
+    return 'Loaded title'
+
+
+@pytest.mark.usefixtures('client')
+def test_render_dash_template_string_async_awaits_context_values():
+    template = asyncio.run(
+        render_dash_template_string_async(
+            '<div><h1>{{ load_title() }}</h1>{{ content|plotly }}</div>',
+            load_title=load_title,
+            content=html.P('content'),
+        )
+    )
+
+    assert isinstance(template, html.Div)
+    assert template.children[0].children == ['Loaded title']
+    assert template.children[1].children == 'content'
+
+
+@pytest.mark.usefixtures('client')
+def test_render_dash_template_async_by_name(app):
+    app.jinja_env.loader = jinja2.DictLoader({
+        'page.html': '<section>{{ load_title() }}</section>'
+    })
+
+    async def render_twice():
+        return await asyncio.gather(
+            render_dash_template_async('page.html', load_title=load_title),
+            render_dash_template_async(
+                ['missing.html', 'page.html'], load_title=load_title
+            ),
+        )
+
+    first, second = asyncio.run(render_twice())
+
+    assert first.children == ['Loaded title']
+    assert second.children == ['Loaded title']
@@ -0,0 +1,163 @@
+import jinja2
+import pytest
+from dash import html
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import (
+    TemplateRenderer,
+    render_dash_template_many,
+    render_dash_template_string,
+    render_dash_template_string_many,
+)
+
+CARD = """
+<div class="card {{ kind }}" id="card-{{ id }}">
+    <h5>{{ title }}</h5>
+    <p>{{ text }} {{ suffix }}</p>
+    {{ content|plotly }}
+</div>
+"""
+
+CONTEXTS = [
+    {'kind': 'primary', 'id': 1, 'title': 'First', 'text': '<b>bold</b>'},
+    {'kind': '', 'id': 2, 'title': 'Second', 'text': ''},
+    {'kind': ' a  b ', 'id': 3, 'title': ' Third ', 'text': 'a & b'},
+]
+
+
+@pytest.fixture(params=['bs4', 'html.parser'])
+def slots_renderer(request, dashboard):
+    return TemplateRenderer(dash=dashboard, expression_slots=True, parser=request.param)
+
+
+@pytest.mark.usefixtures('client')
+def test_render_many_matches_single_renders(template_renderer):
+    components = render_dash_template_string_many(
+        CARD, CONTEXTS, suffix='!', content=html.Span('span')
+    )
+    expected = [
+        render_dash_template_string(
+            CARD, suffix='!', content=html.Span('span'), **context
+        )
+        for context in CONTEXTS
+    ]
+
+    assert [to_json_plotly(c) for c in components] == [
+        to_json_plotly(c) for c in expected
+    ]
+    assert components[0].children[1].children == ['<b>bold</b> !']
+    assert components[1].className == 'card'
+
+
+@pytest.mark.usefixtures('client')
+def test_expression_slots_share_skeleton(slots_renderer, dashboard):
+    components = render_dash_template_string_many(
+        CARD, CONTEXTS, suffix='!', content=html.Span('span')
+    )
+
+    TemplateRenderer(dash=dashboard)
+    expected = render_dash_template_string_many(
+        CARD, CONTEXTS, suffix='!', content=html.Span('span')
+    )
+
+    assert len(slots_renderer._skeleton_cache) == 1
+    assert [to_json_plotly(c) for c in components] == [
+        to_json_plotly(c) for c in expected
+    ]
+
+
+@pytest.mark.usefixtures('client', 'slots_renderer')
+def test_expression_slots_drop_empty_text():
+    component = render_dash_template_string(
+        '<div><p>{{ text }}</p><span> </span></div>', text='  '
+    )
+
+    assert to_json_plotly(component) == to_json_plotly(
+        html.Div([html.P(), html.Span()])
+    )
+
+
+@pytest.mark.usefixtures('client')
+@pytest.mark.parametrize(
+    'source',
+    [
+        '<div><{{ tag }}>text</{{ tag }}></div>',
+        '<div id={{ value }}></div>',
+        '<div style="color: {{ value }}"></div>',
+    ],
+)
+def test_expression_slots_fall_back_for_unsupported_positions(slots_renderer, source):
+    component = render_dash_template_string(source, tag='p', value='red')
+
+    TemplateRenderer(dash=slots_renderer._dash)
+    expected = render_dash_template_string(source, tag='p', value='red')
+
+    assert to_json_plotly(component) == to_json_plotly(expected)
+    assert len(slots_renderer._plain_templates) == 1
+
+
+MACRO = '{% macro m(v) %}{{ v }}{% endmacro %}'
+
+
+@pytest.mark.usefixtures('client')
+@pytest.mark.parametrize(
+    ('source', 'expected'),
+    [
+        (MACRO + '<div>{{ m(y)|striptags }}</div>', html.Div(['qq'])),
+        (MACRO + '<div title="{{ m(y)|striptags }}"></div>', html.Div(title='qq')),
+        (MACRO + '<div>{{ m(y)|upper }}</div>', html.Div(['QQ'])),
+        (MACRO + '<div>{{ m(y)|length }}</div>', html.Div(['2'])),
+        (
+            MACRO + '<div>{% if m(y) == "qq" %}<p>yes</p>{% endif %}</div>',
+            html.Div([html.P(['yes'])]),
+        ),
+        (
+            '{% set s %} {{ y }} {% endset %}'
+            '<div>{% if s|trim == "qq" %}<p>yes</p>{% endif %}</div>',
+            html.Div([html.P(['yes'])]),
+        ),
+        (
+            '<div>{% block b %}<i>{{ y }}</i>{% endblock %}'
+            '<p>{{ self.b()|striptags }}</p></div>',
+            html.Div([html.I(['qq']), html.P(['qq'])]),
+        ),
+    ],
+)
+def test_expression_slots_fall_back_for_captured_html(slots_renderer, source, expected):
+    component = render_dash_template_string(source, y='qq')
+
+    assert to_json_plotly(component) == to_json_plotly(expected)
+    assert [
+        slots_renderer._plain_templates.get(key)
+        for key in slots_renderer._plain_templates.keys()
+    ] == [True]
+
+
+@pytest.mark.usefixtures('client')
+def test_expression_slots_with_dashcache_block(slots_renderer):
+    source = (
+        '<div><p>{{ y }}</p>{% dashcache "b" %}<i>{{ y }}</i>{% enddashcache %}</div>'
+    )
+
+    component = render_dash_template_string(source, y='qq')
+
+    assert to_json_plotly(component) == to_json_plotly(
+        html.Div([html.P(['qq']), html.I(['qq'])])
+    )
+    assert [
+        slots_renderer._plain_templates.get(key)
+        for key in slots_renderer._plain_templates.keys()
+    ] == [False]
+
+
+@pytest.mark.usefixtures('client')
+def test_render_many_by_name(app):
+    app.jinja_env.loader = jinja2.DictLoader({'row.html': '<li>{{ name }}</li>'})
+    app.context_processor(lambda: {'name': 'processor'})
+
+    components = render_dash_template_many('row.html', [{'name': 'a'}, {}], unused=True)
+
+    assert [component.children for component in components] == [
+        ['a'],
+        ['processor'],
+    ]
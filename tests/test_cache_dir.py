@@ -0,0 +1,121 @@
+import jinja2
+import pytest
+from dash import Dash, html
+from flask import Flask
+
+from dash_template_rendering import TemplateRenderer, render_dash_template
+from dash_template_rendering import templating
+from dash_template_rendering.cache_dir import CacheDirBytecodeCache
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / 'templates'
+    directory.mkdir()
+    (directory / 'page.html').write_text('<main><h1>Title</h1>{{ text }}</main>')
+    return directory
+
+
+def create_dash(template_dir, **kwargs):
+    dashboard = Dash(server=Flask('test', template_folder=str(template_dir)))
+    dashboard.layout = html.Div()
+    TemplateRenderer(dash=dashboard, **kwargs)
+    return dashboard
+
+
+def render(dashboard, *args, **kwargs):
+    with dashboard.server.test_request_context():
+        return render_dash_template(*args, **kwargs)
+
+
+def test_cache_dir_is_shared(template_dir, tmp_path, monkeypatch):
+    cache_dir = tmp_path / 'cache'
+    first = create_dash(template_dir, cache_dir=cache_dir, expression_slots=True)
+    render(first, 'page.html', text='first')
+
+    assert isinstance(first.server.jinja_env.bytecode_cache, CacheDirBytecodeCache)
+    assert len(list((cache_dir / 'bytecode').iterdir())) == 1
+    assert len(list((cache_dir / 'skeletons').iterdir())) == 1
+
+    monkeypatch.setattr(jinja2.Environment, 'compile', pytest.fail)
+    monkeypatch.setattr(templating, '_compile_skeleton', pytest.fail)
+    second = create_dash(template_dir, cache_dir=cache_dir, expression_slots=True)
+    component = render(second, 'page.html', text='second')
+
+    assert component.children[1] == 'second'
+    assert component.children[0].children == ['Title']
+
+
+def test_bytecode_of_other_environment_is_not_used(template_dir, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    render(
+        create_dash(template_dir, cache_dir=cache_dir, expression_slots=True),
+        'page.html',
+    )
+
+    component = render(
+        create_dash(template_dir, cache_dir=cache_dir), 'page.html', text='plain'
+    )
+
+    assert component.children[1] == 'plain'
+    assert len(list((cache_dir / 'bytecode').iterdir())) == 2
+
+
+def test_unreadable_skeleton_is_ignored(template_dir, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    render(
+        create_dash(template_dir, cache_dir=cache_dir, expression_slots=True),
+        'page.html',
+        text='a',
+    )
+    for path in (cache_dir / 'skeletons').iterdir():
+        path.write_bytes(b'broken')
+
+    component = render(
+        create_dash(template_dir, cache_dir=cache_dir, expression_slots=True),
+        'page.html',
+    )
+
+    assert isinstance(component, html.Main)
+
+
+def test_skeletons_are_only_stored_with_expression_slots(template_dir, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    dashboard = create_dash(template_dir, cache_dir=cache_dir)
+    for text in ('a', 'b', 'c'):
+        render(dashboard, 'page.html', text=text)
+
+    assert list((cache_dir / 'skeletons').iterdir()) == []
+
+
+def test_registered_components_change_the_skeleton_files(template_dir, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    dashboard = create_dash(template_dir, cache_dir=cache_dir, expression_slots=True)
+    render(dashboard, 'page.html', text='a')
+
+    renderer = dashboard.server.extensions['dash_template_rendering']
+    renderer.register_components('custom', [html.Div])
+    render(dashboard, 'page.html', text='a')
+
+    assert len(list((cache_dir / 'skeletons').iterdir())) == 2
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        '<main>{{ text|safe }}</main>',
+        '<main>{% autoescape false %}{{ text }}{% endautoescape %}</main>',
+        '<main>{{ text }}</main>',
+    ],
+)
+def test_skeletons_with_inlined_values_are_not_stored(template_dir, tmp_path, source):
+    (template_dir / 'inlined.html').write_text(source)
+    cache_dir = tmp_path / 'cache'
+    dashboard = create_dash(template_dir, cache_dir=cache_dir, expression_slots=True)
+    template = dashboard.server.jinja_env.get_template('inlined.html')
+    for text in ('a', 'b', 'c'):
+        render(dashboard, 'inlined.html', text=text)
+        render(dashboard, template, text=text)
+
+    expected = 1 if source == '<main>{{ text }}</main>' else 0
+    assert len(list((cache_dir / 'skeletons').iterdir())) == expected
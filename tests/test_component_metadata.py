@@ -0,0 +1,22 @@
+from dash import dcc, html
+
+from dash_template_rendering.templating import _component_metadata
+
+
+def test_component_metadata_is_built_once_per_class():
+    metadata = _component_metadata(html.Label)
+
+    assert metadata is _component_metadata(html.Label)
+    assert metadata.property_names['tabindex'] == 'tabIndex'
+    assert metadata.class_property == 'className'
+    assert metadata.html_for
+    assert metadata.style
+
+
+def test_component_metadata_for_class_with_required_props():
+    metadata = _component_metadata(dcc.Store)
+
+    assert metadata.property_names == {}
+    assert metadata.class_property is None
+    assert not metadata.html_for
+    assert not metadata.style
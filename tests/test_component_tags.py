@@ -0,0 +1,91 @@
+import pytest
+from dash import dash_table, dcc, html
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+
+
+class Card(html.Div):
+    pass
+
+
+@pytest.fixture(params=['bs4', 'html.parser'])
+def renderer(request, dashboard):
+    return TemplateRenderer(dash=dashboard, parser=request.param)
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_dcc_tags_coerce_attributes():
+    component = render_dash_template_string(
+        '<div>'
+        '<dcc-dropdown id="city" options=\'["a", "b"]\' multi searchable="false" '
+        'optionheight="40" placeholder="10"></dcc-dropdown>'
+        '<dcc-range-slider min="0" max="10" step="0.5" value="[2, 8]" />'
+        '<dash-table-datatable row_selectable="false" page_size="5" />'
+        '</div>'
+    )
+
+    dropdown, slider, table = component.children
+    assert isinstance(dropdown, dcc.Dropdown)
+    assert dropdown.id == 'city'
+    assert dropdown.options == ['a', 'b']
+    assert dropdown.multi is True
+    assert dropdown.searchable is False
+    assert dropdown.optionHeight == 40
+    assert dropdown.placeholder == '10'
+    assert isinstance(slider, dcc.RangeSlider)
+    assert (slider.min, slider.max, slider.step) == (0, 10, 0.5)
+    assert slider.value == [2, 8]
+    assert isinstance(table, dash_table.DataTable)
+    assert table.row_selectable is False
+    assert table.page_size == 5
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+@pytest.mark.parametrize('output', ['component', 'json'])
+def test_coerced_attributes_are_not_shared_between_renders(output):
+    template = (
+        '<div><dcc-dropdown options=\'["a", "b"]\' style="color: red">'
+        '</dcc-dropdown></div>'
+    )
+
+    first = render_dash_template_string(template, output=output)
+    if output == 'json':
+        first = first['props']['children'][0]['props']
+        first['options'].append('mutated')
+        first['style']['color'] = 'blue'
+    else:
+        first.children[0].options.append('mutated')
+        first.children[0].style['color'] = 'blue'
+    second = render_dash_template_string(template).children[0]
+
+    assert second.options == ['a', 'b']
+    assert second.style == {'color': 'red'}
+
+
+@pytest.mark.usefixtures('client')
+def test_html_attributes_stay_strings():
+    component = render_dash_template_string('<div n_clicks="1" hidden></div>')
+
+    assert component.n_clicks == '1'
+    assert component.hidden == ''
+
+
+@pytest.mark.usefixtures('client')
+def test_expression_values_are_coerced(dashboard):
+    TemplateRenderer(dash=dashboard, expression_slots=True)
+    template = '<dcc-slider min="0" max="{{ maximum }}" />'
+
+    assert render_dash_template_string(template, maximum=5).max == 5
+    assert render_dash_template_string(template, maximum=2.5).max == 2.5
+
+
+@pytest.mark.usefixtures('client')
+def test_register_components(template_renderer):
+    template_renderer.register_components('ui', [Card])
+
+    component = render_dash_template_string('<ui-card><p>text</p></ui-card>')
+
+    assert isinstance(component, Card)
+    assert isinstance(component.children[0], html.P)
+    with pytest.raises(TypeError, match='No corresponding dash component'):
+        render_dash_template_string('<ui-panel></ui-panel>')
@@ -0,0 +1,46 @@
+import pytest
+from dash import dcc, html
+from flask import render_template_string
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+
+TEMPLATE = """
+<div>
+    {{ graph|plotly }}
+    <p>{{ text }}</p>
+    {{ graph|plotly }}
+</div>
+"""
+
+
+@pytest.fixture
+def reference_renderer(dashboard):
+    return TemplateRenderer(dash=dashboard, embed_by_reference=True)
+
+
+@pytest.mark.usefixtures('client', 'reference_renderer')
+def test_embed_by_reference_inserts_component_object():
+    graph = dcc.Graph(id='graph', figure={'data': [{'y': [1, 2, 3]}]})
+
+    template = render_dash_template_string(TEMPLATE, graph=graph, text='text')
+
+    assert template.children[0] is graph
+    assert template.children[1].children == ['text']
+    assert template.children[2] is graph
+
+
+@pytest.mark.usefixtures('client')
+def test_embed_by_json_copies_component_object():
+    graph = dcc.Graph(id='graph')
+
+    template = render_dash_template_string(TEMPLATE, graph=graph, text='text')
+
+    assert template.children[0] is not graph
+    assert template.children[0].to_plotly_json() == graph.to_plotly_json()
+
+
+@pytest.mark.usefixtures('client', 'reference_renderer')
+def test_embed_by_reference_falls_back_to_json_outside_of_dash_rendering():
+    rendered = render_template_string('{{ p|plotly }}', p=html.P('text'))
+
+    assert rendered.startswith('\ue002<plotly>{')
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from dash import dcc, html
+
+from dash_template_rendering import (
+    TemplateRenderer,
+    render_dash_template_string,
+    render_dash_template_string_async,
+)
+from dash_template_rendering.fragment_cache import (
+    FileSystemFragmentStore,
+    FragmentStore,
+    MemoryFragmentStore,
+)
+
+TEMPLATE = """
+<div>
+    <p>{{ title }}</p>
+    {% dashcache 'navigation' %}
+    <ul>{% for page in load_pages() %}<li>{{ page }}</li>{% endfor %}</ul>
+    {% enddashcache %}
+</div>
+"""
+
+
+class PageLoader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [f'page {self.calls}', 'about']
+
+
+@pytest.fixture(params=[False, True])
+def renderer(request, dashboard):
+    return TemplateRenderer(dash=dashboard, expression_slots=request.param)
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_block_is_rendered_once():
+    load_pages = PageLoader()
+
+    first = render_dash_template_string(TEMPLATE, title='first', load_pages=load_pages)
+    second = render_dash_template_string(
+        TEMPLATE, title='second', load_pages=load_pages
+    )
+
+    assert load_pages.calls == 1
+    assert second.children[0].children == ['second']
+    navigation = second.children[1]
+    assert isinstance(navigation, html.Ul)
+    assert [item.children for item in navigation.children] == [['page 1'], ['about']]
+    assert navigation is not first.children[1]
+
+
+@pytest.mark.usefixtures('client')
+def test_element_block_is_cached_as_component(template_renderer):
+    render_dash_template_string(TEMPLATE, title='title', load_pages=PageLoader())
+
+    fragment = template_renderer.fragment_store.get('navigation')
+    assert fragment.markup == '\ue002<plotly ref="0"></plotly>'
+    assert isinstance(fragment.components[0], html.Ul)
+
+
+@pytest.mark.usefixtures('client')
+def test_modifying_a_render_keeps_the_cached_block():
+    first = render_dash_template_string(TEMPLATE, title='', load_pages=PageLoader())
+    first.children[1].children.append(html.Li('added'))
+
+    second = render_dash_template_string(TEMPLATE, title='', load_pages=PageLoader())
+
+    assert len(second.children[1].children) == 2
+
+
+@pytest.mark.usefixtures('client')
+@pytest.mark.parametrize('embed_by_reference', [False, True])
+def test_html_block_with_embedded_components(dashboard, embed_by_reference):
+    renderer = TemplateRenderer(dash=dashboard, embed_by_reference=embed_by_reference)
+    template = """
+    <div>
+        {{ header|plotly }}
+        {% dashcache 'rows' %}
+        <section>{{ graph|plotly }}</section><section>{{ text }}</section>
+        {% enddashcache %}
+    </div>
+    """
+
+    for text in ('first', 'second'):
+        component = render_dash_template_string(
+            template,
+            header=html.H1(text),
+            graph=dcc.Graph(id=f'graph-{text}'),
+            text=text,
+        )
+
+    header, graph_section, text_section = component.children
+    assert header.children == 'second'
+    assert graph_section.children[0].id == 'graph-first'
+    assert text_section.children == ['first']
+    fragment = renderer.fragment_store.get('rows')
+    assert len(fragment.components) == (1 if embed_by_reference else 0)
+
+
+@pytest.mark.usefixtures('client')
+def test_timeout(dashboard):
+    TemplateRenderer(dash=dashboard, fragment_store=MemoryFragmentStore(timeout=60))
+    template = "<div>{% dashcache 'value', 0 %}{{ value }}{% enddashcache %}</div>"
+
+    render_dash_template_string(template, value='first')
+
+    assert render_dash_template_string(template, value='second').children == ['second']
+
+
+@pytest.mark.usefixtures('client')
+def test_file_system_store_is_shared(dashboard, tmp_path):
+    TemplateRenderer(dash=dashboard, fragment_store=FileSystemFragmentStore(tmp_path))
+    load_pages = PageLoader()
+    render_dash_template_string(TEMPLATE, title='', load_pages=load_pages)
+
+    TemplateRenderer(dash=dashboard, fragment_store=FileSystemFragmentStore(tmp_path))
+    component = render_dash_template_string(TEMPLATE, title='', load_pages=load_pages)
+
+    assert load_pages.calls == 1
+    assert component.children[1].children[0].children == ['page 1']
+
+
+def test_fragment_store_is_abstract():
+    class IncompleteStore(FragmentStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteStore()
+
+
+@pytest.mark.usefixtures('client')
+def test_async_render():
+    load_pages = PageLoader()
+
+    async def render_twice():
+        return [
+            await render_dash_template_string_async(
+                TEMPLATE, title='', load_pages=load_pages
+            )
+            for _ in range(2)
+        ]
+
+    _, second = asyncio.run(render_twice())
+
+    assert load_pages.calls == 1
+    assert second.children[1].children[0].children == ['page 1']
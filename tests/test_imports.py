@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+from dash import html
+
+from dash_template_rendering import templating
+
+
+def test_import_does_not_load_heavy_modules():
+    code = (
+        'import sys\n'
+        'import dash_template_rendering\n'
+        'from dash_template_rendering import templating\n'
+        'assert "bs4" not in sys.modules, "bs4"\n'
+        'assert "dash_template_rendering.artifact" not in sys.modules, "artifact"\n'
+        'assert templating._DASH_TAGS_MAPPING is None, "DASH_TAGS_MAPPING"\n'
+    )
+
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_dash_tags_mapping_is_built_on_access():
+    assert templating.DASH_TAGS_MAPPING['div'] is html.Div
+    assert templating.DASH_TAGS_MAPPING is templating._dash_tags_mapping()
@@ -0,0 +1,52 @@
+import json
+
+import plotly.graph_objects as go
+import pytest
+from dash import dcc
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture(params=['json', 'orjson'])
+def json_engine(request, dashboard):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    TemplateRenderer(dash=dashboard, json_engine=request.param)
+    return request.param
+
+
+def test_unknown_json_engine():
+    with pytest.raises(ValueError, match='Unknown JSON engine'):
+        TemplateRenderer(json_engine='ujson')
+
+
+@pytest.mark.usefixtures('client', 'json_engine')
+@pytest.mark.parametrize('output', ['component', 'json'])
+def test_typed_arrays_are_not_expanded(output):
+    y = np.linspace(0, 1, 1000)
+    figure = go.Figure(go.Scatter(x=np.arange(1000), y=y))
+    graph = dcc.Graph(id='graph', figure=figure)
+
+    rendered = render_dash_template_string(
+        '<div>{{ graph|plotly }}</div>', graph=graph, output=output
+    )
+
+    trace = json.loads(to_json_plotly(rendered))['props']['children'][0]['props'][
+        'figure'
+    ]['data'][0]
+    assert trace['x'].keys() == {'dtype', 'bdata'}
+    assert trace['y']['dtype'] == 'f8'
+    assert trace == json.loads(to_json_plotly(graph))['props']['figure']['data'][0]
+
+
+@pytest.mark.usefixtures('client', 'json_engine')
+def test_payload_with_nan():
+    component = render_dash_template_string(
+        '<div><plotly>{"props": {"value": NaN}, "type": "Input", '
+        '"namespace": "dash_core_components"}</plotly></div>'
+    )
+
+    assert np.isnan(component.children[0].value)
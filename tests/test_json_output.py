@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from dash import html
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import (
+    render_dash_template_string,
+    render_dash_template_string_many,
+)
+
+
+@pytest.mark.usefixtures('client')
+def test_json_output_matches_serialized_components(template_string, dash_row):
+    component = render_dash_template_string(template_string, dash_row=dash_row)
+    data = render_dash_template_string(
+        template_string, output='json', dash_row=dash_row
+    )
+
+    assert isinstance(data, dict)
+    assert data == json.loads(to_json_plotly(component))
+
+
+@pytest.mark.usefixtures('client')
+def test_json_output_of_batch_with_expression_slots(template_renderer):
+    template_renderer.expression_slots = True
+
+    rows = render_dash_template_string_many(
+        '<tr><td class="{{ kind }}">{{ name }}</td></tr>',
+        [{'kind': 'a', 'name': 'x'}, {'kind': '', 'name': ''}],
+        output='json',
+    )
+
+    assert rows[0]['props']['children'][0]['props'] == {
+        'className': 'a',
+        'children': ['x'],
+    }
+    assert rows[1]['props']['children'][0]['props'] == {'className': ''}
+
+
+@pytest.mark.usefixtures('client')
+def test_json_output_validates_attributes():
+    with pytest.raises(TypeError, match='unexpected keyword argument: `unknown`'):
+        render_dash_template_string('<div unknown="x"></div>', output='json')
+
+    data = render_dash_template_string('<div data-x="1"></div>', output='json')
+    assert data['props'] == {'data-x': '1'}
+
+
+@pytest.mark.usefixtures('client')
+def test_json_output_in_layout(dashboard):
+    dashboard.layout = html.Main(
+        render_dash_template_string('<p id="p">text</p>', output='json')
+    )
+
+    layout = json.loads(to_json_plotly(dashboard.layout))
+
+    assert layout['props']['children']['props'] == {'id': 'p', 'children': ['text']}
+
+
+@pytest.mark.usefixtures('client')
+def test_unknown_output():
+    with pytest.raises(ValueError, match='Unknown output "xml"'):
+        render_dash_template_string('<div></div>', output='xml')
+
+
+def test_json_output_in_layout_function(dashboard):
+    # Setting a layout function validates the layout it returns.
+    dashboard.layout = lambda: html.Main(
+        render_dash_template_string('<p id="p">text</p>', output='json')
+    )
+
+    layout = json.loads(to_json_plotly(dashboard._layout_value()))
+
+    assert layout['props']['children']['props'] == {'id': 'p', 'children': ['text']}
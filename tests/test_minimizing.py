@@ -0,0 +1,127 @@
+import json
+
+import pytest
+from dash import dcc, html
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+from dash_template_rendering.minimizing import minimize_layout, size_report
+
+TEMPLATE = """
+<div class="" style="">
+    <p>first <!-- comment -->second</p>
+    <span title="{{ title }}">{{ text }}</span>
+    <img alt="" src="image.png">
+    {{ embedded|plotly }}
+</div>
+"""
+CONTEXT = dict(title='', text='text', embedded=html.B(['a', ' ', 'b', ' ']))
+
+
+def to_json(value):
+    return json.loads(to_json_plotly(value))
+
+
+@pytest.fixture(params=[False, True])
+def renderer(request, dashboard):
+    return TemplateRenderer(
+        dash=dashboard, minimize=True, expression_slots=request.param
+    )
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_render_minimized():
+    component = render_dash_template_string(TEMPLATE, **CONTEXT)
+
+    paragraph, span, image, embedded = component.children
+    assert component.to_plotly_json()['props'].keys() == {'children'}
+    assert paragraph.children == 'firstsecond'
+    assert span.children == 'text'
+    assert span.title == ''
+    assert image.alt == ''
+    # Embedded components are passed as they are.
+    assert embedded.children == ['a', ' ', 'b', ' ']
+
+
+@pytest.mark.usefixtures('client')
+def test_minimize_layout_matches_minimized_render(dashboard):
+    plain = render_dash_template_string(TEMPLATE, **CONTEXT)
+    TemplateRenderer(dash=dashboard, minimize=True)
+    minimized = to_json(render_dash_template_string(TEMPLATE, output='json', **CONTEXT))
+    minimized['props']['children'][3]['props']['children'] = 'a b '
+
+    assert minimize_layout(plain) == minimized
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_render_minimized_keeps_empty_attributes():
+    component = render_dash_template_string(
+        '<div class="{{ kind }}"><a href="{{ url }}" download="" data-value="" '
+        'aria-label="{{ label }}" class="">link</a></div>',
+        kind='',
+        url='',
+        label='',
+    )
+
+    assert to_json(component) == to_json(
+        html.Div(
+            html.A(
+                'link',
+                href='',
+                download='',
+                **{'data-value': '', 'aria-label': ''},
+            )
+        )
+    )
+
+
+def test_minimize_layout_keeps_empty_attributes():
+    layout = html.A(
+        'link', href='', download='', className='', title=None, **{'data-value': ''}
+    )
+
+    assert minimize_layout(layout)['props'] == {
+        'children': 'link',
+        'href': '',
+        'download': '',
+        'data-value': '',
+    }
+
+
+def test_minimize_layout_keeps_text_of_other_components():
+    layout = html.Div([
+        dcc.Markdown(['# Title', 'para']),
+        html.Pre(['a', '\n\n   ', 'b', '  ']),
+    ])
+
+    markdown, pre = minimize_layout(layout)['props']['children']
+    assert markdown['props']['children'] == ['# Title', 'para']
+    assert pre['props']['children'] == ['a', '\n\n   ', 'b', '  ']
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_render_minimized_keeps_text_of_other_components():
+    component = render_dash_template_string(
+        '<div><dcc-markdown>{{ text }}</dcc-markdown><pre>{{ text }}</pre></div>',
+        text='# Title',
+    )
+
+    markdown, pre = component.children
+    assert markdown.children == ['# Title']
+    assert pre.children == ['# Title']
+
+
+def test_size_report():
+    layout = html.Div(['a', 'b', html.P([''])], className='', style={})
+
+    report = size_report(layout)
+
+    minimized = minimize_layout(layout)
+    assert minimized['props'] == {
+        'children': [
+            'ab',
+            {'props': {}, 'type': 'P', 'namespace': 'dash_html_components'},
+        ]
+    }
+    assert report.minimized_bytes == len(to_json_plotly(minimized))
+    assert report.saved_bytes == report.original_bytes - report.minimized_bytes > 0
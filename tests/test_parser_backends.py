@@ -0,0 +1,84 @@
+import json
+
+import plotly
+import pytest
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+from dash_template_rendering.templating import _compile_skeleton
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        '<div class=" a   b " style="margin-top: 5px">text &amp; more</div>',
+        '<p>a<p>b</div> c < d <br/><div/>x<img hidden>',
+        '<label for="name" tabindex="1">Name</label><hr><span>tail</span>',
+        '<div><!-- comment --><!DOCTYPE html>  <b>bold</b>  </div>',
+        '<ul><li>one<li>two</ul><plotly slot="0"></plotly>',
+    ],
+)
+def test_html_parser_backend_matches_bs4_backend(source):
+    assert _compile_skeleton(source, parser='html.parser') == _compile_skeleton(
+        source, parser='bs4'
+    )
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        '<div>a</span>b</div>',
+        '</div><p>x</p></p>',
+        '<div><span>a</div>b</span>',
+        '<b><i>x</b>y</i>',
+        '<img>a</img>b',
+        '<div>a<br>b</br>c<br/>d</br>e</div>',
+        '<hr/></hr>x',
+    ],
+)
+def test_html_parser_backend_matches_bs4_backend_for_stray_end_tags(source):
+    assert _compile_skeleton(source, parser='html.parser') == _compile_skeleton(
+        source, parser='bs4'
+    )
+
+
+@pytest.mark.parametrize(
+    'source',
+    [
+        '<template><div>a<b>b</b></div>c</template>',
+        '<div><template><span>s</span></template><p>p</p></div>',
+        '<ruby>a<rt><b>x</b>c</rt>d</ruby>',
+    ],
+)
+def test_html_parser_backend_matches_bs4_backend_in_string_containers(source):
+    with pytest.warns(UserWarning, match='not supported in templates yet'):
+        skeleton = _compile_skeleton(source, parser='html.parser')
+    with pytest.warns(UserWarning, match='not supported in templates yet'):
+        assert skeleton == _compile_skeleton(source, parser='bs4')
+
+
+def test_html_parser_backend_skips_script_content():
+    with pytest.warns(UserWarning, match='not supported in templates yet'):
+        skeleton = _compile_skeleton(
+            '<div><script>var a = 1;</script></div>', parser='html.parser'
+        )
+
+    assert skeleton == _compile_skeleton('<div><script></script></div>')
+
+
+@pytest.mark.usefixtures('client')
+def test_render_with_html_parser_backend(
+    dashboard, template_string, dash_row, template_json
+):
+    TemplateRenderer(dash=dashboard, parser='html.parser')
+
+    template = render_dash_template_string(template_string, dash_row=dash_row)
+
+    assert (
+        json.loads(plotly.io.json.to_json_plotly(template.to_plotly_json()))
+        == template_json
+    )
+
+
+def test_unknown_parser_backend():
+    with pytest.raises(ValueError, match='Unknown parser backend "unknown"'):
+        TemplateRenderer(parser='unknown')
@@ -0,0 +1,80 @@
+import json
+
+import dash
+import pytest
+from dash import dcc, html
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import (
+    make_patch,
+    render_dash_template_string,
+    render_dash_template_string_patch,
+)
+
+REPORT = """
+<div class="report">
+    <h1>{{ title }}</h1>
+    <ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul>
+    <p id="total">{{ items|length }}</p>
+</div>
+"""
+
+
+def to_json(value):
+    return json.loads(to_json_plotly(value))
+
+
+def apply_patch(value, patch):
+    for operation in patch.to_plotly_json()['operations']:
+        *path, key = operation['location'] or [None]
+        target = value
+        for part in path:
+            target = target[part]
+        if operation['operation'] == 'Assign':
+            target[key] = operation['params']['value']
+        elif operation['operation'] == 'Delete':
+            del target[key]
+        elif operation['operation'] == 'Extend':
+            (target if key is None else target[key]).extend(
+                operation['params']['value']
+            )
+    return value
+
+
+@pytest.mark.usefixtures('client')
+def test_render_patch():
+    previous = to_json(
+        render_dash_template_string(REPORT, title='Report', items=['a', 'b', 'c'])
+    )
+
+    patch = render_dash_template_string_patch(
+        REPORT, previous, title='Report', items=['a', 'x']
+    )
+
+    operations = patch.to_plotly_json()['operations']
+    assert len(operations) == 3
+    assert apply_patch(previous, patch) == to_json(
+        render_dash_template_string(REPORT, title='Report', items=['a', 'x'])
+    )
+
+
+def test_make_patch_props():
+    previous = html.Div([html.B('a'), dcc.Tab(label=html.I('x'))], className='a')
+    current = html.Div(
+        [html.B('a'), dcc.Tab(label=html.I('y')), html.B('b')], title='t'
+    )
+
+    patch = make_patch(previous, current)
+
+    assert apply_patch(to_json(previous), patch) == to_json(current)
+
+
+def test_make_patch_without_changes():
+    assert make_patch(html.Div(['a']), html.Div(['a'])) is dash.no_update
+
+
+def test_make_patch_replaces_other_components():
+    current = html.Div(id='b')
+
+    assert make_patch(html.Div(id='a'), current) is current
+    assert make_patch(None, current) is current
@@ -0,0 +1,55 @@
+import concurrent.futures
+
+import flask
+import pytest
+from dash import html
+
+from dash_template_rendering import TemplateRenderer
+
+TEMPLATE = '<div id="{{ id }}"><p>{{ text }}</p>{{ content|plotly }}</div>'
+
+
+def test_render_string_without_context(template_renderer):
+    component = template_renderer.render_string(
+        TEMPLATE, id='a', text='text', content=html.B('b')
+    )
+
+    assert component.id == 'a'
+    assert component.children[0].children == ['text']
+    assert component.children[1].children == 'b'
+
+
+def test_render_reuses_app_context(app, template_renderer):
+    with app.app_context():
+        flask.g.user = 'user'
+        component = template_renderer.render(
+            app.jinja_env.from_string('<span>{{ g.user }}</span>')
+        )
+
+    assert component.children == ['user']
+
+
+@pytest.mark.parametrize('expression_slots', [False, True])
+def test_render_from_threads(dashboard, expression_slots):
+    renderer = TemplateRenderer(
+        dash=dashboard, expression_slots=expression_slots, result_cache_size=16
+    )
+
+    def render(index):
+        component = renderer.render_string(
+            TEMPLATE, id=str(index), text=index % 20, content=html.B(index)
+        )
+        return component.id, component.children[0].children, component.children[1]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(render, range(200)))
+
+    for index, (id, text, content) in enumerate(results):
+        assert id == str(index)
+        assert text == [str(index % 20)]
+        assert content.children == index
+
+
+def test_render_requires_initialization():
+    with pytest.raises(RuntimeError, match='not initialized'):
+        TemplateRenderer().render_string('<div></div>')
@@ -0,0 +1,90 @@
+import contextlib
+import time
+
+import pytest
+from dash import html
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+from dash_template_rendering.caching import fingerprint
+
+TEMPLATE = '<div><p>{{ text }}</p>{{ content|plotly }}</div>'
+
+
+@pytest.fixture
+def jinja_renders():
+    return []
+
+
+@pytest.fixture
+def cached_renderer(dashboard, jinja_renders):
+    @contextlib.contextmanager
+    def tracer(phase, info):
+        if phase == 'jinja':
+            jinja_renders.append(info.template)
+        yield
+
+    return TemplateRenderer(dash=dashboard, result_cache_size=8, tracer=tracer)
+
+
+@pytest.mark.usefixtures('client')
+def test_result_cache_returns_copy_of_cached_layout(cached_renderer, jinja_renders):
+    first = render_dash_template_string(TEMPLATE, text='a', content=html.P('b'))
+    second = render_dash_template_string(TEMPLATE, text='a', content=html.P('b'))
+
+    assert len(jinja_renders) == 1
+    assert first is not second
+    assert to_json_plotly(first) == to_json_plotly(second)
+
+    render_dash_template_string(TEMPLATE, text='a', content=html.P('c'))
+
+    assert len(jinja_renders) == 2
+
+
+@pytest.mark.usefixtures('client', 'cached_renderer')
+def test_result_cache_per_call_opt_out(jinja_renders):
+    render_dash_template_string(TEMPLATE, text='a', content=html.P('b'))
+    render_dash_template_string(
+        TEMPLATE, use_cache=False, text='a', content=html.P('b')
+    )
+
+    assert len(jinja_renders) == 2
+
+
+@pytest.mark.usefixtures('client')
+def test_result_cache_invalidation(cached_renderer, jinja_renders):
+    render_dash_template_string(TEMPLATE, text='a', content=html.P('b'))
+    cached_renderer.invalidate(source=TEMPLATE)
+    render_dash_template_string(TEMPLATE, text='a', content=html.P('b'))
+
+    assert len(jinja_renders) == 2
+
+
+@pytest.mark.usefixtures('client')
+def test_result_cache_ttl(cached_renderer, jinja_renders, monkeypatch):
+    cached_renderer._result_cache.ttl = 10
+    render_dash_template_string(TEMPLATE, text='a', content=html.P('b'))
+
+    monotonic = time.monotonic() + 11
+    monkeypatch.setattr('time.monotonic', lambda: monotonic)
+    render_dash_template_string(TEMPLATE, text='a', content=html.P('b'))
+
+    assert len(jinja_renders) == 2
+
+
+@pytest.mark.usefixtures('client', 'cached_renderer')
+def test_result_cache_skips_unsupported_context(jinja_renders):
+    render_dash_template_string(TEMPLATE, text=object(), content=html.P())
+    render_dash_template_string(TEMPLATE, text=object(), content=html.P())
+
+    assert len(jinja_renders) == 2
+
+
+def test_fingerprint_of_components():
+    assert fingerprint({'a': html.P('b', id='c')}) == fingerprint({
+        'a': html.P('b', id='c')
+    })
+    assert fingerprint(html.P('b')) != fingerprint(html.Span('b'))
+    assert fingerprint([1, 2]) != fingerprint((1, 2))
+    with pytest.raises(TypeError, match='Unable to fingerprint'):
+        fingerprint(object())
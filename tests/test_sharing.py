@@ -0,0 +1,114 @@
+import copy
+import pickle
+
+import pytest
+from dash import html
+from dash.development.base_component import ComponentRegistry
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string, thaw
+from dash_template_rendering.sharing import freeze, is_frozen
+
+TEMPLATE = """
+<div>
+    <h1 style="color: red">Title</h1>
+    <p>{{ text }}</p>
+    <ul><li>first</li><li>second</li></ul>
+</div>
+"""
+
+
+@pytest.fixture
+def renderer(dashboard):
+    return TemplateRenderer(dash=dashboard, expression_slots=True, share_static=True)
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_static_subtrees_are_shared():
+    registry = set(ComponentRegistry.registry)
+    first = render_dash_template_string(TEMPLATE, text='first')
+    second = render_dash_template_string(TEMPLATE, text='second')
+
+    assert first is not second
+    assert first.children[0] is second.children[0]
+    assert first.children[2] is second.children[2]
+    assert first.children[1].children == ['first']
+    assert second.children[1].children == ['second']
+    assert not is_frozen(first) and not is_frozen(first.children[1])
+    assert isinstance(first.children[0], html.H1)
+    assert ComponentRegistry.registry == registry
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_shared_json_output():
+    first = render_dash_template_string(TEMPLATE, text='first', output='json')
+    second = render_dash_template_string(TEMPLATE, text='second', output='json')
+
+    assert first['props']['children'][0] is second['props']['children'][0]
+    assert first['props']['children'][0] == {
+        'props': {'children': ('Title',), 'style': {'color': 'red'}},
+        'type': 'H1',
+        'namespace': 'dash_html_components',
+    }
+
+
+@pytest.mark.usefixtures('client')
+def test_shared_subtrees_are_built_per_output(renderer):
+    render_dash_template_string(TEMPLATE, text='text', output='json')
+
+    (key,) = renderer._skeleton_cache.keys()
+    skeleton = renderer._skeleton_cache.get(key)
+    heading = skeleton.nodes[0].children[0]
+    assert heading._json is not None
+    assert heading._component is None
+
+    restored = pickle.loads(pickle.dumps(skeleton)).nodes[0].children[0]
+    assert restored._json is None
+    assert to_json_plotly(restored.component) == to_json_plotly(heading.component)
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_shared_components_are_immutable():
+    heading = render_dash_template_string(TEMPLATE, text='text').children[0]
+
+    with pytest.raises(TypeError, match='thaw'):
+        heading.className = 'title'
+    with pytest.raises(TypeError, match='thaw'):
+        heading.style['color'] = 'blue'
+    with pytest.raises(AttributeError):
+        heading.children.append('!')
+    assert copy.deepcopy(heading) is heading
+
+
+@pytest.mark.usefixtures('client', 'renderer')
+def test_thaw():
+    heading = render_dash_template_string(TEMPLATE, text='text').children[0]
+
+    copied = thaw(heading)
+    copied.className = 'title'
+    copied.style['color'] = 'blue'
+    copied.children.append('!')
+
+    assert type(copied) is html.H1
+    assert copied.to_plotly_json()['props'] == {
+        'children': ['Title', '!'],
+        'style': {'color': 'blue'},
+        'className': 'title',
+    }
+    assert render_dash_template_string(TEMPLATE, text='text').children[0] is heading
+    assert heading.style == {'color': 'red'}
+
+
+def test_thaw_returns_modifiable_values_unchanged():
+    component = html.Div(['text'])
+
+    assert thaw(component) is component
+
+
+def test_pickle_frozen_component():
+    component = freeze(html.Div([html.B('text')], style={'color': 'red'}))
+
+    restored = pickle.loads(pickle.dumps(component))
+
+    assert is_frozen(restored) and is_frozen(restored.children[0])
+    assert to_json_plotly(restored) == to_json_plotly(component)
@@ -0,0 +1,46 @@
+import pytest
+from dash import html
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+
+TEMPLATE = """
+<div class="container" style="color: blue;">
+    <h1>Title</h1>
+    {{ content|plotly }}
+</div>
+"""
+
+
+@pytest.mark.usefixtures('client')
+def test_skeleton_is_reused_for_changing_plotly_content(template_renderer):
+    first = render_dash_template_string(TEMPLATE, content=html.P('first'))
+    second = render_dash_template_string(TEMPLATE, content=html.P('second'))
+
+    assert len(template_renderer._skeleton_cache) == 1
+    assert first.children[1].children == 'first'
+    assert second.children[1].children == 'second'
+    assert first.children[0] is not second.children[0]
+
+
+@pytest.mark.usefixtures('client')
+def test_skeleton_props_are_not_shared_between_renders():
+    first = render_dash_template_string(TEMPLATE, content=html.P())
+    first.style['color'] = 'red'
+
+    second = render_dash_template_string(TEMPLATE, content=html.P())
+
+    assert second.style == {'color': 'blue'}
+
+
+@pytest.mark.usefixtures('client')
+def test_skeleton_cache_evicts_least_recently_used(dashboard):
+    template_renderer = TemplateRenderer(dash=dashboard, skeleton_cache_size=1)
+
+    render_dash_template_string('<div>{{ text }}</div>', text='first')
+    render_dash_template_string('<div>{{ text }}</div>', text='second')
+
+    assert len(template_renderer._skeleton_cache) == 1
+
+    template_renderer.clear_cache()
+
+    assert len(template_renderer._skeleton_cache) == 0
@@ -0,0 +1,79 @@
+import jinja2
+import pytest
+from dash import html
+
+from dash_template_rendering import TemplateRenderer, render_dash_template
+from dash_template_rendering.stats import STATS_ROUTE, RenderStats
+from dash_template_rendering.tracing import RenderInfo
+
+
+@pytest.fixture
+def renderer(app, dashboard):
+    app.jinja_env.loader = jinja2.DictLoader({
+        'page.html': '<div><p>{{ text }}</p>{{ content|plotly }}</div>',
+        'broken.html': '<div>{{ missing() }}</div>',
+    })
+    return TemplateRenderer(dash=dashboard, stats_route=STATS_ROUTE)
+
+
+@pytest.mark.usefixtures('client')
+def test_stats_per_template(renderer):
+    for text in ('first', 'second'):
+        render_dash_template('page.html', text=text, content=html.B('bold'))
+    with pytest.raises(jinja2.UndefinedError):
+        render_dash_template('broken.html')
+
+    stats = renderer.stats.snapshot()
+
+    page = stats['page.html']
+    assert page['renders'] == 2
+    assert page['errors'] == 0
+    assert page['phases'].keys() == {'render', 'jinja', 'parse', 'build'}
+    render = page['phases']['render']
+    assert render['count'] == 2
+    assert 0 < render['p50'] <= render['p95'] <= render['p99'] <= render['max']
+    assert page['nodes']['max'] == 4
+    assert page['embed_bytes']['count'] == 2
+    assert stats['broken.html']['renders'] == 1
+    assert stats['broken.html']['errors'] == 1
+
+
+def test_stats_endpoint(app, renderer):
+    with app.test_request_context():
+        render_dash_template('page.html', text='text', content=html.B('bold'))
+
+    with app.test_client() as client:
+        response = client.get(STATS_ROUTE)
+
+    assert response.status_code == 200
+    assert response.json['page.html']['renders'] == 1
+
+
+def test_percentiles():
+    stats = RenderStats(window=None)
+    info = RenderInfo(template='page.html')
+    for duration in range(1, 101):
+        stats._record('render', info, duration / 1000, None)
+
+    render = stats.snapshot()['page.html']['phases']['render']
+
+    assert render['count'] == 100
+    assert 0.050 <= render['p50'] <= 0.050 * 2**0.25
+    assert 0.095 <= render['p95'] <= 0.1
+    assert render['max'] == 0.1
+
+
+def test_window_rotation():
+    stats = RenderStats(window=60)
+    info = RenderInfo(template='page.html')
+    stats._record('render', info, 0.1, None)
+
+    stats._window_start -= 60
+    stats._record('render', info, 0.1, None)
+    assert stats.snapshot()['page.html']['renders'] == 2
+
+    stats._window_start -= 60
+    assert stats.snapshot()['page.html']['renders'] == 1
+
+    stats._window_start -= 120
+    assert stats.snapshot() == {}
@@ -0,0 +1,127 @@
+import json
+
+import plotly
+import pytest
+from dash import dash_table, html
+from flask import render_template_string
+from plotly.io.json import to_json_plotly
+
+from dash_template_rendering import TemplateRenderer, render_dash_template_string
+from dash_template_rendering.tables import _component_factory, html_table
+
+pd = pytest.importorskip('pandas')
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {'name': ['a', 'b'], 'price': [1.5, 2.25], 'share': [0.5, 0.125]},
+        index=pd.Index([10, 20], name='id'),
+    )
+
+
+def to_json(value):
+    return json.loads(to_json_plotly(value))
+
+
+def test_html_table(frame):
+    table = html_table(frame, className='prices')
+
+    head, body = table.children
+    assert table.className == 'prices'
+    assert to_json(head) == to_json(
+        html.Thead(html.Tr([html.Th('name'), html.Th('price'), html.Th('share')]))
+    )
+    assert to_json(body) == to_json(
+        html.Tbody([
+            html.Tr([html.Td('a'), html.Td('1.5'), html.Td('0.5')]),
+            html.Tr([html.Td('b'), html.Td('2.25'), html.Td('0.125')]),
+        ])
+    )
+
+
+@pytest.mark.usefixtures('client')
+def test_html_table_filter(frame):
+    component = render_dash_template_string(
+        "<div>{{ df|html_table(formats={'price': '.2f', 'share': '.1%'}, "
+        "index=True, fields=['price', 'share'], id='prices') }}</div>",
+        df=frame,
+    )
+
+    table = component.children[0]
+    assert isinstance(table, html.Table)
+    assert table.id == 'prices'
+    head, body = table.children
+    assert [cell.children for cell in head.children.children] == [
+        'id',
+        'price',
+        'share',
+    ]
+    assert [[cell.children for cell in row.children] for row in body.children] == [
+        ['10', '1.50', '50.0%'],
+        ['20', '2.25', '12.5%'],
+    ]
+
+
+@pytest.mark.usefixtures('client')
+def test_html_table_filter_uses_json_engine(frame, dashboard, monkeypatch):
+    TemplateRenderer(dash=dashboard, json_engine='json')
+    engines = []
+    to_json_plotly = plotly.io.json.to_json_plotly
+
+    def record(value, engine=None, **kwargs):
+        engines.append(engine)
+        return to_json_plotly(value, engine=engine, **kwargs)
+
+    monkeypatch.setattr(plotly.io.json, 'to_json_plotly', record)
+    rendered = render_template_string('{{ df|html_table(id="prices") }}', df=frame)
+
+    assert engines == ['json']
+    assert '"id":"prices"' in rendered
+
+
+def test_datatable(frame):
+    table = html_table(frame, datatable=True, formats={'share': '.0%'}, page_size=5)
+
+    assert isinstance(table, dash_table.DataTable)
+    assert table.columns == [
+        {'name': 'name', 'id': 'name'},
+        {'name': 'price', 'id': 'price'},
+        {'name': 'share', 'id': 'share'},
+    ]
+    assert table.data[0] == {'name': 'a', 'price': 1.5, 'share': '50%'}
+    assert table.page_size == 5
+
+
+def test_datatable_columns(frame):
+    columns = [
+        {'name': 'Name', 'id': 'name'},
+        {'name': 'Price', 'id': 'price', 'type': 'numeric'},
+    ]
+
+    table = html_table(frame, fields=['name', 'price'], datatable=True, columns=columns)
+
+    assert table.columns == columns
+    assert table.data[0] == {'name': 'a', 'price': 1.5}
+
+
+def test_html_table_columns_prop_is_validated(frame):
+    with pytest.raises(TypeError, match='unexpected keyword argument: `columns`'):
+        html_table(frame, columns=[])
+
+
+@pytest.mark.parametrize('component_class', [html.Td, html.Th, html.Tr])
+@pytest.mark.parametrize('children', ['a', 1.5, ['a', html.B('b')], html.B('b')])
+def test_component_factory_matches_constructor(component_class, children):
+    create = _component_factory(component_class)
+
+    component = create(children)
+
+    assert type(component) is component_class
+    assert component.__dict__ == component_class(children).__dict__
+    assert to_json(component) == to_json(component_class(children))
+
+
+def test_unknown_column(frame):
+    with pytest.raises(KeyError, match='missing'):
+        html_table(frame, fields=['name', 'missing'])
@@ -1,11 +1,13 @@
 from operator import attrgetter
 import pytest
 import json
+import sys
 
 import plotly
-from dash import html
+from dash import dcc, html
 
 from dash_template_rendering import render_dash_template, render_dash_template_string
+from dash_template_rendering.templating import _parse_dash_json
 
 
 @pytest.mark.usefixtures('client')
@@ -75,3 +77,69 @@ def test_skip_unknown_tags_template():
                 <unknown_tag></unknown_tag>
             """
         )
+
+
+@pytest.mark.usefixtures('client')
+def test_render_component_valued_props():
+    tabs = dcc.Tabs(
+        id='tabs',
+        children=dcc.Tab(label=html.B('label'), children=html.P('content')),
+    )
+
+    component = render_dash_template_string('{{ tabs|plotly }}', tabs=tabs)
+
+    tab = component.children[0]
+    assert isinstance(tab, dcc.Tab)
+    assert isinstance(tab.label, html.B)
+    assert tab.children[0].children == 'content'
+
+
+@pytest.mark.usefixtures('client')
+def test_plotly_tags_in_comments_are_not_payloads():
+    component = render_dash_template_string(
+        '<div><!-- embed with <plotly> tags --><p>a</p>{{ x|plotly }}</div>',
+        x=html.B('b'),
+    )
+
+    assert [child.to_plotly_json() for child in component.children] == [
+        html.P(['a']).to_plotly_json(),
+        html.B('b').to_plotly_json(),
+    ]
+
+
+@pytest.mark.usefixtures('client')
+def test_plotly_tags_in_attributes_are_not_payloads():
+    component = render_dash_template_string(
+        '<div title="<plotly>">{{ x|plotly }}</div>', x=html.B('b')
+    )
+
+    assert component.title == '<plotly>'
+    assert isinstance(component.children[0], html.B)
+
+
+@pytest.mark.usefixtures('client')
+def test_plotly_tag_written_in_template():
+    component = render_dash_template_string(
+        '<div><plotly>{"props": {"children": "b"}, "type": "B", '
+        '"namespace": "dash_html_components"}</plotly></div>'
+    )
+
+    assert isinstance(component.children[0], html.B)
+    assert component.children[0].children == 'b'
+
+
+def test_parse_deeply_nested_json():
+    data = {'props': {'children': 'leaf'}, 'type': 'Span', 'namespace': 'dash.html'}
+    for _ in range(sys.getrecursionlimit() * 2):
+        data = {
+            'props': {'children': [data]},
+            'type': 'Div',
+            'namespace': 'dash_html_components',
+        }
+
+    component = _parse_dash_json(data)
+
+    for _ in range(sys.getrecursionlimit() * 2):
+        component = component.children[0]
+    assert isinstance(component, html.Span)
+    assert component.children == 'leaf'
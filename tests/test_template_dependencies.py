@@ -0,0 +1,147 @@
+import os
+import time
+
+import pytest
+from dash import Dash, html
+from flask import Flask
+
+from dash_template_rendering import (
+    TemplateRenderer,
+    render_dash_template,
+    render_dash_template_string,
+)
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    directory = tmp_path / 'templates'
+    directory.mkdir()
+    (directory / 'base.html').write_text('<main>{% block body %}{% endblock %}</main>')
+    (directory / 'page.html').write_text(
+        '{% extends "base.html" %}{% block body %}{% include "part.html" %}'
+        '{% endblock %}'
+    )
+    (directory / 'part.html').write_text('<p>part</p>')
+    (directory / 'other.html').write_text('<div>other</div>')
+    return directory
+
+
+@pytest.fixture
+def renderer(template_dir):
+    dashboard = Dash(server=Flask('test', template_folder=str(template_dir)))
+    dashboard.layout = html.Div()
+    renderer = TemplateRenderer(dash=dashboard, result_cache_size=16)
+    with dashboard.server.test_request_context():
+        yield renderer
+
+
+@pytest.fixture
+def uncached_renderer(template_dir):
+    dashboard = Dash(server=Flask('test', template_folder=str(template_dir)))
+    dashboard.layout = html.Div()
+    renderer = TemplateRenderer(
+        dash=dashboard, result_cache_size=0, expression_slots=True
+    )
+    with dashboard.server.test_request_context():
+        yield renderer
+
+
+def modify(path, text):
+    path.write_text(text)
+    # Make sure the modification time changes on coarse file systems.
+    modified = time.time() + 10
+    os.utime(path, (modified, modified))
+
+
+def test_check_templates_invalidates_dependents(renderer, template_dir):
+    assert render_dash_template('page.html').children[0].children == ['part']
+    render_dash_template('other.html')
+    render_dash_template_string('{% include "part.html" %}')
+    assert renderer.check_templates() == set()
+
+    modify(template_dir / 'part.html', '<p>changed</p>')
+
+    assert renderer.check_templates() == {'part.html'}
+    assert [key[0] for key in renderer._result_cache.keys()] == ['other.html']
+    assert render_dash_template('page.html').children[0].children == ['changed']
+    component = render_dash_template_string('{% include "part.html" %}')
+    assert component.children == ['changed']
+
+
+def test_check_templates_detects_created_templates(renderer, template_dir):
+    render_dash_template(['missing.html', 'other.html'])
+
+    modify(template_dir / 'missing.html', '<span>created</span>')
+
+    assert renderer.check_templates() == {'missing.html'}
+    assert isinstance(render_dash_template(['missing.html', 'other.html']), html.Span)
+
+
+def test_template_check_interval(renderer, template_dir):
+    renderer.template_check_interval = 0
+    render_dash_template('page.html')
+
+    modify(
+        template_dir / 'base.html', '<section>{% block body %}{% endblock %}</section>'
+    )
+
+    assert isinstance(render_dash_template('page.html'), html.Section)
+
+
+def test_invalidate_dependents(renderer):
+    render_dash_template('page.html')
+    render_dash_template('other.html')
+
+    renderer.invalidate('base.html')
+
+    assert [key[0] for key in renderer._result_cache.keys()] == ['other.html']
+
+
+def test_watcher(renderer, template_dir):
+    render_dash_template('other.html')
+    renderer.start_watcher(interval=0.01)
+    try:
+        modify(template_dir / 'other.html', '<div>changed</div>')
+        for _ in range(500):
+            if len(renderer._result_cache) == 0:
+                break
+            time.sleep(0.01)
+    finally:
+        renderer.stop_watcher()
+
+    assert len(renderer._result_cache) == 0
+
+
+def test_check_templates_invalidates_expression_slot_checks(
+    uncached_renderer, template_dir
+):
+    (template_dir / 'name.html').write_text('<div>{{ name }}</div>')
+    assert render_dash_template('name.html', name='x').children == ['x']
+
+    modify(
+        template_dir / 'name.html',
+        '<div>{% filter upper %}{{ name }}{% endfilter %}</div>',
+    )
+
+    assert uncached_renderer.check_templates() == {'name.html'}
+    assert render_dash_template('name.html', name='x').children == ['X']
+
+
+def test_check_templates_without_result_cache(uncached_renderer, template_dir):
+    assert render_dash_template('page.html').children[0].children == ['part']
+
+    modify(template_dir / 'part.html', '<p>changed</p>')
+
+    assert uncached_renderer.check_templates() == {'part.html'}
+    assert render_dash_template('page.html').children[0].children == ['changed']
+
+
+def test_template_check_interval_without_result_cache(uncached_renderer, template_dir):
+    uncached_renderer.template_check_interval = 0
+    render_dash_template('page.html')
+
+    modify(
+        template_dir / 'base.html', '<section>{% block body %}{% endblock %}</section>'
+    )
+
+    assert isinstance(render_dash_template('page.html'), html.Section)
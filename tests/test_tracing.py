@@ -0,0 +1,64 @@
+import contextlib
+
+import pytest
+from dash import html
+
+from dash_template_rendering import render_dash_template_string
+from dash_template_rendering.tracing import callback_tracer
+
+
+@pytest.mark.usefixtures('client')
+def test_tracer_wraps_render_phases(template_renderer):
+    events = []
+
+    @contextlib.contextmanager
+    def tracer(phase, info):
+        events.append(('start', phase))
+        yield
+        events.append(('end', phase, info.html_size, info.node_count))
+
+    template_renderer.add_tracer(tracer)
+    render_dash_template_string(
+        '<div><p>text</p>{{ content|plotly }}</div>', content=html.Span('span')
+    )
+
+    assert [event[:2] for event in events] == [
+        ('start', 'render'),
+        ('start', 'jinja'),
+        ('end', 'jinja'),
+        ('start', 'parse'),
+        ('end', 'parse'),
+        ('start', 'build'),
+        ('end', 'build'),
+        ('end', 'render'),
+    ]
+    assert events[-1][3] == 4
+
+
+@pytest.mark.usefixtures('client')
+def test_callback_tracer_receives_render_info(template_renderer):
+    infos = []
+    template_renderer.add_tracer(
+        callback_tracer(on_end=lambda phase, info: infos.append((phase, info)))
+    )
+
+    render_dash_template_string(
+        '<div>{{ a|plotly }}{{ b|plotly }}</div>', a=html.P('a'), b=html.P('b')
+    )
+
+    phase, info = infos[-1]
+    assert phase == 'render'
+    assert info.template.startswith('<string ')
+    assert info.embed_count == 2
+    assert info.embed_bytes > 0
+
+
+@pytest.mark.usefixtures('client')
+def test_tracer_can_be_removed(template_renderer):
+    tracer = callback_tracer(on_start=pytest.fail)
+    template_renderer.add_tracer(tracer)
+    template_renderer.remove_tracer(tracer)
+
+    render_dash_template_string('<div></div>')
+
+    assert template_renderer.tracer is None
@@ -0,0 +1,72 @@
+import gc
+
+import pytest
+from dash import Dash, html
+from flask import Flask
+
+from dash_template_rendering import TemplateRenderer, templating
+
+TEMPLATES = {
+    'page.html': [{'text': 'a'}, {'text': 'b'}],
+    'card.html': [{'card': {'title': 'c'}}],
+    'broken.html': [{}],
+}
+
+
+class LookupFailed(Exception):
+    def __init__(self, name, reason):
+        super().__init__(f'{name} {reason}')
+
+
+class FailingCard:
+    @property
+    def title(self):
+        raise LookupFailed('title', 'unavailable')
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    directory = tmp_path / 'templates'
+    directory.mkdir()
+    (directory / 'page.html').write_text('<main><h1>Title</h1>{{ text }}</main>')
+    (directory / 'card.html').write_text('<div>{{ card.title }}</div>')
+    (directory / 'broken.html').write_text('<div>{{ missing.value }}</div>')
+
+    dashboard = Dash(server=Flask('test', template_folder=str(directory)))
+    dashboard.layout = html.Div()
+    return TemplateRenderer(dash=dashboard, result_cache_size=16)
+
+
+@pytest.mark.parametrize('processes', [None, 2])
+def test_warmup(renderer, monkeypatch, processes):
+    errors = {}
+
+    renderer.warmup(TEMPLATES, processes=processes, errors=errors)
+
+    assert set(errors) == {'broken.html'}
+    assert len(renderer._result_cache) == 3
+    assert len(renderer._skeleton_cache) == 3
+    assert 'page.html' in renderer._dependencies
+
+    monkeypatch.setattr(templating, '_render_loaded', pytest.fail)
+    assert renderer.render('page.html', text='b').children[1] == 'b'
+
+
+def test_warmup_errors_of_processes_are_picklable(renderer):
+    errors = {}
+
+    renderer.warmup(
+        {'card.html': [{'card': FailingCard()}]}, processes=2, errors=errors
+    )
+
+    assert isinstance(errors['card.html'], RuntimeError)
+    assert str(errors['card.html']) == 'LookupFailed: title unavailable'
+
+
+def test_warmup_freeze(renderer):
+    try:
+        renderer.warmup({'page.html': [{}]}, freeze=True)
+
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()